@@ -32,10 +32,6 @@ Basic Condor PseudoDaemon Implementation.
 
 """
 
-# -------------- Standard Library -------------- #
-
-import time
-
 # -------------- External Library -------------- #
 
 from path import Path
@@ -51,7 +47,7 @@ JOB_RANGE = 100
 JOB_SLEEP = 0.5
 MAX_JOB_COUNT = 5
 QUEUE_COUNT = 4
-DAEMON_SLEEP = 40
+SUBMIT_RATE = 0.2
 
 
 JOB_SOURCE = condor.clean_source(
@@ -76,21 +72,6 @@ def main(argv):
 )
 
 
-def job_submit_loop(max_job_count):
-    """Submit Jobs Until Maximum Count."""
-
-    def inner_loop(config_runner):
-        count = config_runner.running_job_count
-        if count >= max_job_count:
-            return False
-        print(f"{count} jobs running.")
-        if count < max_job_count:
-            print("Submitting Jobs ...")
-            return True
-
-    return inner_loop
-
-
 @run_main()
 def main(argv):
     """Simple Daemon."""
@@ -116,8 +97,11 @@ def main(argv):
         "simple_daemon", config, logfile=logfile, remove_completed_jobs=True
     )
 
-    while True:
-        print(f"Current Jobs: {runner.running_job_count}")
-        runner.submit_while(job_submit_loop(MAX_JOB_COUNT))
-        print(f"Sleeping for {DAEMON_SLEEP} seconds ...")
-        time.sleep(DAEMON_SLEEP)
+    scheduler = condor.BackpressureScheduler(
+        runner,
+        target_idle=QUEUE_COUNT,
+        max_active=MAX_JOB_COUNT,
+        rate=SUBMIT_RATE,
+        fit_to_pool=True,
+    )
+    scheduler.run()
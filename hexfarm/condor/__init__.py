@@ -38,13 +38,18 @@ import logging
 # -------------- Hexfarm  Library -------------- #
 
 from .core import *
+from .aio import AsyncConfigRunner, AsyncJobManager, async_submit_config
+from .callbacks import CompletionWatcher, default_completion_watcher
 from .daemon import clean_source, PseudoDaemon
-from ..util import try_import
+from .dag import Dag, DagNode, DagNodeStatus, DagRun
+from .description import SubmitDescription, parse_submit_file
+from .history import HDF5HistoryStore, ParquetHistoryStore, ingest_history
+from .itemdata import write_itemdata
+from .journal import JobJournal
+from .local import LocalCondor, LocalSubmitBackend
+from .outputs import OutputCollector
+from .scheduler import BackpressureScheduler, LogWatcher, TokenBucket
+from .table import JobRecord, JobTable
 
 
 LOGGER = logging.getLogger(__name__)
-
-
-htcondor, HTCONDOR_SUPPORT = try_import("htcondor", log_error=LOGGER.info)
-
-classad, CLASSAD_SUPPORT = try_import("classad", log_error=LOGGER.info)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/aio.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Asyncio Utilities for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import asyncio
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..shell import decoded
+from ..util import value_or
+from .core import *
+
+
+__all__ = (
+    "CommandLimiter",
+    "async_submit_config",
+    "AsyncConfigRunner",
+    "AsyncJobManager",
+)
+
+
+class CommandLimiter:
+    """
+    Bound on the Number of Condor Commands in Flight.
+
+    """
+
+    def __init__(self, max_in_flight=8):
+        """Initialize Command Limiter."""
+        self.max_in_flight = max_in_flight
+        self._semaphore = None
+
+    @property
+    def semaphore(self):
+        """Get Semaphore, Creating it Inside the Running Loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    async def run(self, command, *args, **kwargs):
+        """Run Command as an Asyncio Subprocess."""
+        async with self.semaphore:
+            return await command.run_async(*args, **kwargs)
+
+    async def run_in_executor(self, f, *args):
+        """Run Blocking Function in the Default Executor."""
+        async with self.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(None, f, *args)
+
+
+async def async_submit_config(
+    config, path=None, logfile=None, *args, backend=None, limiter=None, **kwargs
+):
+    """Submit Configuration File without Blocking the Event Loop."""
+    backend = value_or(backend, default_submit_backend())
+    limiter = value_or(limiter, CommandLimiter())
+    if isinstance(backend, SubprocessSubmitBackend):
+        with backend.submit_file(config, path) as submit_path:
+            submit_output = decoded(
+                await limiter.run(condor_submit, submit_path, *args, **kwargs)
+            )
+        job_ranges = tuple(extract_job_ranges(submit_output))
+    else:
+        job_ranges = await limiter.run_in_executor(
+            lambda: backend.submit(config, path, *args, **kwargs)
+        )
+    QUEUE_CACHE.invalidate()
+    return tuple(
+        ClusterJobRange(cluster, count, first, config=config, logfile=logfile)
+        for cluster, first, count in job_ranges
+    )
+
+
+class AsyncConfigRunner:
+    """
+    Asyncio Configuration Runner.
+
+    """
+
+    def __init__(self, runner, limiter=None, backend=None):
+        """Initialize Asyncio Configuration Runner."""
+        self.runner = runner
+        self.limiter = value_or(limiter, CommandLimiter())
+        self.backend = value_or(backend, runner.backend)
+
+    @property
+    def jobmap(self):
+        """Get Job Map of Runner."""
+        return self.runner.jobmap
+
+    @property
+    def running_job_count(self):
+        """Get Current Running Job Count."""
+        return self.runner.running_job_count
+
+    async def submit(self, *args, **kwargs):
+        """Submit Jobs and Return their Cluster Job Ranges."""
+        jobs = await async_submit_config(
+            self.runner.config,
+            self.runner.config_path,
+            self.runner.logfile,
+            *args,
+            backend=self.backend,
+            limiter=self.limiter,
+            **kwargs,
+        )
+        return self.runner.record(*jobs)
+
+    async def poll(self):
+        """Update Job States and Return Newly Completed Job Ids."""
+        return await self.limiter.run_in_executor(self.jobmap.poll)
+
+    async def wait(self, *job_ids, timeout=None, interval=1):
+        """Wait for Jobs to Complete."""
+        job_ids = value_or(job_ids or None, tuple(self.jobmap.job_ids))
+
+        async def _wait():
+            while True:
+                await self.poll()
+                if all(map(self.jobmap.has_completed, job_ids)):
+                    return job_ids
+                await asyncio.sleep(interval)
+
+        return await asyncio.wait_for(_wait(), timeout)
+
+    async def remove(self, *job_ids, use_constraint=True, **kwargs):
+        """Remove Jobs with One Command per Argument Chunk."""
+        job_ids = value_or(job_ids or None, tuple(self.jobmap.job_ids))
+        result = await asyncio.gather(
+            *(
+                self.limiter.run(condor_rm, *arguments, **kwargs)
+                for arguments in bulk_job_arguments(
+                    job_ids, use_constraint=use_constraint
+                )
+            )
+        )
+        self.jobmap.discard(*job_ids)
+        QUEUE_CACHE.invalidate()
+        return tuple(result)
+
+    async def submit_while(
+        self, predicate, *args, wait=SUBMIT_WHILE_INTERVAL, **kwargs
+    ):
+        """Submit Jobs while predicate holds, Waiting between Submissions."""
+        while await self.limiter.run_in_executor(predicate, self.runner):
+            await self.submit(*args, **kwargs)
+            await asyncio.sleep(wait)
+
+
+class AsyncJobManager:
+    """
+    Asyncio Job Manager.
+
+    All runners share one bound on the number of condor commands in flight.
+
+    """
+
+    def __init__(self, manager=None, *, max_in_flight=8, backend=None):
+        """Initialize Asyncio Job Manager."""
+        self.manager = value_or(manager, JobManager())
+        self.limiter = CommandLimiter(max_in_flight)
+        self.backend = backend
+        self._runners = dict()
+
+    def add_config(self, name, config, *args, **kwargs):
+        """Add Configuration to JobManager."""
+        self._runners[name] = AsyncConfigRunner(
+            self.manager.add_config(name, config, *args, **kwargs),
+            limiter=self.limiter,
+            backend=self.backend,
+        )
+        return self._runners[name]
+
+    def __getitem__(self, name):
+        """Get Asyncio Configuration Runner."""
+        return self._runners[name]
+
+    def __iter__(self):
+        """Iterate over Runner Names."""
+        return iter(self._runners)
+
+    def __len__(self):
+        """Number of Runners."""
+        return len(self._runners)
+
+    async def _gather(self, method, *args, **kwargs):
+        """Call Method on All Runners Concurrently."""
+        names = tuple(self._runners)
+        results = await asyncio.gather(
+            *(getattr(self._runners[n], method)(*args, **kwargs) for n in names)
+        )
+        return dict(zip(names, results))
+
+    async def submit_all(self, *args, **kwargs):
+        """Submit Jobs for All Runners."""
+        return await self._gather("submit", *args, **kwargs)
+
+    async def poll_all(self):
+        """Poll All Runners."""
+        return await self._gather("poll")
+
+    async def wait_all(self, *, timeout=None, interval=1):
+        """Wait for All Jobs of All Runners."""
+        return await self._gather("wait", timeout=timeout, interval=interval)
+
+    async def remove_all(self, **kwargs):
+        """Remove All Jobs of All Runners."""
+        return await self._gather("remove", **kwargs)
+
+    async def submit_while_all(
+        self, predicate, *args, wait=SUBMIT_WHILE_INTERVAL, **kwargs
+    ):
+        """Submit Jobs for All Runners while predicate holds."""
+        return await self._gather("submit_while", predicate, *args, wait=wait, **kwargs)
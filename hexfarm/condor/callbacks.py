@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/callbacks.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Job Completion Callbacks for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from time import monotonic
+
+# -------------- External Library -------------- #
+
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from .core import ClusterJobRange, split_job_id, user_jobs
+from .scheduler import LogWatcher
+from .userlog import UserLogTracker
+
+
+__all__ = (
+    "CompletionWatcher",
+    "default_completion_watcher",
+)
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _RangeCallback:
+    """
+    Callback Registered on every Process of a Cluster Job Range.
+
+    """
+
+    __slots__ = (
+        "job_range",
+        "callback",
+        "args",
+        "kwargs",
+        "dispatched",
+        "results",
+        "future",
+        "_lock",
+    )
+
+    def __init__(self, job_range, callback, args, kwargs):
+        """Initialize Range Callback."""
+        self.job_range = job_range
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.dispatched = set()
+        self.results = dict()
+        self.future = Future()
+        self._lock = threading.Lock()
+
+    @property
+    def is_dispatched(self):
+        """Check if Callbacks of every Process were Dispatched."""
+        return len(self.dispatched) == self.job_range.count
+
+    def collect(self, process, done):
+        """Store Outcome of a Process and Resolve once Every Process is Done."""
+        error = done.exception()
+        with self._lock:
+            self.results[process] = error if error is not None else done.result()
+            if len(self.results) == self.job_range.count:
+                self.future.set_result(
+                    tuple(self.results[p] for p in self.job_range.processes)
+                )
+
+
+class CompletionWatcher:
+    """
+    Background Dispatcher of Job Completion Callbacks.
+
+    A single thread follows the user logs of every registered job, waking when a
+    log changes, and hands each finished job to its callbacks on a bounded thread
+    or process pool. Registering a callback only stores it: a Cluster Job Range is
+    one entry however many processes it has, and nothing is read or run for a job
+    until its completion or removal is written to its log. Jobs without a log are
+    checked against queue snapshots every ``queue_interval`` seconds. Finished jobs
+    are forgotten once their callbacks have run, and a log is no longer read once
+    no registration is waiting on it.
+
+    With a process pool, callbacks and their arguments must be picklable.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        executor=None,
+        max_workers=4,
+        use_processes=False,
+        min_interval=0.05,
+        max_interval=2.0,
+        queue_interval=30.0,
+    ):
+        """Initialize Completion Watcher."""
+        if executor is None:
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            executor = pool(max_workers)
+        self.executor = executor
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.queue_interval = queue_interval
+        self.tracker = UserLogTracker()
+        self._logs = LogWatcher()
+        self._lock = threading.RLock()
+        self._job_callbacks = dict()
+        self._range_callbacks = dict()
+        self._untracked = dict()
+        self._registrations = Counter()
+        self._running = Counter()
+        self._pending = set()
+        self._unread = False
+        self._last_queue_check = monotonic()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # -------------- Registration -------------- #
+
+    def register(self, job, callback, *args, **kwargs):
+        """
+        Run Callback on a Job or Cluster Job Range when it Completes or is Removed.
+
+        The callback is called with the job followed by the extra arguments, as
+        for Job.on_completion. Returns a future for the callback result. For a
+        Cluster Job Range the callback runs once per process and the future holds
+        the tuple of results, or raised exceptions, in process order once every
+        process has finished.
+
+        """
+        if isinstance(job, ClusterJobRange):
+            return self._register_range(job, callback, args, kwargs)
+        future = Future()
+        with self._lock:
+            entry = (job, callback, args, kwargs, future)
+            self._job_callbacks.setdefault(job.job_id, []).append(entry)
+            if job.logfile:
+                self._follow(job.logfile, split_job_id(job.job_id)[0])
+                if self.tracker.is_finished(job.job_id):
+                    self._pending.add(job.job_id)
+            else:
+                self._untracked[job.job_id] = job.submitter
+        self._ensure_started()
+        return future
+
+    def _register_range(self, job_range, callback, args, kwargs):
+        """Register Callback on every Process of a Cluster Job Range."""
+        entry = _RangeCallback(job_range, callback, args, kwargs)
+        with self._lock:
+            self._range_callbacks.setdefault(job_range.cluster, []).append(entry)
+            if job_range.logfile:
+                self._follow(job_range.logfile, job_range.cluster)
+                self._pending.update(
+                    job_id
+                    for job_id in job_range.job_ids()
+                    if self.tracker.is_finished(job_id)
+                )
+            else:
+                for job_id in job_range.job_ids():
+                    self._untracked[job_id] = job_range.submitter
+        self._ensure_started()
+        return entry.future
+
+    def _follow(self, logfile, cluster):
+        """Follow Log File of a Registration and Restore its Forgotten Jobs."""
+        path = Path(logfile).abspath()
+        self.tracker.track_cluster(cluster, path)
+        self._logs.add(path)
+        self._registrations[path] += 1
+        self._unread = True
+        self._wake.set()
+
+    def _release(self, logfile, *_):
+        """Release Log File of a Finished Registration, Dropping it if Unused."""
+        path = Path(logfile).abspath()
+        with self._lock:
+            self._registrations[path] -= 1
+            if self._registrations[path] <= 0:
+                del self._registrations[path]
+                self.tracker.remove_logfile(path)
+                self._logs.remove(path)
+
+    def __len__(self):
+        """Number of Pending Registrations."""
+        with self._lock:
+            return len(self._job_callbacks) + sum(
+                map(len, self._range_callbacks.values())
+            )
+
+    # -------------- Dispatch -------------- #
+
+    def _dispatch(self, job_id):
+        """Submit Callbacks of Finished Job to the Pool."""
+        cluster, process = split_job_id(job_id)
+        for job, callback, args, kwargs, future in self._job_callbacks.pop(job_id, ()):
+            self._submit(future, callback, job, args, kwargs, job.logfile)
+        entries = self._range_callbacks.get(cluster)
+        if entries:
+            for entry in entries:
+                if process in entry.job_range.processes:
+                    if process not in entry.dispatched:
+                        entry.dispatched.add(process)
+                        future = Future()
+                        future.add_done_callback(partial(entry.collect, process))
+                        job = entry.job_range.job(process)
+                        self._submit(
+                            future, entry.callback, job, entry.args, entry.kwargs
+                        )
+            for entry in entries:
+                if entry.is_dispatched and entry.job_range.logfile:
+                    entry.future.add_done_callback(
+                        partial(self._release, entry.job_range.logfile)
+                    )
+            entries[:] = [entry for entry in entries if not entry.is_dispatched]
+            if not entries:
+                del self._range_callbacks[cluster]
+        self._untracked.pop(job_id, None)
+
+    def _submit(self, future, callback, job, args, kwargs, logfile=None):
+        """Run Callback on the Pool and Forward its Outcome to the Future."""
+        self._running[job.job_id] += 1
+        try:
+            pool_future = self.executor.submit(callback, job, *args, **kwargs)
+        except RuntimeError as error:
+            self._done(job.job_id, logfile)
+            future.set_exception(error)
+            return
+        pool_future.add_done_callback(partial(self._done, job.job_id, logfile))
+        pool_future.add_done_callback(partial(_forward, future, job))
+
+    def _done(self, job_id, logfile=None, *_):
+        """Forget a Job once its Last Callback has Run."""
+        with self._lock:
+            self._running[job_id] -= 1
+            if self._running[job_id] <= 0:
+                del self._running[job_id]
+                self.tracker.forget(job_id)
+            if logfile:
+                self._release(logfile)
+
+    def outcome(self, job_id):
+        """Get (Status, Return Value) of a Job, Known while its Callbacks Run."""
+        with self._lock:
+            return self.tracker.status(job_id), self.tracker.return_value(job_id)
+
+    def poll(self):
+        """Read New Events and Dispatch Callbacks of Finished Jobs."""
+        with self._lock:
+            self._unread = False
+            finished = self.tracker.poll() | self._pending
+            self._pending = set()
+            if self._untracked and (
+                monotonic() - self._last_queue_check >= self.queue_interval
+            ):
+                self._last_queue_check = monotonic()
+                queued = {
+                    submitter: set(user_jobs(submitter))
+                    for submitter in set(self._untracked.values())
+                }
+                finished.update(
+                    job_id
+                    for job_id, submitter in self._untracked.items()
+                    if job_id not in queued[submitter]
+                )
+            for job_id in finished:
+                self._dispatch(job_id)
+            self.tracker.forget(*(j for j in finished if j not in self._running))
+        return finished
+
+    # -------------- Background Thread -------------- #
+
+    def _run(self):
+        """Watch Logs until Stopped."""
+        interval = self.min_interval
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self._lock:
+                changed = self._logs.changed() or self._unread
+            if changed or self._untracked:
+                try:
+                    finished = self.poll()
+                except Exception as error:
+                    LOGGER.error("Completion watcher poll failed: %r", error)
+                    finished = ()
+                changed = changed or bool(finished)
+            interval = self.min_interval if changed else interval * 2
+            interval = min(interval, self.max_interval)
+            self._wake.wait(interval)
+
+    def _ensure_started(self):
+        """Start the Background Thread on First Registration."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="hexfarm-completion-watcher", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, *, wait=True):
+        """Stop Watching and Shut Down the Pool."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        """Enter Watcher Context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop Watcher."""
+        self.stop()
+
+    def __repr__(self):
+        """Representation of Completion Watcher."""
+        return f"{type(self).__name__}({len(self)} pending, {self.tracker!r})"
+
+
+def _forward(future, job, done):
+    """Forward Outcome of a Pool Future, Logging Failed Callbacks."""
+    error = done.exception()
+    if error is not None:
+        LOGGER.error("Completion callback for %s failed: %r", job, error)
+        future.set_exception(error)
+    else:
+        future.set_result(done.result())
+
+
+_DEFAULT_COMPLETION_WATCHER = None
+
+
+def default_completion_watcher():
+    """Get Shared Completion Watcher, Creating it on First Use."""
+    global _DEFAULT_COMPLETION_WATCHER
+    if _DEFAULT_COMPLETION_WATCHER is None:
+        _DEFAULT_COMPLETION_WATCHER = CompletionWatcher()
+    return _DEFAULT_COMPLETION_WATCHER
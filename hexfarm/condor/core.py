@@ -33,13 +33,17 @@ Core Utilities for the HTCondor Parallel Computing Framework.
 
 # -------------- Standard Library -------------- #
 
+import asyncio
+import hashlib
+import logging
+import re
 import tempfile
-from collections import UserList, deque
+from collections import Counter, UserList, defaultdict, deque
 from collections.abc import Mapping
 from contextlib import contextmanager
 from dataclasses import dataclass, field, InitVar
-from itertools import starmap
-from time import time
+from itertools import chain, islice, starmap
+from time import perf_counter, sleep, time
 from typing import Sequence
 
 # -------------- External Library -------------- #
@@ -50,15 +54,50 @@ from path import Path
 
 # -------------- Hexfarm  Library -------------- #
 
-from ..shell import decoded, Command, me
-from ..util import classproperty, map_value_or, value_or
+from ..shell import PIPE, decoded, Command, me, ME
+from ..util import classproperty, map_value_or, try_import, value_or
+from .description import SubmitDescription, parse_submit_file
+from .itemdata import itemdata_columns, write_itemdata
+from .query import (
+    JOB_ID_ATTRIBUTES,
+    SLOT_ATTRIBUTES,
+    JobColumns,
+    PoolCache,
+    QueueCache,
+    check_stream,
+    iter_ad_records,
+    iter_autoformat,
+    iter_json_ads,
+)
+from .userlog import JobStatus, UserLogTracker
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+htcondor, HTCONDOR_SUPPORT = try_import("htcondor", log_error=LOGGER.info)
+
+classad, CLASSAD_SUPPORT = try_import("classad", log_error=LOGGER.info)
 
 
 __all__ = (
+    "htcondor",
+    "HTCONDOR_SUPPORT",
+    "classad",
+    "CLASSAD_SUPPORT",
     "CondorCommand",
     "CONDOR_COMMANDS",
+    "iter_jobs",
+    "query_jobs",
     "current_jobs",
+    "QUEUE_SNAPSHOT_TTL",
+    "QUEUE_CACHE",
+    "queue_snapshot",
     "user_jobs",
+    "iter_slots",
+    "POOL_SNAPSHOT_TTL",
+    "POOL_CACHE",
+    "pool_snapshot",
     "Universe",
     "Notification",
     "FileTransferMode",
@@ -66,26 +105,112 @@ __all__ = (
     "This",
     "condor_format_mapping",
     "condor_format_sequence",
+    "SUBMITTED_CLUSTER_PATTERN",
+    "extract_job_ranges",
     "extract_job_ids",
+    "split_job_id",
+    "CONSTRAINT_SEPARATOR",
+    "BULK_ARGUMENT_BYTES",
+    "group_job_ids",
+    "job_constraint",
+    "bulk_job_arguments",
+    "bulk_job_command",
     "CONDOR_SUBMIT_COMMANDS",
+    "SUBMIT_KEY_PATTERN",
+    "submit_line_key",
     "JobConfig",
+    "text_digest",
+    "config_digest",
+    "WRITTEN_CONFIG_CACHE_SIZE",
+    "write_config_file",
+    "write_config_lines",
     "minimal_config",
+    "parse_quantity",
+    "job_requests",
+    "machine_constraint",
+    "sized_config",
+    "pool_batch_size",
+    "SubmitBackend",
+    "SubprocessSubmitBackend",
+    "ScheddSubmitBackend",
+    "default_submit_backend",
     "submit_config",
+    "submit_configs",
     "Job",
+    "ClusterJobRange",
     "job_dict",
     "JobCompletedException",
     "JobMap",
+    "join_configs",
     "ConfigUnitBase",
     "ProcessUnit",
     "ClusterUnit",
     "MultiClusterUnit",
+    "SUBMIT_WHILE_INTERVAL",
     "ConfigRunner",
     "JobManager",
 )
 
 
 class CondorCommand(Command, prefix="condor_"):
-    """Condor Command Object."""
+    """
+    Condor Command Object.
+
+    When ``local`` is set, commands are answered in process by that stand-in
+    (see :class:`hexfarm.condor.local.LocalCondor`) instead of spawning tools.
+
+    """
+
+    local = None
+
+    def _run_local(self, local, args):
+        """Run Command against the Local Stand-In."""
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        result = local.run(self.name, self._running_args(*args)[1:])
+        if metrics is not None:
+            metrics.record(
+                self.full_name,
+                perf_counter() - start,
+                result.returncode,
+                len(result.stdout) + len(result.stderr),
+            )
+        return result
+
+    def open(self, *args, **kwargs):
+        """Open Process for Given Command."""
+        local = self.local
+        if local is None:
+            return super().open(*args, **kwargs)
+        return local.open(self._run_local(local, args), **kwargs)
+
+    def run(self, *args, result_decoded=None, clean_output=None, **kwargs):
+        """Run Command."""
+        local = self.local
+        if local is None:
+            return super().run(
+                *args,
+                result_decoded=result_decoded,
+                clean_output=clean_output,
+                **kwargs,
+            )
+        return self._finish(self._run_local(local, args), result_decoded, clean_output)
+
+    async def run_async(self, *args, result_decoded=None, clean_output=None, **kwargs):
+        """Run Command as an Asyncio Subprocess."""
+        local = self.local
+        if local is None:
+            return await super().run_async(
+                *args,
+                result_decoded=result_decoded,
+                clean_output=clean_output,
+                **kwargs,
+            )
+        result = await asyncio.get_event_loop().run_in_executor(
+            None, self._run_local, local, args
+        )
+        return self._finish(result, result_decoded, clean_output)
 
 
 CONDOR_COMMANDS = (
@@ -188,21 +313,90 @@ def add_condor_commands(commands, command_dict):
 __all__ += add_condor_commands(CONDOR_COMMANDS, globals())
 
 
+def iter_jobs(*attributes, usernames=(), constraint=None, use_json=False):
+    """Stream Current Jobs as (ClusterId, ProcId, *attributes) Records."""
+    attributes = JOB_ID_ATTRIBUTES + attributes
+    args = list(usernames)
+    if constraint:
+        args.extend(("-constraint", str(constraint)))
+    if use_json:
+        args.extend(("-json", "-attributes", ",".join(attributes)))
+    else:
+        args.extend(("-af:t", *attributes))
+    process = condor_q.open(*args, stdout=PIPE, universal_newlines=True)
+    try:
+        if use_json:
+            chunks = iter(lambda: process.stdout.read(1 << 16), "")
+            yield from iter_ad_records(iter_json_ads(chunks), attributes)
+        else:
+            yield from iter_autoformat(process.stdout, len(attributes))
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    check_stream(process, returncode)
+
+
+def query_jobs(
+    *attributes, usernames=(), constraint=None, use_json=False, as_frame=False
+):
+    """Query Current Jobs into a Structured Array or DataFrame."""
+    columns = JobColumns.from_records(
+        iter_jobs(
+            *attributes, usernames=usernames, constraint=constraint, use_json=use_json
+        ),
+        attributes,
+    )
+    return columns.to_pandas() if as_frame else columns.to_numpy()
+
+
 def current_jobs(*usernames):
     """List the Current Jobs by Users."""
-    query = condor_q(" ".join(usernames)) if usernames else condor_q()
-    text = decoded(query).strip().split("\n")
     user_dict = dict()
-    for job_id, name, *_ in list(map(lambda l: l.strip().split(), text))[2:-2]:
-        if name not in user_dict:
-            user_dict[name] = []
-        user_dict[name].append(job_id)
+    for cluster, process, owner in iter_jobs("Owner", usernames=usernames):
+        user_dict.setdefault(owner, []).append(f"{cluster}.{process}")
     return user_dict
 
 
-def user_jobs(username=me()):
+QUEUE_SNAPSHOT_TTL = 10
+
+QUEUE_CACHE = QueueCache(current_jobs, ttl=QUEUE_SNAPSHOT_TTL)
+
+
+def queue_snapshot(*usernames, max_age=None):
+    """Get Shared Snapshot of the Current Jobs by Users."""
+    return QUEUE_CACHE.snapshot(*usernames, max_age=max_age)
+
+
+def user_jobs(username=me(), *, max_age=None):
     """Get User's Jobs."""
-    return current_jobs(username)[username]
+    return queue_snapshot(username, max_age=max_age).jobs_of(username)
+
+
+def iter_slots(*attributes, constraint=None):
+    """Stream Slots of the Pool as Autoformatted Records."""
+    args = ["-constraint", str(constraint)] if constraint else []
+    process = condor_status.open(
+        *args, "-af:t", *attributes, stdout=PIPE, universal_newlines=True
+    )
+    try:
+        yield from iter_autoformat(process.stdout, len(attributes))
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    check_stream(process, returncode)
+
+
+POOL_SNAPSHOT_TTL = 30
+
+POOL_CACHE = PoolCache(
+    lambda constraint: iter_slots(*SLOT_ATTRIBUTES, constraint=constraint),
+    ttl=POOL_SNAPSHOT_TTL,
+)
+
+
+def pool_snapshot(constraint=None, *, max_age=None):
+    """Get Shared Snapshot of the Slots Matching Constraint."""
+    return POOL_CACHE.snapshot(constraint, max_age=max_age)
 
 
 class NameEnum(Enum, settings=AutoValue):
@@ -281,28 +475,159 @@ def condor_format_sequence(sequence):
     return " ".join(map(str, sequence))
 
 
-def open_key_value_pairs(self, *pairs, connector="=", ignore_unpacking_error=True):
-    """Open Pair and Check for Keys and Values."""
-    if not pairs:
-        return None, None
-    if len(pairs) == 1:
-        try:
-            key, value = tuple(map(lambda o: o.strip(), pairs[0].split(connector)))
-            return ((key, value),)
-        except ValueError as value_error:
-            if ignore_unpacking_error:
-                return ((None, None),)
-            raise value_error
-    else:
-        # TODO: replace recursive implementation
-        return sum(tuple(open_key_value_pairs(line) for line in pairs), ())
+def open_key_value_pair(pair, *, connector="=", ignore_unpacking_error=True):
+    """Open Pair into a Stripped Key and Value."""
+    key, found, value = pair.partition(connector)
+    if not found:
+        if ignore_unpacking_error:
+            return None, None
+        raise ValueError(f"Missing {connector!r} in {pair!r}.")
+    return key.strip(), value.strip()
+
+
+def open_key_value_pairs(*pairs, connector="=", ignore_unpacking_error=True):
+    """Open Pairs and Check for Keys and Values."""
+    return tuple(
+        open_key_value_pair(
+            pair, connector=connector, ignore_unpacking_error=ignore_unpacking_error
+        )
+        for pair in pairs
+    )
+
+
+SUBMIT_KEY_PATTERN = re.compile(r"^\s*([+\w.-]+)\s*=(.*)$", re.DOTALL)
+
+QUEUE_KEY = "queue"
+
+
+def submit_line_key(line):
+    """Get Lowercase Submit Command Key of a Line or None for Comments and Blanks."""
+    match = SUBMIT_KEY_PATTERN.match(line)
+    if match:
+        return match.group(1).lower()
+    stripped = line.strip()
+    if stripped[:5].lower() == QUEUE_KEY and stripped[5:6] in ("", " ", "\t"):
+        return QUEUE_KEY
+    return None
+
+
+SUBMITTED_CLUSTER_PATTERN = re.compile(r"(\d+) job\(s\) submitted to cluster (\d+)\.")
+
+
+def extract_job_ranges(condor_submit_text):
+    """Extract (Cluster, First Process, Count) Triples from Condor Submit Text."""
+    for match in SUBMITTED_CLUSTER_PATTERN.finditer(condor_submit_text):
+        count, cluster = map(int, match.groups())
+        yield cluster, 0, count
 
 
 def extract_job_ids(condor_submit_text):
     """Extract Job Ids from Condor Submit Text."""
-    _, _, count, *_, cluster = condor_submit_text.strip().split()
-    for process in map(str, range(int(count))):
-        yield cluster + process
+    for cluster, first, count in extract_job_ranges(condor_submit_text):
+        for process in range(first, first + count):
+            yield f"{cluster}.{process}"
+
+
+def split_job_id(job_id):
+    """Split Job Id into Cluster and Process, with None for a Whole Cluster."""
+    cluster, _, process = str(job_id).partition(".")
+    return int(cluster), (int(process) if process else None)
+
+
+CONSTRAINT_SEPARATOR = " || "
+
+# Kept well below the 128 KiB limit of Linux on a single argument (MAX_ARG_STRLEN).
+BULK_ARGUMENT_BYTES = 96 << 10
+
+
+def group_job_ids(job_ids):
+    """Group Job Ids by Cluster, with None Standing for a Whole Cluster."""
+    clusters = defaultdict(set)
+    for job_id in job_ids:
+        cluster, process = split_job_id(job_id)
+        if process is None:
+            clusters[cluster] = None
+        elif clusters[cluster] is not None:
+            clusters[cluster].add(process)
+    return dict(clusters)
+
+
+def process_ranges(processes):
+    """Collapse Process Ids into Sorted Inclusive Ranges."""
+    first = last = None
+    for process in sorted(processes):
+        if last is not None and process == last + 1:
+            last = process
+            continue
+        if first is not None:
+            yield first, last
+        first = last = process
+    if first is not None:
+        yield first, last
+
+
+def _constraint_terms(clusters):
+    """Generate Constraint Terms for Grouped Job Ids."""
+    for cluster, processes in sorted(clusters.items()):
+        if processes is None:
+            yield f"ClusterId == {cluster}"
+            continue
+        for first, last in process_ranges(processes):
+            if first == last:
+                yield f"(ClusterId == {cluster} && ProcId == {first})"
+            else:
+                yield (
+                    f"(ClusterId == {cluster} && ProcId >= {first} && ProcId <= {last})"
+                )
+
+
+def job_constraint(job_ids):
+    """Build ClassAd Constraint Matching Job Ids."""
+    return CONSTRAINT_SEPARATOR.join(_constraint_terms(group_job_ids(job_ids)))
+
+
+def _chunk_arguments(arguments, limit, separator_length=1):
+    """Chunk Arguments so each Chunk, Separators Included, Fits in the Byte Limit."""
+    chunk, size = [], 0
+    for argument in arguments:
+        length = len(argument) + separator_length
+        if chunk and size + length > limit:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(argument)
+        size += length
+    if chunk:
+        yield chunk
+
+
+def bulk_job_arguments(job_ids, *, use_constraint=False, limit=BULK_ARGUMENT_BYTES):
+    """Generate Argument Lists Covering Job Ids in Few Commands."""
+    clusters = group_job_ids(job_ids)
+    if use_constraint:
+        for chunk in _chunk_arguments(
+            _constraint_terms(clusters), limit, len(CONSTRAINT_SEPARATOR)
+        ):
+            yield ("-constraint", CONSTRAINT_SEPARATOR.join(chunk))
+        return
+    arguments = (
+        str(cluster) if processes is None else f"{cluster}.{process}"
+        for cluster, processes in sorted(clusters.items())
+        for process in (sorted(processes) if processes is not None else (None,))
+    )
+    for chunk in _chunk_arguments(arguments, limit):
+        yield tuple(chunk)
+
+
+def bulk_job_command(
+    command, job_ids, *args, use_constraint=False, limit=BULK_ARGUMENT_BYTES, **kwargs
+):
+    """Run Command over Many Jobs with Few Invocations."""
+    return tuple(
+        command(*arguments, *args, **kwargs)
+        for arguments in bulk_job_arguments(
+            job_ids, use_constraint=use_constraint, limit=limit
+        )
+    )
 
 
 class WriteModeMixin:
@@ -554,12 +879,29 @@ class JobConfig(UserList, WriteModeMixin, write_mode_keywords=CONDOR_SUBMIT_COMM
     def from_file(
         cls, path, opener=open, *args, clean_input=str.strip, keep_path=True, **kwargs
     ):
-        """Load Job Config from File."""
+        """
+        Load Job Config from File.
+
+        Lines are kept as written, see from_submit_file to resolve continuations
+        and includes.
+
+        """
         with opener(path, *args, **kwargs) as file:
             return cls(
-                *(clean_input(line) for line in file), path=path if keep_path else None
+                [clean_input(line) for line in file], path=path if keep_path else None
             )
 
+    @classmethod
+    def from_submit_file(cls, path, *, keep_path=True):
+        """
+        Load Job Config from a Submit File with Continuations and Includes Resolved.
+
+        """
+        description = parse_submit_file(path)
+        config = cls(list(description.lines()), path=path if keep_path else None)
+        config.__dict__["_description_cache"] = description
+        return config
+
     def __init_subclass__(cls, special_key_map=None, **kwargs):
         """Initialize Subclasses with Special Key Maps."""
         super().__init_subclass__(**kwargs)
@@ -569,9 +911,87 @@ class JobConfig(UserList, WriteModeMixin, write_mode_keywords=CONDOR_SUBMIT_COMM
     def __init__(self, *lines, path=None):
         """Initialize Config."""
         self.__dict__["_write_mode"] = False
+        self.__dict__["_text_cache"] = None
+        self.__dict__["_hash_cache"] = None
+        self.__dict__["_key_index"] = None
+        self.__dict__["_description_cache"] = None
         super().__init__(*lines)
+        if any("\n" in line for line in map(str, self.data)):
+            self.data = [
+                part for line in map(str, self.data) for part in line.split("\n")
+            ]
+        self.__dict__["_line_keys"] = list(map(submit_line_key, self.data))
         self._path = path
 
+    def _invalidate(self, *, reindex=False):
+        """Clear Cached Text and Content Hash after Mutation."""
+        self.__dict__["_text_cache"] = None
+        self.__dict__["_hash_cache"] = None
+        self.__dict__["_description_cache"] = None
+        if reindex:
+            self.__dict__["_key_index"] = None
+
+    @property
+    def key_index(self):
+        """Get Map from Lowercase Key to the Line Positions where it is Set."""
+        if self._key_index is None:
+            index = defaultdict(list)
+            for position, key in enumerate(self._line_keys):
+                if key is not None:
+                    index[key].append(position)
+            self.__dict__["_key_index"] = index
+        return self._key_index
+
+    def _positions(self, key):
+        """Get Line Positions of Key."""
+        return self.key_index.get(key.lower(), ())
+
+    def has_key(self, key):
+        """Check if Submit Command is Set in Config."""
+        return bool(self._positions(key))
+
+    def get(self, key, default=None):
+        """Get Value of the Last Setting of a Submit Command."""
+        positions = self._positions(key)
+        if not positions:
+            return default
+        return open_key_value_pair(self.data[positions[-1]])[1]
+
+    def set(self, key, value):
+        """
+        Set Value of a Submit Command.
+
+        The last line setting the key is overwritten in place. New keys are placed
+        before the first queue statement so that they apply to every queue.
+
+        """
+        line = kv_string(key, value)
+        positions = self._positions(key)
+        if positions:
+            self[positions[-1]] = line
+            return
+        queues = self.key_index.get(QUEUE_KEY)
+        if queues:
+            self.insert(queues[0], line)
+        else:
+            self.append(line)
+
+    def delete(self, key):
+        """Delete Every Line Setting a Submit Command."""
+        positions = self._positions(key)
+        if not positions:
+            raise KeyError(key)
+        for position in reversed(positions):
+            del self[position]
+
+    def keys(self):
+        """Get Submit Command Keys in Order of First Appearance."""
+        return [key for key in self.key_index if key != QUEUE_KEY]
+
+    def items(self):
+        """Get Effective (Key, Value) Pairs in Order of First Appearance."""
+        return [(key, self.get(key)) for key in self.keys()]
+
     def _build_path_save_mechanism(self):
         """Build Path Save Mechanism."""
         if hasattr(self, "save"):
@@ -580,7 +1000,7 @@ class JobConfig(UserList, WriteModeMixin, write_mode_keywords=CONDOR_SUBMIT_COMM
             )
 
         def _save(s):
-            Path(s.path).write_text(s.as_text)
+            write_config_file(s, s.path, force=True)
 
         def _save_as(s, new_path):
             s._path = new_path
@@ -616,10 +1036,12 @@ class JobConfig(UserList, WriteModeMixin, write_mode_keywords=CONDOR_SUBMIT_COMM
         """Alias to Inner Structure."""
         return self.data
 
-    @property
+    @lines.setter
     def lines(self, new_lines):
         """Set Inner Structure."""
-        self.data = new_lines
+        self.data = list(new_lines)
+        self.__dict__["_line_keys"] = list(map(submit_line_key, self.data))
+        self._invalidate(reindex=True)
 
     def to_text(self, *, with_newlines=True):
         """Return Config as Multiline Text."""
@@ -627,8 +1049,30 @@ class JobConfig(UserList, WriteModeMixin, write_mode_keywords=CONDOR_SUBMIT_COMM
 
     @property
     def as_text(self):
-        """Return Config as Multiline Text."""
-        return self.to_text()
+        """Return Config as Multiline Text, Cached until the Next Mutation."""
+        if self._text_cache is None:
+            self.__dict__["_text_cache"] = self.to_text()
+        return self._text_cache
+
+    @property
+    def description(self):
+        """Get Parsed Submit Description, Cached until the Next Mutation."""
+        if self._description_cache is None:
+            try:
+                directory = Path(self.path).abspath().parent
+            except (AttributeError, TypeError):
+                directory = Path(".")
+            self.__dict__["_description_cache"] = SubmitDescription.from_lines(
+                self.data, directory
+            )
+        return self._description_cache
+
+    @property
+    def content_hash(self):
+        """Get SHA-256 Hex Digest of the Config Text."""
+        if self._hash_cache is None:
+            self.__dict__["_hash_cache"] = text_digest(self.as_text)
+        return self._hash_cache
 
     def __repr__(self):
         """Representation of Config File."""
@@ -641,20 +1085,104 @@ class JobConfig(UserList, WriteModeMixin, write_mode_keywords=CONDOR_SUBMIT_COMM
         """Get Config File as a String."""
         return self.as_text
 
+    def _search_special_keys(self, line):
+        """Set Special Attributes from Line if its Key is in the Special Key Map."""
+        key, internal_value = open_key_value_pair(line)
+        try:
+            special_name, factory = type(self).special_key_map[key]
+            setattr(self, special_name, factory(internal_value))
+        except KeyError:
+            pass
+
     def append(self, value, *, skip_special_key_search=False):
-        """Append to Config."""
-        if not skip_special_key_search and hasattr(type(self), "special_key_map"):
-            for key, internal_value in open_key_value_pairs(*value.strip().split("\n")):
-                try:
-                    special_name, factory = type(self).special_key_map[key]
-                    setattr(self, special_name, factory(internal_value))
-                except KeyError:
-                    pass
-        super().append(str(value))
+        """Append to Config, Splitting Multiline Values into Lines."""
+        search = not skip_special_key_search and hasattr(type(self), "special_key_map")
+        for line in str(value).split("\n"):
+            if search:
+                self._search_special_keys(line)
+            key = submit_line_key(line)
+            if key is not None and self._key_index is not None:
+                self._key_index[key].append(len(self.data))
+            self.data.append(line)
+            self._line_keys.append(key)
+        self._invalidate()
 
     def insert(self, index, value):
         """Insert Value at Index."""
-        return NotImplemented
+        for offset, line in enumerate(str(value).split("\n")):
+            position = index + offset if index >= 0 else index
+            self.data.insert(position, line)
+            self._line_keys.insert(position, submit_line_key(line))
+        self._invalidate(reindex=True)
+
+    def __getitem__(self, index):
+        """Get Line of Config, or Value of Submit Command for String Keys."""
+        if isinstance(index, str):
+            positions = self._positions(index)
+            if not positions:
+                raise KeyError(index)
+            return self.get(index)
+        return super().__getitem__(index)
+
+    def __setitem__(self, index, value):
+        """Set Line of Config, or Value of Submit Command for String Keys."""
+        if isinstance(index, str):
+            self.set(index, value)
+        elif isinstance(index, slice):
+            self.data[index] = map(str, value)
+            self.__dict__["_line_keys"] = list(map(submit_line_key, self.data))
+            self._invalidate(reindex=True)
+        else:
+            line = str(value)
+            position = range(len(self.data))[index]
+            old_key, new_key = self._line_keys[position], submit_line_key(line)
+            self.data[position] = line
+            self._line_keys[position] = new_key
+            self._invalidate(reindex=old_key != new_key)
+
+    def __delitem__(self, index):
+        """Delete Line of Config, or Every Setting of Submit Command for String Keys."""
+        if isinstance(index, str):
+            self.delete(index)
+        else:
+            del self.data[index]
+            del self._line_keys[index]
+            self._invalidate(reindex=True)
+
+    def __imul__(self, n):
+        """Repeat Config In Place."""
+        self.data *= n
+        self._line_keys *= n
+        self._invalidate(reindex=True)
+        return self
+
+    def pop(self, index=-1):
+        """Pop Line from Config."""
+        self._line_keys.pop(index)
+        self._invalidate(reindex=True)
+        return self.data.pop(index)
+
+    def remove(self, value):
+        """Remove Line from Config."""
+        del self[self.data.index(value)]
+
+    def clear(self):
+        """Clear Config."""
+        self.data.clear()
+        self._line_keys.clear()
+        self._invalidate(reindex=True)
+
+    def reverse(self):
+        """Reverse Config In Place."""
+        self.data.reverse()
+        self._line_keys.reverse()
+        self._invalidate(reindex=True)
+
+    def sort(self, *args, **kwargs):
+        """Sort Config In Place."""
+        self.data.sort(*args, **kwargs)
+        self.__dict__["_line_keys"] = list(map(submit_line_key, self.data))
+        self._invalidate(reindex=True)
 
     def append_key_value_pair(self, key, value, *args, **kwargs):
         """Append Key Value Pair to Config."""
@@ -724,6 +1252,130 @@ class JobConfig(UserList, WriteModeMixin, write_mode_keywords=CONDOR_SUBMIT_COMM
         """Add Queue to Config."""
         self.append(f'queue{(" " + condor_format_sequence(args)) if args else ""}')
 
+    def _queue_clause(self, n, clause):
+        """Add Queue Statement with Item Clause to Config."""
+        self.append(f'queue{"" if n == 1 else f" {n}"} {clause}')
+
+    def queue_in(self, variable, items, n=1):
+        """Add Queue Over Inline Items to Config."""
+        items = "\n".join(map(str, items))
+        self._queue_clause(n, f"{variable} in (\n{items}\n)")
+
+    def queue_matching(self, *patterns, variable=None, kind=None, n=1):
+        """Add Queue Over Files or Directories Matching Globs to Config."""
+        words = [w for w in (variable, "matching", kind) if w is not None]
+        self._queue_clause(n, condor_format_sequence(words + list(patterns)))
+
+    def queue_from(self, items, variables=None, n=1, *, path=None, directory=None):
+        """
+        Add Queue Over Itemdata from a File to Config and Return its Path.
+
+        Items may be the path of an existing itemdata file, or an iterable, NumPy
+        array or DataFrame which is streamed to a file without building it in
+        memory. Variables default to the column names of tabular items.
+
+        """
+        variables = value_or(variables, itemdata_columns(items))
+        if not variables:
+            raise TypeError("Variable names are required for untabulated itemdata.")
+        if not isinstance(variables, str):
+            variables = ", ".join(variables)
+        if isinstance(items, (str, Path)):
+            path = Path(items).abspath()
+        else:
+            path = write_itemdata(items, path, directory=directory)
+        self._queue_clause(n, f"{variables} from {path}")
+        return path
+
+
+def text_digest(text):
+    """Get SHA-256 Hex Digest of Text."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def config_digest(config):
+    """Get Content Hash of Config."""
+    try:
+        return config.content_hash
+    except AttributeError:
+        return text_digest(config.as_text)
+
+
+WRITTEN_CONFIG_CACHE_SIZE = 1024
+
+_WRITTEN_CONFIG_FILES = dict()
+
+
+def _file_stamp(path):
+    """Get Modification Stamp of File or None if it does not Exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _remember_written(path, digest):
+    """Record Digest and Stamp of Written File, Evicting the Oldest Entries."""
+    _WRITTEN_CONFIG_FILES.pop(path, None)
+    _WRITTEN_CONFIG_FILES[path] = digest, _file_stamp(path)
+    while len(_WRITTEN_CONFIG_FILES) > WRITTEN_CONFIG_CACHE_SIZE:
+        del _WRITTEN_CONFIG_FILES[next(iter(_WRITTEN_CONFIG_FILES))]
+
+
+def _is_written(path, digest):
+    """Check that Path still Holds the Content this Process Wrote there."""
+    written = _WRITTEN_CONFIG_FILES.get(path)
+    return written is not None and written == (digest, _file_stamp(path))
+
+
+def write_config_file(config, path, *, force=False):
+    """
+    Write Config to Path unless this Process already Wrote the Same Content there.
+
+    A write is only skipped while the file still has the size and modification
+    time it was written with, so deleted or edited files are written again.
+
+    """
+    path = Path(path).abspath()
+    digest = config_digest(config)
+    if force or not _is_written(path, digest):
+        path.parent.makedirs_p()
+        path.write_text(config.as_text)
+        _remember_written(path, digest)
+    return path
+
+
+def _write_missing_config_file(config, path):
+    """Write Config to Path only if No File Exists there and Return the Path."""
+    path = Path(path)
+    if not path.exists():
+        write_config_file(config, path)
+    return path
+
+
+def write_config_lines(lines, path, *, chunk_size=1 << 12):
+    """
+    Stream Config Lines to Path in a Single Pass and Return the Path.
+
+    The content hash is computed while writing, so a later write_config_file of
+    the same content to this path is skipped.
+
+    """
+    path = Path(path).abspath()
+    path.parent.makedirs_p()
+    lines = iter(lines)
+    digest = hashlib.sha256()
+    separator = ""
+    with open(path, "w") as file:
+        for chunk in iter(lambda: tuple(islice(lines, chunk_size)), ()):
+            text = separator + "\n".join(map(str, chunk))
+            file.write(text)
+            digest.update(text.encode())
+            separator = "\n"
+    _remember_written(path, digest.hexdigest())
+    return path
+
 
 def minimal_config(
     name,
@@ -755,24 +1407,280 @@ def minimal_config(
     return config
 
 
-def submit_config(config, path=None, logfile=None, *args, **kwargs):
-    """Submit Configuration File."""
-    # FIXME: (DRY) generalize path making
-    if path is None:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir) / "config.txt"
-            temp_path.touch()
-            temp_path.write_text(config.as_text)
-            submit_output = decoded(condor_submit(temp_path, *args, **kwargs))
-    else:
-        if not path.exists():
-            path.parent.makedirs_p()
-            path.touch()
-            path.write_text(config.as_text)
-        submit_output = decoded(condor_submit(path, *args, **kwargs))
+QUEUE_STATEMENT_PATTERN = re.compile(r"^queue(?:\s+(\d+))?$", re.IGNORECASE)
+
+
+def split_queue_statement(config):
+    """Split Config into Submit Description and Simple Queue Count."""
+    description, count = [], None
+    for line in map(str.strip, config):
+        if not line or line.startswith("#"):
+            continue
+        if line.lower().startswith("queue"):
+            match = QUEUE_STATEMENT_PATTERN.match(line)
+            if count is not None or match is None:
+                return None, None
+            count = int(value_or(match.group(1), 1))
+        elif count is not None:
+            return None, None
+        else:
+            description.append(line)
+    if count is None:
+        return None, None
+    return "\n".join(description), count
+
+
+QUANTITY_PATTERN = re.compile(r"^\s*(\d+(?:\.\d*)?)\s*([KMGT]?)B?\s*$", re.IGNORECASE)
+
+QUANTITY_UNITS = {"K": 1, "M": 1 << 10, "G": 1 << 20, "T": 1 << 30}
+
+
+def parse_quantity(value, default_unit="M", unit="M"):
+    """Parse Size with Optional K/M/G/T Suffix into the Given Unit or None."""
+    match = QUANTITY_PATTERN.match(str(value))
+    if match is None:
+        return None
+    number, suffix = float(match.group(1)), match.group(2).upper()
+    kilobytes = number * QUANTITY_UNITS[suffix or default_unit.upper()]
+    return int(-(-kilobytes // QUANTITY_UNITS[unit.upper()]))
+
+
+def job_requests(config):
+    """Get Requested Cpus, Memory (MB), Disk (KB) and GPUs of Config."""
+
+    def _request(name, default, **units):
+        value = config.get(f"request_{name}")
+        if value is None:
+            return default
+        if units:
+            return value_or(parse_quantity(value, **units), default)
+        try:
+            return int(value)
+        except ValueError:
+            return default
+
+    return dict(
+        cpus=_request("cpus", 1),
+        memory=_request("memory", 0, default_unit="M", unit="M"),
+        disk=_request("disk", 0, default_unit="K", unit="K"),
+        gpus=_request("gpus", 0),
+    )
+
+
+JOB_ATTRIBUTE_PATTERN = re.compile(r"\bMY\.|(?<![.\w])Request\w+", re.IGNORECASE)
+
+
+def machine_constraint(config):
+    """
+    Get Requirements of Config as a Machine Constraint for condor_status.
+
+    Requirements which refer to attributes of the job cannot be evaluated against
+    machine ClassAds alone, so they give no constraint.
+
+    """
+    requirements = config.get("requirements")
+    if not requirements or JOB_ATTRIBUTE_PATTERN.search(requirements):
+        return None
+    return re.sub(r"\bTARGET\.", "", requirements, flags=re.IGNORECASE)
+
+
+def sized_config(config, count):
+    """Copy Config with its Single Queue Statement Set to Count, or None if Unsized."""
+    positions = config.key_index.get(QUEUE_KEY, ())
+    if len(positions) != 1:
+        return None
+    if not QUEUE_STATEMENT_PATTERN.match(config[positions[0]].strip()):
+        return None
+    sized = JobConfig(list(config))
+    sized[positions[0]] = f"queue {count}"
+    return sized
+
+
+def pool_batch_size(config, *, limit=None, snapshot=None, max_age=None):
+    """Get Number of Jobs of Config the Pool can Start Now."""
+    if snapshot is None:
+        snapshot = pool_snapshot(machine_constraint(config), max_age=max_age)
+    count = snapshot.capacity(**job_requests(config))
+    return count if limit is None else min(count, limit)
+
+
+class SubmitBackend:
+    """
+    Job Submission Backend Base.
+
+    """
+
+    def submit(self, config, path=None, *args, **kwargs):
+        """Submit Configuration and Return (Cluster, First Process, Count) Triples."""
+        raise NotImplementedError
+
+    def submit_many(self, configs, *args, **kwargs):
+        """Submit Many Configurations and Return Job Id Triples for Each."""
+        return tuple(self.submit(config, None, *args, **kwargs) for config in configs)
+
+
+class SubprocessSubmitBackend(SubmitBackend):
+    """
+    Job Submission Backend using condor_submit.
+
+    """
+
+    def __init__(self, directory=None, *, max_files=256):
+        """Initialize Subprocess Backend with Directory for Anonymous Submit Files."""
+        self._directory = directory
+        self._temporary_directory = None
+        self._files = dict()
+        self.max_files = max_files
+
+    @property
+    def directory(self):
+        """Get Directory of Content-Addressed Submit Files."""
+        if self._directory is None:
+            self._temporary_directory = tempfile.TemporaryDirectory(
+                prefix="hexfarm-submit-"
+            )
+            self._directory = Path(self._temporary_directory.name)
+        return Path(self._directory)
+
+    def _prune(self):
+        """Delete the Least Recently Used Anonymous Submit Files over the Limit."""
+        while len(self._files) > self.max_files:
+            path = next(iter(self._files))
+            del self._files[path]
+            _WRITTEN_CONFIG_FILES.pop(path, None)
+            path.remove_p()
+
+    @contextmanager
+    def submit_file(self, config, path=None):
+        """
+        Yield Path of Submit File for Configuration.
+
+        An explicit path is only written if no file exists there yet. Without one
+        the file is named after the content hash of the configuration, so identical
+        configurations share one file. Such files are only rewritten when their
+        content changes, and only the most recently used ``max_files`` anonymous
+        files are kept.
+
+        """
+        if path is not None:
+            yield _write_missing_config_file(config, path)
+            return
+        path = write_config_file(
+            config, self.directory / f"{config_digest(config)}.sub"
+        )
+        self._files.pop(path, None)
+        self._files[path] = None
+        try:
+            yield path
+        finally:
+            self._prune()
+
+    def submit(self, config, path=None, *args, **kwargs):
+        """Submit Configuration and Return (Cluster, First Process, Count) Triples."""
+        with self.submit_file(config, path) as submit_path:
+            submit_output = decoded(condor_submit(submit_path, *args, **kwargs))
+        return tuple(extract_job_ranges(submit_output))
+
+
+class ScheddSubmitBackend(SubmitBackend):
+    """
+    Job Submission Backend using a Schedd Transaction from the HTCondor Bindings.
+
+    Configurations with more than a single trailing ``queue [N]`` statement or with
+    extra ``condor_submit`` arguments are passed to the fallback backend. Given a
+    path without a file, the configuration is also written there, as for
+    ``condor_submit``.
+
+    """
+
+    def __init__(self, schedd=None, *, module=None, fallback=None):
+        """Initialize Schedd Backend."""
+        self.module = value_or(module, htcondor)
+        if self.module is None:
+            raise ImportError("HTCondor Python bindings are not installed.")
+        self._schedd = schedd
+        self.fallback = value_or(fallback, SubprocessSubmitBackend())
+
+    @property
+    def schedd(self):
+        """Get Schedd, Locating it on First Use."""
+        if self._schedd is None:
+            self._schedd = self.module.Schedd()
+        return self._schedd
+
+    def submit(self, config, path=None, *args, **kwargs):
+        """Submit Configuration and Return (Cluster, First Process, Count) Triples."""
+        if args or kwargs or split_queue_statement(config)[0] is None:
+            return self.fallback.submit(config, path, *args, **kwargs)
+        if path is not None:
+            _write_missing_config_file(config, path)
+        return self.submit_many((config,))[0]
+
+    def submit_many(self, configs, *args, **kwargs):
+        """Submit Many Configurations in a Single Transaction."""
+        configs = tuple(configs)
+        if args or kwargs:
+            return self.fallback.submit_many(configs, *args, **kwargs)
+        results = [None] * len(configs)
+        queued = []
+        for index, config in enumerate(configs):
+            description, count = split_queue_statement(config)
+            if description is None:
+                results[index] = self.fallback.submit(config)
+            else:
+                queued.append((index, self.module.Submit(description), count))
+        if queued:
+            with self.schedd.transaction() as transaction:
+                for index, submit, count in queued:
+                    cluster = submit.queue(transaction, count)
+                    results[index] = ((cluster, 0, count),)
+        return tuple(results)
+
+
+def default_submit_backend():
+    """Get Default Submission Backend."""
+    global _DEFAULT_SUBMIT_BACKEND
+    if _DEFAULT_SUBMIT_BACKEND is None:
+        if HTCONDOR_SUPPORT:
+            _DEFAULT_SUBMIT_BACKEND = ScheddSubmitBackend()
+        else:
+            _DEFAULT_SUBMIT_BACKEND = SubprocessSubmitBackend()
+    return _DEFAULT_SUBMIT_BACKEND
+
+
+_DEFAULT_SUBMIT_BACKEND = None
+
+
+def submit_config(config, path=None, logfile=None, *args, backend=None, **kwargs):
+    """
+    Submit Configuration File.
+
+    Returns one ClusterJobRange per submitted cluster instead of one Job per
+    process. Ranges iterate and index as Job views, so a flat tuple of Job objects
+    is ``tuple(chain.from_iterable(submit_config(...)))``.
+
+    """
+    backend = value_or(backend, default_submit_backend())
+    job_ranges = backend.submit(config, path, *args, **kwargs)
+    QUEUE_CACHE.invalidate()
+    return tuple(
+        ClusterJobRange(cluster, count, first, config=config, logfile=logfile)
+        for cluster, first, count in job_ranges
+    )
+
+
+def submit_configs(configs, *args, logfile=None, backend=None, **kwargs):
+    """Submit Configuration Files Together and Return their Cluster Job Ranges."""
+    configs = tuple(configs)
+    backend = value_or(backend, default_submit_backend())
+    results = backend.submit_many(configs, *args, **kwargs)
+    QUEUE_CACHE.invalidate()
     return tuple(
-        Job(config, job_id, logfile=logfile)
-        for job_id in extract_job_ids(submit_output)
+        tuple(
+            ClusterJobRange(cluster, count, first, config=config, logfile=logfile)
+            for cluster, first, count in job_ranges
+        )
+        for config, job_ranges in zip(configs, results)
     )
 
 
@@ -782,11 +1690,13 @@ class Job:
 
     """
 
-    def __init__(self, config, job_id, submitter=me(), logfile=None):
+    __slots__ = ("_config", "_job_id", "_submitter", "_logfile")
+
+    def __init__(self, config, job_id, submitter=None, logfile=None):
         """Initialize Job Object."""
         self._config = config
         self._job_id = job_id
-        self._submitter = submitter
+        self._submitter = value_or(submitter, ME)
         self._logfile = logfile
         if logfile is None:
             try:
@@ -852,6 +1762,10 @@ class Job:
             return f(self, *args, **kwargs)
         return False
 
+    def when_complete(self, f, *args, watcher, **kwargs):
+        """Run On Completion of Job from a Completion Watcher, without Blocking."""
+        return watcher.register(self, f, *args, **kwargs)
+
     def __repr__(self):
         """Representation of Job."""
         return str(self)
@@ -861,6 +1775,132 @@ class Job:
         return f"Job({self.job_id})"
 
 
+class ClusterJobRange:
+    """
+    Lazy Collection of the Jobs of a Cluster.
+
+    Jobs are stored as an integer process range and only built as Job views on
+    demand. Completed and removed processes are tracked as sets of process ids.
+
+    """
+
+    __slots__ = (
+        "cluster",
+        "first_process",
+        "count",
+        "config",
+        "logfile",
+        "submitter",
+        "completed",
+        "removed",
+    )
+
+    def __init__(
+        self,
+        cluster,
+        count,
+        first_process=0,
+        *,
+        config=None,
+        logfile=None,
+        submitter=None,
+    ):
+        """Initialize Cluster Job Range."""
+        self.cluster = int(cluster)
+        self.count = int(count)
+        self.first_process = int(first_process)
+        self.config = config
+        self.logfile = logfile
+        self.submitter = value_or(submitter, ME)
+        self.completed = set()
+        self.removed = set()
+
+    @property
+    def processes(self):
+        """Get Range of Process Ids."""
+        return range(self.first_process, self.first_process + self.count)
+
+    def job_id(self, process):
+        """Get JobID of Process."""
+        return f"{self.cluster}.{process}"
+
+    def job_ids(self):
+        """Iterate over JobIDs of All Processes."""
+        return map(self.job_id, self.processes)
+
+    def job(self, process):
+        """Build Job View of Process."""
+        return Job(
+            self.config,
+            self.job_id(process),
+            submitter=self.submitter,
+            logfile=self.logfile,
+        )
+
+    def __len__(self):
+        """Number of Jobs in the Cluster."""
+        return self.count
+
+    def __getitem__(self, index):
+        """Get Job View at Index."""
+        if isinstance(index, slice):
+            return tuple(map(self.job, self.processes[index]))
+        return self.job(self.processes[index])
+
+    def __iter__(self):
+        """Iterate over Job Views."""
+        return map(self.job, self.processes)
+
+    def __contains__(self, job):
+        """Check if Job or JobID Belongs to the Cluster."""
+        try:
+            cluster, process = split_job_id(getattr(job, "job_id", job))
+        except ValueError:
+            return False
+        return cluster == self.cluster and process in self.processes
+
+    def members(self):
+        """Iterate over Processes which have not been Removed."""
+        return (p for p in self.processes if p not in self.removed)
+
+    def active(self):
+        """Iterate over Processes which have neither Completed nor been Removed."""
+        return (
+            p
+            for p in self.processes
+            if p not in self.completed and p not in self.removed
+        )
+
+    @property
+    def member_count(self):
+        """Number of Processes which have not been Removed."""
+        return self.count - len(self.removed)
+
+    @property
+    def active_count(self):
+        """Number of Processes which have neither Completed nor been Removed."""
+        return self.member_count - len(self.completed)
+
+    def mark_completed(self, *processes):
+        """Mark Processes as Completed and Return the Newly Completed Ones."""
+        new = {p for p in processes if p in self.processes}
+        new -= self.completed
+        new -= self.removed
+        self.completed |= new
+        return new
+
+    def mark_removed(self, *processes):
+        """Mark Processes as Removed."""
+        removed = {p for p in processes if p in self.processes}
+        self.removed |= removed
+        self.completed -= removed
+
+    def __repr__(self):
+        """Representation of Cluster Job Range."""
+        last = self.first_process + self.count - 1
+        return f"{type(self).__name__}({self.cluster}.{self.first_process}-{last})"
+
+
 def job_dict(*jobs):
     """Make Job Dictionary."""
     return {job.job_id: job for job in jobs}
@@ -886,11 +1926,25 @@ class JobMap(Mapping):
 
     """
 
-    def __init__(self, *jobs, remove_completed_jobs=False, remove_when_clearing=True):
+    def __init__(
+        self,
+        *jobs,
+        remove_completed_jobs=False,
+        remove_when_clearing=True,
+        tracker=None,
+        journal=None,
+    ):
         """Initialize Job Mapping."""
-        self._jobs = job_dict(*jobs)
+        self._jobs = dict()
+        self._ranges = dict()
+        self._completed = set()
+        self._untracked = set()
+        self._active = 0
+        self.tracker = value_or(tracker, UserLogTracker())
         self.remove_completed_jobs = remove_completed_jobs
         self.remove_when_clearing = remove_when_clearing
+        self.journal = journal
+        self.append(*jobs)
 
     @property
     def job_ids(self):
@@ -902,50 +1956,289 @@ class JobMap(Mapping):
         """Return Jobs."""
         return self.values()
 
+    @property
+    def ranges(self):
+        """Return Cluster Job Ranges."""
+        return self._ranges.values()
+
+    def _track(self, jobs):
+        """Track Jobs through their Log Files."""
+        for job in jobs:
+            if job.logfile:
+                self.tracker.track(job.job_id, job.logfile)
+                if self.tracker.is_finished(job.job_id):
+                    self._completed.add(job.job_id)
+            else:
+                self._untracked.add(job.job_id)
+
+    def _count_active(self, job_ids):
+        """Count Single Jobs of the Map which have not Completed."""
+        return sum(
+            1
+            for job_id in job_ids
+            if job_id in self._jobs and job_id not in self._completed
+        )
+
+    def _find_range(self, job_id):
+        """Find Range and Process of a Member Job Id."""
+        try:
+            cluster, process = split_job_id(job_id)
+        except ValueError:
+            return None, None
+        job_range = self._ranges.get(cluster)
+        if job_range is None or process not in job_range.processes:
+            return None, None
+        if process in job_range.removed:
+            return None, None
+        return job_range, process
+
+    def _contains(self, job_id):
+        """Check Membership without Polling."""
+        return job_id in self._jobs or self._find_range(job_id)[0] is not None
+
+    def _get(self, job_id):
+        """Get Job without Polling."""
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            job_range, process = self._find_range(job_id)
+            if job_range is None:
+                raise
+            return job_range.job(process)
+
+    def _is_completed(self, job_id):
+        """Check if Member Job has Completed."""
+        if job_id in self._jobs:
+            return job_id in self._completed
+        job_range, process = self._find_range(job_id)
+        return job_range is not None and process in job_range.completed
+
+    def _member_ids(self):
+        """Iterate over Member Job Ids without Polling."""
+        yield from self._jobs
+        for job_range in tuple(self._ranges.values()):
+            yield from map(job_range.job_id, job_range.members())
+
+    def _discard(self, job_id):
+        """Discard Job from Internal Structures."""
+        if job_id in self._jobs:
+            self._active -= self._count_active((job_id,))
+            del self._jobs[job_id]
+            self._completed.discard(job_id)
+            self._untracked.discard(job_id)
+        else:
+            job_range, process = self._find_range(job_id)
+            if job_range is None:
+                raise KeyError(job_id)
+            if process not in job_range.completed:
+                self._active -= 1
+            job_range.mark_removed(process)
+            if not job_range.member_count:
+                del self._ranges[job_range.cluster]
+                if self.journal is not None:
+                    self.journal.drop_range(job_range.cluster)
+        self.tracker.forget(job_id)
+        if self.journal is not None:
+            self.journal.discard(job_id)
+
+    def add_range(self, job_range):
+        """Add Cluster Job Range to JobMap."""
+        replaced = self._ranges.get(job_range.cluster)
+        if replaced is not None:
+            self._active -= replaced.active_count
+        self._ranges[job_range.cluster] = job_range
+        if self.journal is not None:
+            self.journal.add_range(job_range)
+        if job_range.logfile:
+            self.tracker.track_cluster(job_range.cluster, job_range.logfile)
+            if len(self.tracker):
+                job_range.mark_completed(
+                    *(
+                        p
+                        for p in job_range.processes
+                        if self.tracker.is_finished(job_range.job_id(p))
+                    )
+                )
+        self._active += job_range.active_count
+
+    def poll(self):
+        """Update Job States and Return Newly Completed Job Ids."""
+        completed = set()
+        for job_id in self.tracker.poll():
+            if job_id in self._jobs:
+                completed.add(job_id)
+                continue
+            job_range, process = self._find_range(job_id)
+            if job_range is not None and job_range.mark_completed(process):
+                completed.add(job_id)
+        for job_id in tuple(self._untracked):
+            if self._jobs[job_id].has_completed:
+                self._untracked.discard(job_id)
+                completed.add(job_id)
+        for job_range in self._ranges.values():
+            if not job_range.logfile and job_range.active_count:
+                queued = user_jobs(job_range.submitter)
+                processes = job_range.mark_completed(
+                    *(
+                        p
+                        for p in job_range.active()
+                        if job_range.job_id(p) not in queued
+                    )
+                )
+                completed.update(map(job_range.job_id, processes))
+        completed -= self._completed
+        self._completed.update(job_id for job_id in completed if job_id in self._jobs)
+        self._active -= len(completed)
+        if self.journal is not None:
+            self.journal.mark_completed(*completed)
+            self.journal.save_offsets(self.tracker.offsets())
+        return completed
+
+    def when_complete(self, f, *args, watcher, **kwargs):
+        """
+        Run On Completion of each Job from a Completion Watcher, without Blocking.
+
+        Returns one future per Cluster Job Range and per single Job of the map.
+
+        """
+        return tuple(
+            watcher.register(job, f, *args, **kwargs)
+            for job in (*self._ranges.values(), *self._jobs.values())
+        )
+
+    def has_completed(self, job_id):
+        """Check if Job has Completed or is no Longer in the Map."""
+        return self._is_completed(job_id) or not self._contains(job_id)
+
+    def discard(self, *job_ids):
+        """Forget Jobs without Removing them from the Queue."""
+        for job_id in job_ids:
+            if self._contains(job_id):
+                self._discard(job_id)
+
+    def status(self, job_id):
+        """Get Last Known Status of Job."""
+        status = self.tracker.status(job_id)
+        if self._is_completed(job_id) and not status.is_finished:
+            return JobStatus.Completed
+        return status
+
+    def status_counts(self):
+        """Count Last Known Statuses of the Jobs of the Map which have not Completed."""
+        status = self.tracker.status
+        counts = Counter(
+            status(job_id) for job_id in self._jobs if job_id not in self._completed
+        )
+        for job_range in self._ranges.values():
+            counts.update(status(job_range.job_id(p)) for p in job_range.active())
+        return counts
+
+    @property
+    def active_job_count(self):
+        """Get Number of Jobs which had not Completed at the Last Poll."""
+        return self._active
+
     def __getitem__(self, key):
         """Get the Job at given Id."""
-        job = self._jobs[key]
-        if self.remove_completed_jobs and job.has_completed:
-            del self._jobs[key]
-            raise JobCompletedException(job)
+        job = self._get(key)
+        if self.remove_completed_jobs:
+            self.poll()
+            if self._is_completed(key):
+                self._discard(key)
+                raise JobCompletedException(job)
         return job
 
     def pop_completed(self):
         """Pop off Jobs that have Completed."""
-        out = []
-        for job_id, job in tuple(self._jobs.items()):
-            if job.has_completed:
-                out.append(job)
-                del self._jobs[job_id]
+        self.poll()
+        out = [self._jobs[job_id] for job_id in self._completed]
+        for job in out:
+            self._discard(job.job_id)
+        for job_range in tuple(self._ranges.values()):
+            processes = sorted(job_range.completed)
+            out.extend(map(job_range.job, processes))
+            job_range.mark_removed(*processes)
+            self.tracker.forget(*map(job_range.job_id, processes))
+            if self.journal is not None:
+                self.journal.discard(*map(job_range.job_id, processes))
+            if not job_range.member_count:
+                del self._ranges[job_range.cluster]
+                if self.journal is not None:
+                    self.journal.drop_range(job_range.cluster)
         return tuple(out)
 
     def __iter__(self):
         """Return Iterator over Jobs."""
         if self.remove_completed_jobs:
             self.pop_completed()
-        return iter(self._jobs)
+        return self._member_ids()
 
     def __len__(self):
         """Return Length of Job List."""
         if self.remove_completed_jobs:
             self.pop_completed()
-        return len(self._jobs)
+        return len(self._jobs) + sum(r.member_count for r in self._ranges.values())
+
+    def __contains__(self, job_id):
+        """Check if Job is in the Map."""
+        if self.remove_completed_jobs:
+            self.poll()
+            return self._contains(job_id) and not self._is_completed(job_id)
+        return self._contains(job_id)
 
     def clear(self):
         """Clear All Jobs."""
         if self.remove_when_clearing:
-            for job_id in self:
-                self.remove_job(job_id)
+            self.remove_jobs()
         else:
+            self.tracker.forget(*self._member_ids())
             self._jobs.clear()
+            self._ranges.clear()
+            self._completed.clear()
+            self._untracked.clear()
+            self._active = 0
+            if self.journal is not None:
+                self.journal.clear()
 
     def update(self, other):
         """Extend Job Map."""
+        self._active -= self._count_active(other)
         self._jobs.update(other)
+        self._track(other.values())
+        self._active += self._count_active(other)
+        if self.journal is not None and other:
+            self.journal.add_jobs(*other.values())
+
+    def restore(self, journal, config=None):
+        """
+        Restore Jobs, Completions and Log Offsets Recorded in a Journal.
+
+        Logs are read again from the recorded offsets, so only events written
+        after the last journaled poll are replayed. Later changes are recorded
+        in the same journal.
+
+        """
+        self.journal = None
+        try:
+            for logfile, offset in journal.offsets().items():
+                self.tracker.add_logfile(logfile, offset)
+            for job_range in journal.ranges(config):
+                self.add_range(job_range)
+            for job, completed in journal.jobs(config):
+                self.update({job.job_id: job})
+                if completed:
+                    self._active -= self._count_active((job.job_id,))
+                    self._completed.add(job.job_id)
+        finally:
+            self.journal = journal
+        return self
 
     def append(self, *jobs):
-        """Append Jobs to JobMap."""
-        self.update(job_dict(*jobs))
+        """Append Jobs or Cluster Job Ranges to JobMap."""
+        for job_range in jobs:
+            if isinstance(job_range, ClusterJobRange):
+                self.add_range(job_range)
+        self.update(job_dict(*(j for j in jobs if not isinstance(j, ClusterJobRange))))
 
     def pop(self, key, *default):
         """Pop Job Out of Map."""
@@ -955,17 +2248,19 @@ class JobMap(Mapping):
             if self.remove_when_clearing:
                 return self.remove_job(key)[0]
             else:
-                return self._jobs.pop(key)
+                job = self._get(key)
+                self._discard(key)
+                return job
         except KeyError:
             if len(default) == 1:
-                return default
+                return default[0]
             raise KeyError("Job Not Found.")
 
     def remove_job(self, job_id, *args, **kwargs):
         """Remove Job."""
         job = self[job_id]
         result = job.remove(*args, **kwargs)
-        del self._jobs[job_id]
+        self._discard(job_id)
         return job, result
 
     def hold_job(self, job_id, *args, **kwargs):
@@ -976,13 +2271,64 @@ class JobMap(Mapping):
         """Release Job."""
         return self[job_id].release(*args, **kwargs)
 
+    def remove_jobs(self, *job_ids, use_constraint=True, **kwargs):
+        """Remove Jobs (Default All) with One Command per Argument Chunk."""
+        job_ids = tuple(filter(self._contains, job_ids or self._member_ids()))
+        if not job_ids:
+            return (), ()
+        jobs = tuple(map(self._get, job_ids))
+        result = bulk_job_command(
+            condor_rm, job_ids, use_constraint=use_constraint, **kwargs
+        )
+        self.discard(*job_ids)
+        QUEUE_CACHE.invalidate()
+        return jobs, result
+
+    def hold_jobs(self, *job_ids, use_constraint=True, **kwargs):
+        """Hold Jobs (Default All) with One Command per Argument Chunk."""
+        return bulk_job_command(
+            condor_hold,
+            job_ids or tuple(self._member_ids()),
+            use_constraint=use_constraint,
+            **kwargs,
+        )
+
+    def release_jobs(self, *job_ids, use_constraint=True, **kwargs):
+        """Release Jobs (Default All) with One Command per Argument Chunk."""
+        return bulk_job_command(
+            condor_release,
+            job_ids or tuple(self._member_ids()),
+            use_constraint=use_constraint,
+            **kwargs,
+        )
+
     def __repr__(self):
         """Representation of JobMap."""
-        return repr(self._jobs)
+        return f"{type(self).__name__}({self._jobs}, ranges={list(self.ranges)})"
 
     def __str__(self):
         """String Conversion of JobMap."""
-        return str(self._jobs)
+        return repr(self)
+
+
+def join_configs(prefix_config, configs):
+    """
+    Join Prefix and Unit Configurations into One Configuration.
+
+    Lines and line keys of JobConfig parts are concatenated without parsing them
+    again, so joining is linear in the total number of lines.
+
+    """
+    total = JobConfig(list(map(str, prefix_config)))
+    data, line_keys = total.data, total._line_keys
+    for config in configs:
+        if isinstance(config, JobConfig):
+            data.extend(config.data)
+            line_keys.extend(config._line_keys)
+        else:
+            total.extend(config)
+    total._invalidate(reindex=True)
+    return total
 
 
 class ConfigUnitBase(WriteModeMixin, write_mode_keywords=set()):
@@ -1014,16 +2360,21 @@ class ConfigUnitBase(WriteModeMixin, write_mode_keywords=set()):
             )
             setattr(cls, f"{underscore(name)}_kv_str", property(fget))
         if make_prefix_config:
+            kv_names = tuple(f"{underscore(name)}_kv_str" for name in fixed_keys)
 
-            def _prefix_config(s):
-                return JobConfig(
-                    getattr(s, f"{underscore(name)}_kv_str") for name in fixed_keys
-                )
+            def _prefix_lines(s):
+                return (getattr(s, kv_name) for kv_name in kv_names)
 
-            setattr(cls, "prefix_config", property(_prefix_config))
+            setattr(cls, "prefix_lines", _prefix_lines)
+            setattr(
+                cls,
+                "prefix_config",
+                property(lambda s: JobConfig(list(s.prefix_lines()))),
+            )
 
     def __init__(self, *args, config_path=None, **kwargs):
         """Initialize Configuration Unit."""
+        self.__dict__["_write_mode"] = False
         super().__init__(*args, **kwargs)
         self.path = config_path
 
@@ -1065,26 +2416,33 @@ class ProcessUnit(
         if name == "log":
             raise TypeError("Cannot modify log in ProcessUnit Context.")
 
+    def iter_lines(self):
+        """Iterate over Lines of the Full Configuration."""
+        yield from self.prefix_lines()
+        yield from self._config
+
     @property
     def config(self):
         """Full Configuration."""
-        return self.prefix_config + self._config
+        return join_configs(self.prefix_lines(), (self._config,))
 
-    def queue(self, n=1, *args, **kwargs):
+    def queue(self, n=1, *args):
         """Add Queue Command."""
-        self._config.queue(n=n, *args, **kwargs)
+        self._config.queue(n, *args)
 
-    def queue_in(self, n=1, *args, **kwargs):
-        """"""
-        return NotImplemented
+    def queue_in(self, variable, items, n=1):
+        """Add Queue Command Over Inline Items."""
+        self._config.queue_in(variable, items, n)
 
-    def queue_matching(self, n=1, *args, **kwargs):
-        """"""
-        return NotImplemented
+    def queue_matching(self, *patterns, variable=None, kind=None, n=1):
+        """Add Queue Command Over Files or Directories Matching Globs."""
+        self._config.queue_matching(*patterns, variable=variable, kind=kind, n=n)
 
-    def queue_from(self, n=1, *args, **kwargs):
-        """"""
-        return NotImplemented
+    def queue_from(self, items, variables=None, n=1, *, path=None, directory=None):
+        """Add Queue Command Over Streamed Itemdata and Return its Path."""
+        return self._config.queue_from(
+            items, variables, n, path=path, directory=directory
+        )
 
 
 class ClusterUnit(
@@ -1104,7 +2462,7 @@ class ClusterUnit(
         super().__init__(**kwargs)
         self.executable = executable
         self.log = map_value_or(Path, log, None)
-        self.process_units = process_units
+        self.process_units = list(process_units)
 
     def append_process(self, process_unit):
         """Append Process to Cluster Unit."""
@@ -1114,23 +2472,35 @@ class ClusterUnit(
         """Extend Process Units."""
         self.process_units.extend(process_units)
 
+    def iter_lines(self):
+        """Iterate over Lines of the Full Configuration."""
+        yield from self.prefix_lines()
+        for process in self.process_units:
+            yield from process.iter_lines()
+
     @property
     def config(self):
         """Full Configuration."""
-        return sum(self.process_units, self.prefix_config)
+        return join_configs(
+            self.prefix_lines(),
+            chain.from_iterable(
+                (process.prefix_lines(), process._config)
+                for process in self.process_units
+            ),
+        )
 
     def save(self, path=None):
-        """Save Config To Path."""
+        """Stream Config To Path without Assembling it in Memory."""
         path = value_or(path, self.path)
         if not path:
             raise TypeError(
                 "Path argument must be a valid file path if "
                 "stored config has no associated path."
             )
-        Path(path).write_text(self.config.as_text)
+        write_config_lines(self.iter_lines(), path)
 
     def submit(self, *args, use_temporary_file=False, **kwargs):
-        """Submit Config As a Condor Job."""
+        """Submit Config As a Condor Job and Return its Cluster Job Ranges."""
         path = None if use_temporary_file else Path(self.path)
         if path and not path.exists():
             raise FileNotFoundError(f"Path {path} cannot be found.")
@@ -1146,7 +2516,7 @@ class MultiClusterUnit:
     def __init__(self, prefix_config, *cluster_units):
         """Initialize Multi-Cluster Unit."""
         self.prefix_config = prefix_config
-        self.cluster_units = cluster_units
+        self.cluster_units = list(cluster_units)
 
     def append_cluster(self, cluster_unit):
         """Append Cluster to Units."""
@@ -1156,21 +2526,77 @@ class MultiClusterUnit:
         """Extend Cluster Units."""
         self.cluster_units.extend(cluster_units)
 
+    def iter_lines(self):
+        """Iterate over Lines of the Total Configuration."""
+        yield from map(str, self.prefix_config)
+        for cluster in self.cluster_units:
+            yield from cluster.iter_lines()
+
     @property
     def total_config(self):
         """Total Configuration."""
-        return sum(self.cluster_units, self.prefix_config)
+        return join_configs(
+            self.prefix_config, (cluster.config for cluster in self.cluster_units)
+        )
 
-    def submit(self, *args, use_temporary_file=False, **kwargs):
-        """Submit Config As a Condor Job."""
-        # FIXME: figure out how to parse a multicluster unit condor_submit output so this can be
-        #       joined into one file
+    def save(self, path):
+        """Stream Total Config To Path without Assembling it in Memory."""
+        return write_config_lines(self.iter_lines(), path)
+
+    @property
+    def path(self):
+        """Get Default Submit Path Derived from the Prefix or First Unit Path."""
+        paths = (getattr(self.prefix_config, "path", None),) + tuple(
+            cluster.path for cluster in self.cluster_units
+        )
+        path = next(filter(None, paths), None)
+        return map_value_or(lambda p: Path(p).stripext() + ".multi.sub", path, None)
+
+    def submit(
+        self, *args, path=None, use_temporary_file=False, backend=None, **kwargs
+    ):
+        """
+        Submit All Clusters in a Single Submission.
+
+        Every cluster configuration restates its executable, which starts a new
+        cluster after the previous queue statement, so the submit output lists the
+        clusters of each unit in order. Returns a tuple of job ranges for each
+        cluster unit, which is empty for units without a queue statement.
+
+        The total configuration is written to the path, which defaults to one
+        derived from the prefix or first unit path, and submitted from there, or
+        from an anonymous temporary file if ``use_temporary_file`` is set.
+
+        """
+        configs = [cluster.config for cluster in self.cluster_units]
+        total_config = join_configs(self.prefix_config, configs)
+        if use_temporary_file:
+            path = None
+        else:
+            path = value_or(path, self.path)
+            if not path:
+                raise TypeError(
+                    "Path argument must be a valid file path unless a temporary "
+                    "file is used or a unit has an associated path."
+                )
+            path = write_config_file(total_config, path)
+        backend = value_or(backend, default_submit_backend())
+        job_ranges = iter(backend.submit(total_config, path, *args, **kwargs))
+        QUEUE_CACHE.invalidate()
         return tuple(
-            cluster.submit(use_temporary_file=use_temporary_file, *args, **kwargs)
-            for cluster in self.cluster_units
+            tuple(
+                ClusterJobRange(cluster, count, first, config=config, logfile=unit.log)
+                for cluster, first, count in islice(
+                    job_ranges, config.description.cluster_count
+                )
+            )
+            for unit, config in zip(self.cluster_units, configs)
         )
 
 
+SUBMIT_WHILE_INTERVAL = 1
+
+
 @dataclass
 class ConfigRunner:
     """
@@ -1182,11 +2608,17 @@ class ConfigRunner:
     path: InitVar[Path]
     logfile: Path
     jobmap: JobMap
+    history: object = None
+    backend: object = None
+    outputs: object = None
 
     def __post_init__(self, path):
         """Post-Initialize Config Runner."""
-        if Path(path).abspath() != Path(self.config.path).abspath():
-            self.config.save_as(path)
+        if self.history is not None:
+            self.history.follow(self.jobmap.tracker)
+        if path is not None:
+            self.config.path = path
+            write_config_file(self.config, path)
 
     @property
     def config_path(self):
@@ -1195,23 +2627,56 @@ class ConfigRunner:
 
     @property
     def running_job_count(self):
-        """Get Current Running Job Count."""
-        return len(self.jobmap)
+        """Get Running Job Count as of the Last Poll of the Job Map."""
+        return self.jobmap.active_job_count
+
+    def record(self, *jobs):
+        """Add Submitted Jobs to the Job Map, History and Outputs and Return them."""
+        self.jobmap.append(*jobs)
+        if self.history is not None:
+            self.history.add(*jobs)
+        if self.outputs is not None:
+            self.outputs.add(*jobs)
+        return jobs
 
     def submit(self, *args, **kwargs):
-        """Submit Jobs."""
+        """Submit Jobs and Return their Cluster Job Ranges."""
         jobs = submit_config(
-            self.config, path=self.config_path, logfile=self.logfile, *args, **kwargs
+            self.config,
+            self.config_path,
+            self.logfile,
+            *args,
+            backend=self.backend,
+            **kwargs,
         )
-        self.jobmap.append(*jobs)
-        return jobs
+        return self.record(*jobs)
+
+    def submit_fitting(self, *args, limit=None, snapshot=None, **kwargs):
+        """
+        Submit as many Jobs as the Pool can Start Now.
+
+        The queue count of the config is replaced by the free capacity of the pool
+        for the resources it requests, capped at the limit. Configs with itemdata
+        or several queue statements are submitted unchanged.
+
+        """
+        count = pool_batch_size(self.config, limit=limit, snapshot=snapshot)
+        if not count:
+            return ()
+        config = sized_config(self.config, count)
+        if config is None:
+            return self.submit(*args, **kwargs)
+        jobs = submit_config(
+            config, None, self.logfile, *args, backend=self.backend, **kwargs
+        )
+        return self.record(*jobs)
 
-    def submit_while(self, predicate, *args, wait=None, **kwargs):
-        """Submit Jobs while predicate holds."""
+    def submit_while(self, predicate, *args, wait=SUBMIT_WHILE_INTERVAL, **kwargs):
+        """Submit Jobs while predicate holds, Waiting between Submissions."""
         while predicate(self):
             self.submit(*args, **kwargs)
             if wait:
-                time.sleep(wait)
+                sleep(wait)
 
 
 class JobManager:
@@ -1220,21 +2685,52 @@ class JobManager:
 
     """
 
-    def __init__(self):
+    def __init__(self, history=None, backend=None, journal=None):
         """Initialize Job Manager."""
         self._queue = deque()
         self._config_map = dict()
+        self.history = history
+        self.backend = backend
+        self.journal = journal
+
+    @classmethod
+    def restore(cls, journal, history=None, backend=None, **job_map_options):
+        """Rebuild Job Manager with the Runners and Jobs Recorded in a Journal."""
+        manager = cls(history, backend, journal)
+        for name, config, path, logfile in journal.runners():
+            jobmap = JobMap(**job_map_options).restore(journal.bind(name), config)
+            manager[name] = ConfigRunner(
+                config, path, logfile, jobmap, history, backend
+            )
+        return manager
 
     def add_config(
-        self, name, config, path=None, logfile=None, jobmap=None, **job_map_options
+        self,
+        name,
+        config,
+        path=None,
+        logfile=None,
+        jobmap=None,
+        *,
+        outputs=None,
+        **job_map_options,
     ):
         """Add Configuration to JobManager."""
         if path is None:
             path = getattr(config, "path", None)
         if logfile is None:
             logfile = getattr(config, "log", None)
+        if self.journal is not None:
+            self.journal.add_runner(name, config, path, logfile)
+            job_map_options.setdefault("journal", self.journal.bind(name))
         self[name] = ConfigRunner(
-            config, path, logfile, value_or(jobmap, JobMap(**job_map_options))
+            config,
+            path,
+            logfile,
+            value_or(jobmap, JobMap(**job_map_options)),
+            self.history,
+            self.backend,
+            outputs,
         )
         return self[name]
 
@@ -1245,3 +2741,63 @@ class JobManager:
     def __setitem__(self, name, value):
         """Set Configuration Runner."""
         self._config_map[name] = value
+
+    @property
+    def runners(self):
+        """Get Configuration Runners."""
+        return self._config_map.values()
+
+    def submit_fitting(self, *names, limit=None, max_age=None):
+        """
+        Submit Runners Sized to Share the Free Capacity of the Pool.
+
+        Runners are filled in order. Each one reserves the resources of its jobs
+        in the pool snapshot, so later runners only see what is left.
+
+        """
+        snapshots = dict()
+        jobs = dict()
+        for name in names or tuple(self._config_map):
+            runner = self[name]
+            constraint = machine_constraint(runner.config)
+            if constraint not in snapshots:
+                snapshots[constraint] = pool_snapshot(constraint, max_age=max_age)
+            snapshot = snapshots[constraint]
+            jobs[name] = runner.submit_fitting(limit=limit, snapshot=snapshot)
+            count = sum(len(job_range) for job_range in jobs[name])
+            snapshots[constraint] = snapshot.reserve(
+                count, **job_requests(runner.config)
+            )
+        return jobs
+
+    def _all_job_ids(self):
+        """Get Job Ids of All Runners."""
+        return tuple(job_id for r in self.runners for job_id in r.jobmap.job_ids)
+
+    def remove_all(self, *, use_constraint=True, **kwargs):
+        """Remove the Jobs of All Runners Together."""
+        job_ids = self._all_job_ids()
+        if not job_ids:
+            return ()
+        result = bulk_job_command(
+            condor_rm, job_ids, use_constraint=use_constraint, **kwargs
+        )
+        for runner in self.runners:
+            runner.jobmap.discard(*job_ids)
+        QUEUE_CACHE.invalidate()
+        return result
+
+    def hold_all(self, *, use_constraint=True, **kwargs):
+        """Hold the Jobs of All Runners Together."""
+        return bulk_job_command(
+            condor_hold, self._all_job_ids(), use_constraint=use_constraint, **kwargs
+        )
+
+    def release_all(self, *, use_constraint=True, **kwargs):
+        """Release the Jobs of All Runners Together."""
+        return bulk_job_command(
+            condor_release,
+            self._all_job_ids(),
+            use_constraint=use_constraint,
+            **kwargs,
+        )
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/dag.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+DAGMan Utilities for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import re
+from collections import defaultdict, deque
+
+# -------------- External Library -------------- #
+
+from aenum import IntEnum
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..shell import decoded
+from ..util import value_or
+from .core import (
+    QUEUE_CACHE,
+    ClusterJobRange,
+    JobConfig,
+    condor_submit_dag,
+    extract_job_ranges,
+    write_config_file,
+)
+from .userlog import RETURN_VALUE_PATTERN, JobEventType, UserLogReader
+
+
+__all__ = (
+    "DagNodeStatus",
+    "DagNode",
+    "Dag",
+    "DagRun",
+)
+
+
+NODE_NAME_PATTERN = re.compile(r"^[^\s\"+]+$")
+
+DAG_KEYWORDS = frozenset(
+    (
+        "ABORT-DAG-ON",
+        "ALL_NODES",
+        "CATEGORY",
+        "CHILD",
+        "CONFIG",
+        "CONNECT",
+        "DATA",
+        "DIR",
+        "DONE",
+        "DOT",
+        "ENV",
+        "FINAL",
+        "INCLUDE",
+        "JOB",
+        "JOBSTATE_LOG",
+        "MAXJOBS",
+        "NODE_STATUS_FILE",
+        "NOOP",
+        "PARENT",
+        "PIN_IN",
+        "PIN_OUT",
+        "POST",
+        "PRE",
+        "PRE_SKIP",
+        "PRIORITY",
+        "PROVISIONER",
+        "REJECT",
+        "RETRY",
+        "SAVE_POINT_FILE",
+        "SCRIPT",
+        "SERVICE",
+        "SET_JOB_ATTR",
+        "SPLICE",
+        "SUBDAG",
+        "UNLESS-EXIT",
+        "VARS",
+    )
+)
+
+DAG_NODE_PATTERN = re.compile(r"DAG Node: (\S+)")
+
+
+class DagNodeStatus(IntEnum):
+    """DAG Node Status Codes."""
+
+    Waiting = 0
+    Submitted = 1
+    Running = 2
+    Held = 3
+    Done = 4
+    Failed = 5
+
+    @property
+    def is_finished(self):
+        """Check if Status is Terminal for the Current Attempt."""
+        return self in (DagNodeStatus.Done, DagNodeStatus.Failed)
+
+
+def _quote_variable(value):
+    """Quote Value of a DAG Node Variable."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _as_names(nodes):
+    """Get Node Names from a Node, a Name or an Iterable of Them."""
+    if isinstance(nodes, (str, DagNode)):
+        nodes = (nodes,)
+    return tuple(node.name if isinstance(node, DagNode) else node for node in nodes)
+
+
+class DagNode:
+    """
+    Node of a DAG Wrapping a Cluster Configuration.
+
+    """
+
+    def __init__(self, name, unit, *, retry=None, variables=None, pre=None, post=None):
+        """Initialize DAG Node."""
+        if not NODE_NAME_PATTERN.match(name) or name.upper() in DAG_KEYWORDS:
+            raise ValueError(f"Invalid DAG node name: {name!r}.")
+        self.name = name
+        self.unit = unit
+        self.retry = retry
+        self.variables = dict(value_or(variables, {}))
+        self.pre = pre
+        self.post = post
+        self.parents = set()
+        self.children = set()
+
+    @property
+    def config(self):
+        """Get Submit Configuration of Node."""
+        return self.unit if isinstance(self.unit, JobConfig) else self.unit.config
+
+    def dag_lines(self, submit_path):
+        """Get DAG File Lines Describing Node."""
+        yield f"JOB {self.name} {submit_path}"
+        if self.retry:
+            yield f"RETRY {self.name} {self.retry}"
+        if self.variables:
+            pairs = (f"{k}={_quote_variable(v)}" for k, v in self.variables.items())
+            yield f"VARS {self.name} {' '.join(pairs)}"
+        if self.pre:
+            yield f"SCRIPT PRE {self.name} {self.pre}"
+        if self.post:
+            yield f"SCRIPT POST {self.name} {self.post}"
+
+    def __repr__(self):
+        """Representation of DAG Node."""
+        return f"{type(self).__name__}({self.name})"
+
+
+class Dag:
+    """
+    Directed Acyclic Graph of Cluster Configurations for DAGMan.
+
+    """
+
+    def __init__(self, name="pipeline", directory=None):
+        """Initialize DAG."""
+        self.name = name
+        self.directory = Path(value_or(directory, ".")).abspath()
+        self._nodes = dict()
+
+    def add_node(self, name, unit, *, parents=(), **options):
+        """Add Node Running a ClusterUnit or JobConfig after its Parents."""
+        if name in self._nodes:
+            raise KeyError(f"DAG already has a node named {name!r}.")
+        node = DagNode(name, unit, **options)
+        self._nodes[name] = node
+        self.add_dependency(parents, node)
+        return node
+
+    def add_dependency(self, parents, children):
+        """Make every Child Node Depend on every Parent Node."""
+        parents, children = _as_names(parents), _as_names(children)
+        for name in parents + children:
+            if name not in self._nodes:
+                raise KeyError(f"DAG has no node named {name!r}.")
+        for parent in parents:
+            self._nodes[parent].children.update(children)
+        for child in children:
+            self._nodes[child].parents.update(parents)
+
+    def __getitem__(self, name):
+        """Get Node by Name."""
+        return self._nodes[name]
+
+    def __contains__(self, name):
+        """Check if DAG has Node."""
+        return name in self._nodes
+
+    def __iter__(self):
+        """Iterate over Nodes."""
+        return iter(self._nodes.values())
+
+    def __len__(self):
+        """Number of Nodes in DAG."""
+        return len(self._nodes)
+
+    def topological_order(self):
+        """Get Node Names with Parents before Children."""
+        remaining = {name: len(node.parents) for name, node in self._nodes.items()}
+        ready = deque(name for name, count in remaining.items() if not count)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for child in sorted(self._nodes[name].children):
+                remaining[child] -= 1
+                if not remaining[child]:
+                    ready.append(child)
+        if len(order) != len(self._nodes):
+            raise ValueError(f"DAG {self.name} has a dependency cycle.")
+        return order
+
+    @property
+    def dag_file(self):
+        """Get Path of DAG File."""
+        return self.directory / f"{self.name}.dag"
+
+    @property
+    def nodes_log(self):
+        """Get Path of the Log DAGMan Writes for all Node Jobs."""
+        return Path(f"{self.dag_file}.nodes.log")
+
+    def write(self):
+        """Write Node Submit Files and the DAG File and Return its Path."""
+        lines = []
+        for name in self.topological_order():
+            node = self._nodes[name]
+            submit_path = write_config_file(node.config, self.directory / f"{name}.sub")
+            lines.extend(node.dag_lines(submit_path))
+        for name in self.topological_order():
+            children = self._nodes[name].children
+            if children:
+                lines.append(f"PARENT {name} CHILD {' '.join(sorted(children))}")
+        self.directory.makedirs_p()
+        self.dag_file.write_text("\n".join(lines) + "\n")
+        return self.dag_file
+
+    def submit(self, *args, force=False, **kwargs):
+        """Write and Submit DAG through DAGMan."""
+        dag_file = self.write()
+        if force:
+            args = ("-force", *args)
+        output = decoded(condor_submit_dag(*args, dag_file, **kwargs))
+        QUEUE_CACHE.invalidate()
+        jobs = tuple(
+            ClusterJobRange(cluster, count, first, logfile=f"{dag_file}.dagman.log")
+            for cluster, first, count in extract_job_ranges(output)
+        )
+        return DagRun(self, jobs)
+
+    def __repr__(self):
+        """Representation of DAG."""
+        return f"{type(self).__name__}({self.name}, {len(self)} nodes)"
+
+
+class DagRun:
+    """
+    Submitted DAG Tracking Node Status from the Nodes Log.
+
+    The nodes log is tailed incrementally, so each poll only parses the events
+    written since the previous poll.
+
+    """
+
+    def __init__(self, dag, jobs=()):
+        """Initialize DAG Run."""
+        self.dag = dag
+        self.jobs = tuple(jobs)
+        self._reader = UserLogReader(dag.nodes_log)
+        self._status = {node.name: DagNodeStatus.Waiting for node in dag}
+        self._attempts = defaultdict(int)
+        self._cluster_nodes = dict()
+        self._submitted = defaultdict(int)
+        self._finished = defaultdict(int)
+        self._failed = set()
+
+    def _set(self, name, status, changes):
+        """Set Node Status and Record Change."""
+        if self._status[name] != status:
+            self._status[name] = status
+            changes[name] = status
+
+    def _apply(self, event, changes):
+        """Apply Nodes Log Event."""
+        cluster = event.cluster
+        if event.event_type == JobEventType.Submit:
+            match = DAG_NODE_PATTERN.search(" ".join(event.lines))
+            if match is None or match.group(1) not in self._status:
+                return
+            name = match.group(1)
+            if cluster not in self._cluster_nodes:
+                self._cluster_nodes[cluster] = name
+                self._attempts[name] += 1
+            self._submitted[cluster] += 1
+            self._set(name, DagNodeStatus.Submitted, changes)
+            return
+        name = self._cluster_nodes.get(cluster)
+        if name is None:
+            return
+        if event.event_type == JobEventType.PostScriptTerminated:
+            match = RETURN_VALUE_PATTERN.search(" ".join(event.lines))
+            failed = match is None or int(match.group(1)) != 0
+            self._set(
+                name, DagNodeStatus.Failed if failed else DagNodeStatus.Done, changes
+            )
+        elif event.event_type == JobEventType.Execute:
+            self._set(name, DagNodeStatus.Running, changes)
+        elif event.event_type == JobEventType.JobHeld:
+            self._set(name, DagNodeStatus.Held, changes)
+        elif event.event_type == JobEventType.JobReleased:
+            self._set(name, DagNodeStatus.Submitted, changes)
+        elif event.event_type in (JobEventType.JobTerminated, JobEventType.JobAborted):
+            self._finished[cluster] += 1
+            if event.event_type == JobEventType.JobAborted or event.return_value:
+                self._failed.add(cluster)
+            finished = self._finished[cluster] >= self._submitted[cluster]
+            if finished and not self.dag[name].post:
+                failed = cluster in self._failed
+                self._set(
+                    name,
+                    DagNodeStatus.Failed if failed else DagNodeStatus.Done,
+                    changes,
+                )
+
+    def poll(self):
+        """Read New Nodes Log Events and Return Nodes whose Status Changed."""
+        changes = dict()
+        for event in self._reader.read_events():
+            self._apply(event, changes)
+        return changes
+
+    def status(self, name):
+        """Get Last Known Status of Node."""
+        return self._status[name]
+
+    def attempts(self, name):
+        """Get Number of Times Node was Submitted."""
+        return self._attempts[name]
+
+    @property
+    def statuses(self):
+        """Get Last Known Status of every Node."""
+        return dict(self._status)
+
+    @property
+    def is_done(self):
+        """Check if every Node is Done."""
+        return all(status == DagNodeStatus.Done for status in self._status.values())
+
+    def __repr__(self):
+        """Representation of DAG Run."""
+        return f"{type(self).__name__}({self.dag.name}, {self.jobs})"
@@ -0,0 +1,515 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/description.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Submit Description Parsing for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import os
+import re
+from dataclasses import dataclass
+from glob import glob
+
+# -------------- External Library -------------- #
+
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..util import value_or
+
+
+__all__ = (
+    "PROCESS_MACROS",
+    "SubmitAssignment",
+    "SubmitQueue",
+    "MacroTemplate",
+    "SubmitDescription",
+    "parse_submit_lines",
+    "PARSED_SUBMIT_CACHE_SIZE",
+    "parse_submit_file",
+)
+
+
+ASSIGNMENT_PATTERN = re.compile(r"^([+\w.]+)\s*=\s*(.*)$", re.DOTALL)
+
+INCLUDE_PATTERN = re.compile(r"^include\s*(command)?\s*:\s*(.*)$", re.IGNORECASE)
+
+QUEUE_STATEMENT_PATTERN = re.compile(
+    r"^queue(?:\s+(\d+))?(?:\s+(.*))?$", re.IGNORECASE | re.DOTALL
+)
+
+ITEM_CLAUSE_PATTERN = re.compile(
+    r"^(?:(.*?)\s+)?(from|in|matching)\s+(.*)$", re.IGNORECASE | re.DOTALL
+)
+
+MACRO_REFERENCE_PATTERN = re.compile(r"(?<!\$)\$(ENV)?\(([^()]*)\)")
+
+FUNCTION_MACRO_PATTERN = re.compile(r"(?<!\$)\$(?!ENV\()(\w+)\(")
+
+CONDITIONAL_KEYWORDS = ("if", "elif", "else", "endif", "error", "warning")
+
+PROCESS_MACROS = frozenset(
+    ("cluster", "clusterid", "process", "procid", "step", "itemindex", "row")
+)
+
+
+@dataclass(frozen=True)
+class SubmitAssignment:
+    """Submit Description Assignment."""
+
+    key: str
+    value: str
+    source: str = None
+    line: int = None
+
+    @property
+    def name(self):
+        """Get Case-Insensitive Macro Name of the Key."""
+        name = self.key.lower()
+        return "+" + name[3:] if name.startswith("my.") else name
+
+    def __str__(self):
+        """Render Assignment as a Submit Line."""
+        return f"{self.key} = {self.value}"
+
+
+@dataclass(frozen=True)
+class SubmitQueue:
+    """Submit Description Queue Statement."""
+
+    count: int = 1
+    variables: tuple = ()
+    kind: str = None
+    items: str = ""
+    source: str = None
+    line: int = None
+
+    @property
+    def item_names(self):
+        """Get Lowercase Names of the Item Variables."""
+        if self.kind is None:
+            return ()
+        return tuple(name.lower() for name in self.variables) or ("item",)
+
+    def rows(self, directory="."):
+        """Get Item Variable Mappings, One per Item Row."""
+        if self.kind is None:
+            return [dict()]
+        names = self.item_names
+        if self.kind == "matching":
+            words = self.items.split()
+            kind = words[0].lower() if words[0].lower() in ("files", "dirs") else None
+            matches = sorted(
+                Path(match).relpath(directory)
+                for pattern in (words[1:] if kind else words)
+                for match in glob(str(Path(directory) / pattern))
+                if kind is None or Path(match).isdir() == (kind == "dirs")
+            )
+            return [{names[0]: str(match)} for match in matches]
+        if self.kind == "in":
+            return [{names[0]: item} for item in _split_items(self.items)]
+        if self.items.startswith("("):
+            lines = _split_items(self.items, split_commas=False)
+        else:
+            with open(Path(directory) / self.items) as file:
+                lines = [line.strip() for line in file if line.strip()]
+        rows = []
+        for line in lines:
+            values = [v.strip() for v in re.split(r"[,\s]+", line, len(names) - 1)]
+            values += [""] * (len(names) - len(values))
+            rows.append(dict(zip(names, values)))
+        return rows
+
+    def __str__(self):
+        """Render Queue Statement as Submit Text."""
+        count = f" {self.count}" if self.count != 1 else ""
+        if self.kind is None:
+            return f"queue{count}"
+        variables = f" {','.join(self.variables)}" if self.variables else ""
+        return f"queue{count}{variables} {self.kind} {self.items}"
+
+
+def _split_items(text, split_commas=True):
+    """Split Inline Itemdata into Items."""
+    text = text.strip()
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1]
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    if split_commas and len(lines) == 1:
+        return [item.strip() for item in lines[0].split(",") if item.strip()]
+    return lines
+
+
+class MacroTemplate:
+    """
+    Submit Value Compiled into Literal Text and Macro References.
+
+    """
+
+    __slots__ = ("parts", "references")
+
+    def __init__(self, value):
+        """Compile Value."""
+        parts, position = [], 0
+        for match in MACRO_REFERENCE_PATTERN.finditer(value):
+            parts.append(value[position : match.start()])
+            environment = bool(match.group(1))
+            name, _, default = match.group(2).partition(":")
+            name = name.strip() if environment else name.strip().lower()
+            parts.append((environment, name, default))
+            position = match.end()
+        parts.append(value[position:])
+        self.parts = tuple(part for part in parts if part != "")
+        self.references = frozenset(
+            part[1] for part in self.parts if isinstance(part, tuple) and not part[0]
+        )
+
+    def render(self, lookup):
+        """Render Template, Looking Up each Referenced Macro Name."""
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+            elif part[0]:
+                out.append(os.environ.get(part[1], part[2]))
+            else:
+                value = lookup(part[1])
+                out.append(part[2] if value is None else value)
+        return "".join(out)
+
+
+class _MacroScope:
+    """
+    Macro Definitions in Effect at one Queue Statement.
+
+    Values not depending on per-process macros are resolved once and shared by
+    every process of the queue statement.
+
+    """
+
+    def __init__(self, templates):
+        """Initialize Macro Scope from Templates by Name."""
+        self.templates = templates
+        self._static = dict()
+        self._dynamic = dict()
+
+    def is_dynamic(self, name, variables, seen=()):
+        """Check if a Macro Depends on Per-Process or Item Variables."""
+        if name in variables or name in PROCESS_MACROS:
+            return True
+        if name in self._dynamic:
+            return self._dynamic[name]
+        template = self.templates.get(name)
+        if template is None or name in seen:
+            return False
+        seen = (*seen, name)
+        dynamic = any(
+            self.is_dynamic(ref, variables, seen) for ref in template.references
+        )
+        self._dynamic[name] = dynamic
+        return dynamic
+
+    def resolve(self, name, variables, seen=()):
+        """Resolve Macro with Per-Process Variables, None if Undefined."""
+        if name in variables:
+            return str(variables[name])
+        if name in self._static:
+            return self._static[name]
+        template = self.templates.get(name)
+        if template is None:
+            return None
+        if name in seen:
+            raise ValueError(f"Macro $({name}) is defined in terms of itself.")
+        seen = (*seen, name)
+        value = template.render(lambda ref: self.resolve(ref, variables, seen))
+        if not self.is_dynamic(name, variables):
+            self._static[name] = value
+        return value
+
+
+class SubmitDescription:
+    """
+    Structured Form of a Submit Description.
+
+    Statements are kept in order with continuation lines joined and includes
+    inlined. Macros are only resolved when settings are expanded, and values
+    which do not depend on the process are resolved once per queue statement.
+
+    """
+
+    def __init__(self, statements, directory=".", *, path=None, dependencies=()):
+        """Initialize Submit Description."""
+        self.statements = list(statements)
+        self.directory = Path(directory)
+        self.path = path
+        self.dependencies = tuple(dependencies)
+
+    @classmethod
+    def from_lines(cls, lines, directory=".", *, path=None):
+        """Parse Submit Description from Lines."""
+        dependencies = []
+        statements = list(_parse(lines, Path(directory), path, dependencies))
+        return cls(statements, directory, path=path, dependencies=dependencies)
+
+    @classmethod
+    def from_file(cls, path):
+        """Parse Submit File."""
+        path = Path(path).abspath()
+        with open(path) as file:
+            description = cls.from_lines(file, path.parent, path=path)
+        description.dependencies = ((path, _stamp(path)),) + description.dependencies
+        return description
+
+    @property
+    def assignments(self):
+        """Get Assignment Statements."""
+        return [s for s in self.statements if isinstance(s, SubmitAssignment)]
+
+    @property
+    def queues(self):
+        """Get Queue Statements."""
+        return [s for s in self.statements if isinstance(s, SubmitQueue)]
+
+    @property
+    def settings(self):
+        """Get Raw Value of each Key after the Last Statement."""
+        return {s.name: s.value for s in self.assignments}
+
+    def __getitem__(self, key):
+        """Get Raw Value of Key."""
+        return self.settings[key.lower()]
+
+    def get(self, key, default=None):
+        """Get Raw Value of Key or Default."""
+        return self.settings.get(key.lower(), default)
+
+    def expand(self, key, default=None, **variables):
+        """Expand Value of Key after the Last Statement."""
+        templates = {s.name: s.value for s in self.assignments}
+        scope = _MacroScope({k: MacroTemplate(v) for k, v in templates.items()})
+        variables = {k.lower(): v for k, v in variables.items()}
+        value = scope.resolve(key.lower(), variables)
+        return default if value is None else value
+
+    def _scopes(self):
+        """Iterate over (Cluster Index, Scope, Queue Statement) in Order."""
+        templates, cluster, queued = dict(), 0, False
+        for statement in self.statements:
+            if isinstance(statement, SubmitQueue):
+                queued = True
+                yield cluster, _MacroScope(dict(templates)), statement
+            else:
+                if statement.name == "executable" and queued:
+                    cluster += 1
+                    queued = False
+                templates[statement.name] = MacroTemplate(statement.value)
+
+    @property
+    def cluster_count(self):
+        """Get Number of Clusters Created by the Queue Statements."""
+        return max((index for index, _, _ in self._scopes()), default=-1) + 1
+
+    def iter_procs(self, first_cluster=0):
+        """
+        Iterate over (Cluster, Process, Settings) for each Queued Process.
+
+        Setting the executable after a queue statement starts a new cluster, as
+        for condor_submit. Settings map lowercase keys to fully expanded values.
+
+        """
+        last_index, process = 0, 0
+        for index, scope, queue in self._scopes():
+            if index != last_index:
+                last_index, process = index, 0
+            cluster = first_cluster + index
+            item_names = queue.item_names
+            names = [name for name in scope.templates]
+            dynamic = [name for name in names if scope.is_dynamic(name, item_names)]
+            static = {
+                name: scope.resolve(name, {}) for name in names if name not in dynamic
+            }
+            directory = self.directory / value_or(static.get("initialdir"), ".")
+            for item_index, row in enumerate(queue.rows(directory)):
+                for step in range(queue.count):
+                    variables = dict(row)
+                    variables.update(
+                        cluster=cluster,
+                        clusterid=cluster,
+                        process=process,
+                        procid=process,
+                        step=step,
+                        itemindex=item_index,
+                        row=item_index,
+                    )
+                    settings = dict(static)
+                    for name in dynamic:
+                        settings[name] = scope.resolve(name, variables)
+                    yield cluster, process, settings
+                    process += 1
+
+    def lines(self):
+        """Iterate over Normalized Submit Lines."""
+        return map(str, self.statements)
+
+    def diff(self, other):
+        """Get Keys whose Raw Values Differ as {key: (this, other)}."""
+        this, that = self.settings, other.settings
+        return {
+            key: (this.get(key), that.get(key))
+            for key in sorted(this.keys() | that.keys())
+            if this.get(key) != that.get(key)
+        }
+
+    def is_current(self):
+        """Check that No Parsed File has Changed or been Deleted Since Parsing."""
+        try:
+            return all(_stamp(path) == stamp for path, stamp in self.dependencies)
+        except FileNotFoundError:
+            return False
+
+    def __len__(self):
+        """Number of Statements."""
+        return len(self.statements)
+
+    def __repr__(self):
+        """Representation of Submit Description."""
+        name = self.path if self.path else f"{len(self)} statements"
+        return f"{type(self).__name__}({name})"
+
+
+def _stamp(path):
+    """Get Modification Stamp of File."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _logical_lines(lines):
+    """Join Continuation Lines and Number the Results."""
+    pending, start = [], None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if start is None:
+            start = number
+        if line.endswith("\\"):
+            pending.append(line[:-1])
+            continue
+        pending.append(line)
+        yield start, "".join(pending).strip()
+        pending, start = [], None
+    if pending:
+        yield start, "".join(pending).strip()
+
+
+def _parse(lines, directory, source, dependencies, depth=0):
+    """Parse Lines into Submit Statements, Inlining Includes."""
+    logical = _logical_lines(lines)
+    for number, line in logical:
+        if not line or line.startswith("#"):
+            continue
+        function = FUNCTION_MACRO_PATTERN.search(line)
+        if function:
+            raise ValueError(
+                f"{source}:{number}: function macro ${function.group(1)}() "
+                "is unsupported."
+            )
+        include = INCLUDE_PATTERN.match(line)
+        if include:
+            if include.group(1):
+                raise ValueError(f"{source}:{number}: include command is unsupported.")
+            if depth > 16:
+                raise ValueError(f"{source}:{number}: includes nested too deeply.")
+            path = (directory / include.group(2).strip()).abspath()
+            dependencies.append((path, _stamp(path)))
+            with open(path) as file:
+                yield from _parse(file, path.parent, path, dependencies, depth + 1)
+            continue
+        queue = QUEUE_STATEMENT_PATTERN.match(line)
+        if queue and not ASSIGNMENT_PATTERN.match(line):
+            clause = value_or(queue.group(2), "").strip()
+            while clause.count("(") > clause.count(")"):
+                try:
+                    clause += "\n" + next(logical)[1]
+                except StopIteration:
+                    raise ValueError(f"{source}:{number}: unterminated item list.")
+            yield _parse_queue(queue.group(1), clause, source, number)
+            continue
+        assignment = ASSIGNMENT_PATTERN.match(line)
+        if assignment:
+            key, value = assignment.groups()
+            yield SubmitAssignment(key, value.strip(), source, number)
+            continue
+        if line.split(None, 1)[0].lower() in CONDITIONAL_KEYWORDS:
+            raise ValueError(f"{source}:{number}: conditionals are unsupported.")
+        raise ValueError(f"{source}:{number}: invalid submit line {line!r}.")
+
+
+def _parse_queue(count, clause, source, number):
+    """Parse Queue Statement."""
+    count = int(value_or(count, 1))
+    if not clause:
+        return SubmitQueue(count, source=source, line=number)
+    item = ITEM_CLAUSE_PATTERN.match(clause)
+    if item is None:
+        raise ValueError(f"{source}:{number}: invalid queue statement {clause!r}.")
+    if item.group(2).lower() == "from" and item.group(3).rstrip().endswith("|"):
+        raise ValueError(f"{source}:{number}: queue from command is unsupported.")
+    variables = tuple(v for v in re.split(r"[,\s]+", value_or(item.group(1), "")) if v)
+    return SubmitQueue(
+        count,
+        variables,
+        item.group(2).lower(),
+        item.group(3).strip(),
+        source,
+        number,
+    )
+
+
+def parse_submit_lines(lines, directory="."):
+    """Parse Submit Description from Lines."""
+    return SubmitDescription.from_lines(lines, directory)
+
+
+PARSED_SUBMIT_CACHE_SIZE = 256
+
+_PARSED_SUBMIT_FILES = dict()
+
+
+def parse_submit_file(path):
+    """Parse Submit File, Reusing the Parse while No Included File Changes."""
+    path = Path(path).abspath()
+    description = _PARSED_SUBMIT_FILES.pop(path, None)
+    if description is None or not description.is_current():
+        description = SubmitDescription.from_file(path)
+    _PARSED_SUBMIT_FILES[path] = description
+    while len(_PARSED_SUBMIT_FILES) > PARSED_SUBMIT_CACHE_SIZE:
+        del _PARSED_SUBMIT_FILES[next(iter(_PARSED_SUBMIT_FILES))]
+    return description
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/history.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Job History Ingestion for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import json
+import logging
+from itertools import islice
+
+# -------------- External Library -------------- #
+
+import h5py
+import numpy as np
+import pandas as pd
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..shell import PIPE
+from ..util import try_import
+from .core import condor_history
+from .query import (
+    JOB_ID_ATTRIBUTES,
+    check_stream,
+    iter_ad_records,
+    iter_autoformat,
+    iter_json_ads,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+pyarrow, PYARROW_SUPPORT = try_import("pyarrow", log_error=LOGGER.info)
+
+pyarrow_parquet, _ = try_import("pyarrow.parquet", log_error=LOGGER.info)
+
+
+__all__ = (
+    "PYARROW_SUPPORT",
+    "HISTORY_ATTRIBUTES",
+    "STRING_ATTRIBUTES",
+    "HISTORY_CHUNK_SIZE",
+    "iter_history",
+    "job_keys",
+    "iter_history_chunks",
+    "HistoryStore",
+    "HDF5HistoryStore",
+    "ParquetHistoryStore",
+    "ingest_history",
+    "summarize_history",
+)
+
+
+HISTORY_ATTRIBUTES = (
+    "Owner",
+    "JobStatus",
+    "ExitCode",
+    "QDate",
+    "JobStartDate",
+    "JobCurrentStartDate",
+    "CompletionDate",
+    "RemoteWallClockTime",
+    "CommittedTime",
+    "RemoteUserCpu",
+    "RemoteSysCpu",
+    "NumJobStarts",
+    "RequestCpus",
+    "RequestMemory",
+    "MemoryUsage",
+)
+
+STRING_ATTRIBUTES = frozenset(
+    ("Owner", "GlobalJobId", "Cmd", "Args", "AcctGroup", "LastRemoteHost", "Iwd")
+)
+
+HISTORY_CHUNK_SIZE = 1 << 16
+
+
+def iter_history(
+    *attributes, constraint=None, completed_since=None, limit=None, use_json=False
+):
+    """Stream Job History as (ClusterId, ProcId, *attributes) Records."""
+    attributes = JOB_ID_ATTRIBUTES + attributes
+    args = []
+    if constraint:
+        args.extend(("-constraint", str(constraint)))
+    if completed_since is not None:
+        args.extend(("-completedsince", str(int(completed_since))))
+    if limit is not None:
+        args.extend(("-limit", str(limit)))
+    if use_json:
+        args.extend(("-json", "-attributes", ",".join(attributes)))
+    else:
+        args.extend(("-af:t", *attributes))
+    process = condor_history.open(*args, stdout=PIPE, universal_newlines=True)
+    try:
+        if use_json:
+            chunks = iter(lambda: process.stdout.read(1 << 16), "")
+            yield from iter_ad_records(iter_json_ads(chunks), attributes)
+        else:
+            yield from iter_autoformat(process.stdout, len(attributes))
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    check_stream(process, returncode)
+
+
+def _column_array(name, values):
+    """Convert Values of an Attribute into a Typed Column."""
+    if name in JOB_ID_ATTRIBUTES:
+        return np.array(values, dtype=np.int64)
+    if name in STRING_ATTRIBUTES:
+        return np.array(["" if v is None else str(v) for v in values], dtype=object)
+    return np.array(
+        [v if isinstance(v, (int, float)) else np.nan for v in values], dtype=float
+    )
+
+
+def job_keys(cluster, process):
+    """Combine ClusterId and ProcId Arrays into Single Integer Keys."""
+    cluster, process = np.asarray(cluster, np.int64), np.asarray(process, np.int64)
+    return (cluster << 32) | process
+
+
+def iter_history_chunks(records, attributes, chunk_size=HISTORY_CHUNK_SIZE):
+    """Group History Records into Mappings of Column Arrays."""
+    names = JOB_ID_ATTRIBUTES + tuple(attributes)
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield {
+            name: _column_array(name, values)
+            for name, values in zip(names, zip(*chunk))
+        }
+
+
+class HistoryStore:
+    """
+    Append-Only Columnar Store of Job History.
+
+    """
+
+    def __init__(self, attributes=HISTORY_ATTRIBUTES):
+        """Initialize History Store."""
+        attributes = tuple(attributes)
+        if "CompletionDate" not in attributes:
+            attributes += ("CompletionDate",)
+        self.attributes = attributes
+
+    @property
+    def last_completion_date(self):
+        """Get Latest Completion Date Stored."""
+        raise NotImplementedError
+
+    def append(self, chunk):
+        """Append Chunk of Column Arrays."""
+        raise NotImplementedError
+
+    def uncommitted_keys(self):
+        """Get Job Keys of the Records Appended since the Last Commit."""
+        raise NotImplementedError
+
+    def boundary_keys(self):
+        """Get Job Keys of the Records Completed at the Last Completion Date."""
+        raise NotImplementedError
+
+    def commit(self, last_completion_date, boundary_keys=()):
+        """Record Latest Completion Date after a Complete Ingestion."""
+        raise NotImplementedError
+
+    def to_frame(self, columns=None):
+        """Read Store into a Pandas DataFrame."""
+        raise NotImplementedError
+
+
+class HDF5HistoryStore(HistoryStore):
+    """
+    Job History in Chunked, Resizable HDF5 Datasets, One per Attribute.
+
+    """
+
+    def __init__(self, path, attributes=HISTORY_ATTRIBUTES, *, group="history"):
+        """Initialize HDF5 History Store."""
+        super().__init__(attributes)
+        self.path = Path(path).abspath()
+        self.group = group
+
+    def _open(self, mode="a"):
+        """Open HDF5 File."""
+        self.path.parent.makedirs_p()
+        return h5py.File(self.path, mode)
+
+    @property
+    def last_completion_date(self):
+        """Get Latest Completion Date Stored."""
+        if not self.path.exists():
+            return None
+        with self._open("r") as file:
+            if self.group not in file:
+                return None
+            return file[self.group].attrs.get("last_completion_date")
+
+    def append(self, chunk):
+        """Append Chunk of Column Arrays."""
+        with self._open() as file:
+            group = file.require_group(self.group)
+            for name, values in chunk.items():
+                dtype = h5py.string_dtype() if values.dtype == object else values.dtype
+                if name not in group:
+                    group.create_dataset(
+                        name,
+                        shape=(0,),
+                        maxshape=(None,),
+                        dtype=dtype,
+                        chunks=(HISTORY_CHUNK_SIZE,),
+                        compression="gzip",
+                        shuffle=True,
+                    )
+                dataset = group[name]
+                start = dataset.shape[0]
+                dataset.resize((start + len(values),))
+                dataset[start:] = values
+
+    def uncommitted_keys(self):
+        """Get Job Keys of the Records Appended since the Last Commit."""
+        if not self.path.exists():
+            return job_keys((), ())
+        with self._open("r") as file:
+            group = file.get(self.group)
+            if group is None or "ClusterId" not in group:
+                return job_keys((), ())
+            start = group.attrs.get("committed_rows", 0)
+            return job_keys(group["ClusterId"][start:], group["ProcId"][start:])
+
+    def boundary_keys(self):
+        """Get Job Keys of the Records Completed at the Last Completion Date."""
+        if not self.path.exists():
+            return job_keys((), ())
+        with self._open("r") as file:
+            group = file.get(self.group)
+            if group is None:
+                return job_keys((), ())
+            return np.asarray(group.attrs.get("boundary_keys", ()), np.int64)
+
+    def commit(self, last_completion_date, boundary_keys=()):
+        """Record Latest Completion Date after a Complete Ingestion."""
+        with self._open() as file:
+            group = file.require_group(self.group)
+            group.attrs["last_completion_date"] = last_completion_date
+            group.attrs["boundary_keys"] = np.asarray(boundary_keys, np.int64)
+            if "ClusterId" in group:
+                group.attrs["committed_rows"] = group["ClusterId"].shape[0]
+
+    def to_frame(self, columns=None):
+        """Read Store into a Pandas DataFrame."""
+        with self._open("r") as file:
+            group = file[self.group]
+            if columns is None:
+                names = JOB_ID_ATTRIBUTES + self.attributes
+                columns = [name for name in names if name in group]
+            data = dict()
+            for name in columns:
+                dataset = group[name]
+                if h5py.check_string_dtype(dataset.dtype):
+                    data[name] = pd.Categorical(dataset.asstr()[:])
+                else:
+                    data[name] = dataset[:]
+        return pd.DataFrame(data)
+
+
+class ParquetHistoryStore(HistoryStore):
+    """
+    Job History as a Directory of Parquet Part Files.
+
+    """
+
+    def __init__(self, directory, attributes=HISTORY_ATTRIBUTES):
+        """Initialize Parquet History Store."""
+        if not PYARROW_SUPPORT:
+            raise ImportError("Parquet history stores require pyarrow.")
+        super().__init__(attributes)
+        self.directory = Path(directory).abspath()
+
+    @property
+    def _state_path(self):
+        """Get Path of Ingestion State File."""
+        return self.directory / "_state.json"
+
+    def _state(self):
+        """Load Ingestion State."""
+        if not self._state_path.exists():
+            return {"last_completion_date": None, "parts": 0, "committed_parts": 0}
+        return json.loads(self._state_path.text())
+
+    def _save_state(self, state):
+        """Save Ingestion State."""
+        self.directory.makedirs_p()
+        self._state_path.write_text(json.dumps(state))
+
+    @property
+    def last_completion_date(self):
+        """Get Latest Completion Date Stored."""
+        return self._state()["last_completion_date"]
+
+    def append(self, chunk):
+        """Append Chunk of Column Arrays as a New Part File."""
+        state = self._state()
+        table = pyarrow.table(
+            {name: list(v) if v.dtype == object else v for name, v in chunk.items()}
+        )
+        self.directory.makedirs_p()
+        pyarrow_parquet.write_table(
+            table, self.directory / f"part-{state['parts']:08d}.parquet"
+        )
+        state["parts"] += 1
+        self._save_state(state)
+
+    def uncommitted_keys(self):
+        """Get Job Keys of the Records Appended since the Last Commit."""
+        state = self._state()
+        if state["parts"] <= state.get("committed_parts", 0):
+            return job_keys((), ())
+        parts = sorted(self.directory.files("part-*.parquet"))
+        parts = parts[state.get("committed_parts", 0) :]
+        if not parts:
+            return job_keys((), ())
+        frame = pd.read_parquet(parts, columns=list(JOB_ID_ATTRIBUTES))
+        return job_keys(frame["ClusterId"], frame["ProcId"])
+
+    def boundary_keys(self):
+        """Get Job Keys of the Records Completed at the Last Completion Date."""
+        return np.asarray(self._state().get("boundary_keys", ()), np.int64)
+
+    def commit(self, last_completion_date, boundary_keys=()):
+        """Record Latest Completion Date after a Complete Ingestion."""
+        state = self._state()
+        state["last_completion_date"] = last_completion_date
+        state["boundary_keys"] = [int(key) for key in boundary_keys]
+        state["committed_parts"] = state["parts"]
+        self._save_state(state)
+
+    def to_frame(self, columns=None):
+        """Read Store into a Pandas DataFrame."""
+        return pd.read_parquet(
+            sorted(self.directory.files("part-*.parquet")), columns=columns
+        )
+
+
+def ingest_history(
+    store, *, constraint=None, chunk_size=HISTORY_CHUNK_SIZE, use_json=False
+):
+    """
+    Stream New Job History into a Store and Return the Number of Records.
+
+    Only jobs completed at or after the last completion date of the store are
+    read. Records are converted and appended one chunk at a time, and the
+    completion date is only advanced once the whole stream has been stored.
+    condor_history lists the newest jobs first, so the date cannot be advanced
+    chunk by chunk. Instead, records already appended by an interrupted ingestion
+    are skipped, as are those stored for the last completion date itself, whose
+    second may have gained jobs since.
+
+    """
+    since = store.last_completion_date
+    boundary = [store.boundary_keys()]
+    seen = np.union1d(store.uncommitted_keys(), boundary[0])
+    records = iter_history(
+        *store.attributes,
+        constraint=constraint,
+        completed_since=since,
+        use_json=use_json,
+    )
+    count, latest = 0, since
+    for chunk in iter_history_chunks(records, store.attributes, chunk_size):
+        dates = chunk["CompletionDate"]
+        keys = job_keys(chunk["ClusterId"], chunk["ProcId"])
+        new = np.ones(len(dates), dtype=bool) if since is None else dates >= since
+        fresh = new & ~np.isin(keys, seen) if len(seen) else new
+        if fresh.any():
+            store.append({name: values[fresh] for name, values in chunk.items()})
+            count += int(fresh.sum())
+        dates, keys = dates[new], keys[new]
+        chunk_latest = np.nanmax(dates) if np.isfinite(dates).any() else None
+        if chunk_latest is not None and (latest is None or chunk_latest > latest):
+            latest, boundary = float(chunk_latest), []
+        if latest is not None:
+            boundary.append(keys[dates == latest])
+    if latest is not None:
+        store.commit(latest, np.unique(np.concatenate(boundary)))
+    return count
+
+
+def summarize_history(frame, by="Owner"):
+    """Summarize Queue Wait, Runtime and Goodput of a History Frame by Group."""
+    frame = frame.assign(
+        QueueWait=frame["JobStartDate"] - frame["QDate"],
+        Runtime=frame["RemoteWallClockTime"],
+        Goodput=frame["CommittedTime"],
+    )
+    summary = frame.groupby(by, observed=True).agg(
+        Jobs=("ProcId", "size"),
+        MeanQueueWait=("QueueWait", "mean"),
+        MeanRuntime=("Runtime", "mean"),
+        TotalRuntime=("Runtime", "sum"),
+        TotalGoodput=("Goodput", "sum"),
+    )
+    summary["GoodputFraction"] = summary["TotalGoodput"] / summary["TotalRuntime"]
+    return summary
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/itemdata.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Streaming Itemdata Utilities for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import hashlib
+import os
+import tempfile
+from itertools import islice
+
+# -------------- External Library -------------- #
+
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..shell import ME
+from ..util import value_or
+
+
+__all__ = (
+    "ITEMDATA_CHUNK_SIZE",
+    "ITEMDATA_DIRECTORY",
+    "itemdata_columns",
+    "iter_itemdata_rows",
+    "format_itemdata_row",
+    "iter_itemdata_lines",
+    "write_itemdata",
+)
+
+
+ITEMDATA_CHUNK_SIZE = 1 << 14
+
+ITEMDATA_DIRECTORY = Path(tempfile.gettempdir()) / f"hexfarm-itemdata-{ME}"
+
+
+def itemdata_columns(items):
+    """Get Column Names of Tabular Itemdata or None."""
+    columns = getattr(items, "columns", None)
+    if columns is not None:
+        return tuple(map(str, columns))
+    dtype = getattr(items, "dtype", None)
+    if dtype is not None and dtype.names:
+        return dtype.names
+    return None
+
+
+def iter_itemdata_rows(items, chunk_size=ITEMDATA_CHUNK_SIZE):
+    """Iterate over Rows of Itemdata from an Iterable, NumPy Array or DataFrame."""
+    if hasattr(items, "itertuples"):
+        yield from items.itertuples(index=False, name=None)
+    elif hasattr(items, "dtype") and hasattr(items, "tolist"):
+        for start in range(0, len(items), chunk_size):
+            yield from items[start : start + chunk_size].tolist()
+    else:
+        yield from items
+
+
+def format_itemdata_row(row, separator=","):
+    """Format Row of Itemdata as a Single Line."""
+    if isinstance(row, (tuple, list)):
+        line = separator.join(map(str, row))
+    else:
+        line = str(row)
+    if "\n" in line:
+        raise ValueError(f"Itemdata row {row!r} spans multiple lines.")
+    return line + "\n"
+
+
+def iter_itemdata_lines(items, separator=","):
+    """Iterate over Formatted Lines of Itemdata."""
+    for row in iter_itemdata_rows(items):
+        yield format_itemdata_row(row, separator)
+
+
+def _iter_text_chunks(lines, chunk_size=ITEMDATA_CHUNK_SIZE):
+    """Join Lines into Chunks of Text."""
+    lines = iter(lines)
+    while True:
+        chunk = "".join(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_itemdata(items, path=None, *, directory=None, separator=","):
+    """
+    Stream Itemdata to a File and Return its Path.
+
+    Rows are written in chunks as they are produced, so the itemdata is never
+    held in memory. Without an explicit path the file is named after the hash
+    of its content inside the directory, so identical sweeps share one file.
+    The default directory belongs to the current user and is private to them.
+
+    """
+    if path is not None:
+        path = Path(path).abspath()
+        path.parent.makedirs_p()
+        with open(path, "w") as file:
+            for chunk in _iter_text_chunks(iter_itemdata_lines(items, separator)):
+                file.write(chunk)
+        return path
+    directory = Path(value_or(directory, ITEMDATA_DIRECTORY)).abspath()
+    directory.makedirs_p(mode=0o700)
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, suffix=".tmp", delete=False
+    ) as file:
+        for chunk in _iter_text_chunks(iter_itemdata_lines(items, separator)):
+            file.write(chunk)
+            digest.update(chunk.encode())
+    path = directory / f"{digest.hexdigest()}.items"
+    os.replace(file.name, path)
+    return path
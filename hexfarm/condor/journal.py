@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/journal.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Persistent Job Journal for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+from time import monotonic, time
+
+# -------------- External Library -------------- #
+
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..util import value_or
+from .core import ClusterJobRange, Job, JobConfig, split_job_id
+from .userlog import JobStatus
+
+
+__all__ = (
+    "JOURNAL_SCHEMA",
+    "JobJournal",
+    "MapJournal",
+)
+
+
+JOURNAL_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS runners (
+        name TEXT PRIMARY KEY, config TEXT, path TEXT, logfile TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ranges (
+        map TEXT, cluster INTEGER, first INTEGER, count INTEGER,
+        logfile TEXT, submitter TEXT, submit_time REAL,
+        PRIMARY KEY (map, cluster)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS processes (
+        map TEXT, cluster INTEGER, process INTEGER, status INTEGER,
+        PRIMARY KEY (map, cluster, process)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        map TEXT, job_id TEXT, logfile TEXT, submitter TEXT, status INTEGER,
+        PRIMARY KEY (map, job_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS offsets (
+        map TEXT, logfile TEXT, offset INTEGER, PRIMARY KEY (map, logfile)
+    )
+    """,
+)
+
+
+class JobJournal:
+    """
+    SQLite Journal of Job Bookkeeping.
+
+    Submissions, completions, removals and user log offsets are written to a
+    database in WAL mode. Writes are committed in batches, after ``batch_size``
+    statements or ``flush_interval`` seconds, except for submissions which are
+    committed at once so that no submitted cluster is ever forgotten. Log offsets
+    are committed together with the transitions read up to them, so after a crash
+    the lost transitions are read again from the logs. The journal may be shared
+    between threads, its statements are serialized by a lock.
+
+    """
+
+    def __init__(self, path, *, batch_size=1000, flush_interval=1.0):
+        """Initialize Job Journal."""
+        self.path = Path(path).abspath()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in JOURNAL_SCHEMA:
+            self._connection.execute(statement)
+        self._connection.commit()
+        self._pending = 0
+        self._last_commit = monotonic()
+
+    def execute(self, statement, parameters=()):
+        """Execute Statement and Commit if the Batch is Full."""
+        with self._lock:
+            self._connection.execute(statement, parameters)
+            self._wrote(1)
+
+    def executemany(self, statement, rows):
+        """Execute Statement over Rows and Commit if the Batch is Full."""
+        with self._lock:
+            cursor = self._connection.executemany(statement, rows)
+            self._wrote(max(cursor.rowcount, 0))
+
+    def query(self, statement, parameters=()):
+        """Run Query and Return All Rows."""
+        with self._lock:
+            return self._connection.execute(statement, parameters).fetchall()
+
+    def _wrote(self, count):
+        """Count Pending Writes and Commit when Due."""
+        self._pending += count
+        if (
+            self._pending >= self.batch_size
+            or monotonic() - self._last_commit >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Commit Pending Writes."""
+        with self._lock:
+            self._connection.commit()
+            self._pending = 0
+            self._last_commit = monotonic()
+
+    def close(self):
+        """Commit Pending Writes and Close the Database."""
+        with self._lock:
+            self.flush()
+            self._connection.close()
+
+    def __enter__(self):
+        """Enter Journal Context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close Journal."""
+        self.close()
+
+    def bind(self, name):
+        """Get Journal of the Job Map with the given Name."""
+        return MapJournal(self, name)
+
+    def add_runner(self, name, config, path=None, logfile=None):
+        """Record Configuration Runner."""
+        self.execute(
+            "INSERT OR REPLACE INTO runners VALUES (?, ?, ?, ?)",
+            (
+                name,
+                json.dumps(list(map(str, config))),
+                None if path is None else str(path),
+                None if logfile is None else str(logfile),
+            ),
+        )
+        self.flush()
+
+    def runners(self):
+        """Iterate over Recorded Runners as (Name, Config, Path, Logfile)."""
+        for name, config, path, logfile in self.query("SELECT * FROM runners"):
+            yield name, JobConfig(json.loads(config)), path, logfile
+
+    def __repr__(self):
+        """Representation of Job Journal."""
+        return f"{type(self).__name__}({self.path})"
+
+
+class MapJournal:
+    """
+    Journal of a Single Job Map.
+
+    """
+
+    def __init__(self, journal, name):
+        """Initialize Map Journal."""
+        self.journal = journal
+        self.name = name
+        self._offsets = dict()
+
+    def add_range(self, job_range, submit_time=None):
+        """Record Submitted Cluster Job Range and Commit."""
+        self.journal.execute(
+            "INSERT OR REPLACE INTO ranges VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.name,
+                job_range.cluster,
+                job_range.first_process,
+                job_range.count,
+                None if job_range.logfile is None else str(job_range.logfile),
+                job_range.submitter,
+                value_or(submit_time, time()),
+            ),
+        )
+        self.journal.flush()
+
+    def add_jobs(self, *jobs):
+        """Record Submitted Jobs and Commit."""
+        self.journal.executemany(
+            "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    self.name,
+                    job.job_id,
+                    None if job.logfile is None else str(job.logfile),
+                    job.submitter,
+                    int(JobStatus.Unknown),
+                )
+                for job in jobs
+            ),
+        )
+        self.journal.flush()
+
+    def _set_status(self, job_ids, status):
+        """Record Final Status of Jobs."""
+        job_ids = tuple(job_ids)
+        if not job_ids:
+            return
+        self.journal.executemany(
+            "UPDATE jobs SET status = ? WHERE map = ? AND job_id = ?",
+            ((int(status), self.name, job_id) for job_id in job_ids),
+        )
+        self.journal.executemany(
+            "INSERT OR REPLACE INTO processes VALUES (?, ?, ?, ?)",
+            (
+                (self.name, *split_job_id(job_id), int(status))
+                for job_id in job_ids
+                if "." in job_id
+            ),
+        )
+
+    def mark_completed(self, *job_ids):
+        """Record Completed Jobs."""
+        self._set_status(job_ids, JobStatus.Completed)
+
+    def discard(self, *job_ids):
+        """Record Jobs Discarded from the Map."""
+        self.journal.executemany(
+            "DELETE FROM jobs WHERE map = ? AND job_id = ?",
+            ((self.name, job_id) for job_id in job_ids),
+        )
+        self._set_status(job_ids, JobStatus.Removed)
+
+    def drop_range(self, cluster):
+        """Forget Cluster Job Range."""
+        for table in ("ranges", "processes"):
+            self.journal.execute(
+                f"DELETE FROM {table} WHERE map = ? AND cluster = ?",
+                (self.name, cluster),
+            )
+
+    def clear(self):
+        """Forget All Jobs of the Map."""
+        for table in ("ranges", "processes", "jobs", "offsets"):
+            self.journal.execute(f"DELETE FROM {table} WHERE map = ?", (self.name,))
+        self._offsets.clear()
+        self.journal.flush()
+
+    def save_offsets(self, offsets):
+        """Record Changed User Log Offsets."""
+        changed = [
+            (self.name, str(logfile), offset)
+            for logfile, offset in offsets.items()
+            if self._offsets.get(logfile) != offset
+        ]
+        if changed:
+            self.journal.executemany(
+                "INSERT OR REPLACE INTO offsets VALUES (?, ?, ?)", changed
+            )
+            self._offsets.update(offsets)
+
+    def offsets(self):
+        """Get Recorded User Log Offsets."""
+        rows = self.journal.query(
+            "SELECT logfile, offset FROM offsets WHERE map = ?", (self.name,)
+        )
+        self._offsets = {Path(logfile): offset for logfile, offset in rows}
+        return dict(self._offsets)
+
+    def ranges(self, config=None):
+        """Rebuild Recorded Cluster Job Ranges."""
+        statuses = defaultdict(lambda: (set(), set()))
+        for cluster, process, status in self.journal.query(
+            "SELECT cluster, process, status FROM processes WHERE map = ?",
+            (self.name,),
+        ):
+            completed, removed = statuses[cluster]
+            (removed if status == JobStatus.Removed else completed).add(process)
+        for cluster, first, count, logfile, submitter in self.journal.query(
+            "SELECT cluster, first, count, logfile, submitter FROM ranges "
+            "WHERE map = ? ORDER BY submit_time",
+            (self.name,),
+        ):
+            job_range = ClusterJobRange(
+                cluster,
+                count,
+                first,
+                config=config,
+                logfile=logfile,
+                submitter=submitter,
+            )
+            job_range.completed, job_range.removed = statuses.get(
+                cluster, (set(), set())
+            )
+            yield job_range
+
+    def jobs(self, config=None):
+        """Rebuild Recorded Jobs as (Job, Completed) Pairs."""
+        for job_id, logfile, submitter, status in self.journal.query(
+            "SELECT job_id, logfile, submitter, status FROM jobs WHERE map = ?",
+            (self.name,),
+        ):
+            job = Job(config, job_id, submitter=submitter, logfile=logfile)
+            yield job, status == JobStatus.Completed
+
+    def __repr__(self):
+        """Representation of Map Journal."""
+        return f"{type(self).__name__}({self.name!r}, {self.journal.path})"
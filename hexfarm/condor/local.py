@@ -0,0 +1,802 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/local.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+In-Process Stand-In for HTCondor.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import io
+import json
+import os
+import re
+import shlex
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import monotonic, sleep, time
+
+# -------------- External Library -------------- #
+
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..shell import ME
+from ..util import value_or
+from . import core
+from .description import parse_submit_file
+from .userlog import JobEventType, JobStatus
+
+
+__all__ = (
+    "LocalJob",
+    "LocalProcess",
+    "LocalCondor",
+    "LocalSubmitBackend",
+    "evaluate_constraint",
+)
+
+
+CONSTRAINT_TOKEN_PATTERN = re.compile(
+    r'"(?:[^"\\]|\\.)*"|=\?=|=!=|&&|\|\||!=|==|<=|>=|!|[A-Za-z_][\w.]*|[^\sA-Za-z_"]+'
+)
+
+CONSTRAINT_WORDS = {
+    "&&": " and ",
+    "||": " or ",
+    "!": " not ",
+    "=?=": "==",
+    "=!=": "!=",
+    "true": "True",
+    "false": "False",
+    "undefined": "None",
+}
+
+
+def _format_value(value):
+    """Format Attribute Value as condor_q -af Does."""
+    if value is None:
+        return "undefined"
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+class _AdNamespace(dict):
+    """Case-Insensitive ClassAd Namespace where Missing Attributes are Undefined."""
+
+    def __missing__(self, key):
+        """Look Up Attribute Case-Insensitively."""
+        for prefix in ("my.", "target."):
+            if key.lower().startswith(prefix):
+                key = key[len(prefix) :]
+        return self.get("__lower__", {}).get(key.lower())
+
+
+def _compile_constraint(constraint):
+    """Translate a ClassAd Constraint into a Python Expression."""
+    tokens = CONSTRAINT_TOKEN_PATTERN.findall(constraint)
+    out = []
+    for token in tokens:
+        word = CONSTRAINT_WORDS.get(token.lower() if token[0].isalpha() else token)
+        if word is not None:
+            out.append(word)
+        elif token[0].isalpha() or token[0] == "_":
+            out.append(f"_[{token!r}]")
+        else:
+            out.append(token)
+    return compile(" ".join(out), "<constraint>", "eval")
+
+
+def evaluate_constraint(constraint, ad):
+    """Evaluate a ClassAd Constraint against an Ad, Undefined Comparisons False."""
+    if not constraint:
+        return True
+    if isinstance(constraint, str):
+        constraint = _compile_constraint(constraint)
+    namespace = _AdNamespace(__lower__={k.lower(): v for k, v in ad.items()})
+    try:
+        return bool(eval(constraint, {"__builtins__": {}}, {"_": namespace}))
+    except TypeError:
+        return False
+
+
+class LocalJob:
+    """
+    Job of the Local Stand-In Schedd.
+
+    """
+
+    __slots__ = (
+        "cluster",
+        "process",
+        "owner",
+        "settings",
+        "status",
+        "queued",
+        "entered",
+        "started",
+        "completed",
+        "exit_code",
+        "starts",
+        "process_handle",
+        "interrupt",
+        "generation",
+    )
+
+    def __init__(self, cluster, process, owner, settings):
+        """Initialize Local Job."""
+        self.cluster = cluster
+        self.process = process
+        self.owner = owner
+        self.settings = settings
+        self.status = JobStatus.Idle
+        self.queued = self.entered = time()
+        self.started = None
+        self.completed = None
+        self.exit_code = None
+        self.starts = 0
+        self.process_handle = None
+        self.interrupt = threading.Event()
+        self.generation = 0
+
+    @property
+    def job_id(self):
+        """Get JobID."""
+        return f"{self.cluster}.{self.process}"
+
+    @property
+    def logfile(self):
+        """Get User Log of Job."""
+        return self.settings.get("log")
+
+    def ad(self):
+        """Get ClassAd of Job as a Dictionary."""
+        settings = self.settings
+        wall = None
+        if self.started is not None:
+            wall = value_or(self.completed, time()) - self.started
+        ad = {
+            "ClusterId": self.cluster,
+            "ProcId": self.process,
+            "Owner": self.owner,
+            "JobStatus": int(self.status),
+            "QDate": int(self.queued),
+            "EnteredCurrentStatus": int(self.entered),
+            "JobStartDate": None if self.started is None else int(self.started),
+            "JobCurrentStartDate": None if self.started is None else int(self.started),
+            "CompletionDate": 0 if self.completed is None else int(self.completed),
+            "RemoteWallClockTime": wall,
+            "CommittedTime": wall if self.exit_code == 0 else 0,
+            "RemoteUserCpu": 0.0,
+            "RemoteSysCpu": 0.0,
+            "NumJobStarts": self.starts,
+            "ExitCode": self.exit_code,
+            "Cmd": settings.get("executable"),
+            "Args": settings.get("arguments"),
+            "Iwd": settings.get("initialdir"),
+            "UserLog": settings.get("log"),
+            "Out": settings.get("output"),
+            "Err": settings.get("error"),
+            "RequestCpus": int(settings.get("request_cpus", 1) or 1),
+            "RequestMemory": core.parse_quantity(settings.get("request_memory", 0)),
+            "GlobalJobId": f"localhost#{self.job_id}#{int(self.queued)}",
+        }
+        for key, value in settings.items():
+            if key.startswith("+") or key.startswith("my."):
+                ad[key.split(".", 1)[-1].lstrip("+")] = value.strip('"')
+        return ad
+
+
+class LocalProcess:
+    """
+    Finished Stand-In Process Exposing the Popen Interface used for Streaming.
+
+    """
+
+    def __init__(self, result, *, universal_newlines=False, text=False, **kwargs):
+        """Initialize Local Process from a Completed Process."""
+        self.args = result.args
+        self.returncode = result.returncode
+        if universal_newlines or text:
+            self.stdout = io.StringIO(result.stdout.decode())
+            self.stderr = io.StringIO(result.stderr.decode())
+        else:
+            self.stdout = io.BytesIO(result.stdout)
+            self.stderr = io.BytesIO(result.stderr)
+
+    def wait(self, timeout=None):
+        """Get Return Code."""
+        return self.returncode
+
+    def poll(self):
+        """Get Return Code."""
+        return self.returncode
+
+    def communicate(self, input=None, timeout=None):
+        """Read Outputs."""
+        return self.stdout.read(), self.stderr.read()
+
+
+class LocalCondor:
+    """
+    In-Process Stand-In for an HTCondor Schedd, Pool and Command Line Tools.
+
+    While active, every ``condor_*`` command of this library is answered by this
+    object. Submitted jobs run on a local thread pool, either by executing their
+    executable or, with ``execute=False``, by sleeping for ``runtime`` seconds,
+    and write the same user log events as a real schedd. Removing or holding a
+    job interrupts its simulated runtime. Latencies can be added
+    to submission, queries and job start to model a busy schedd. As for
+    condor_submit, relative initial directories and executables are resolved
+    against the working directory of the submitter, not of the submit file.
+
+    """
+
+    def __init__(
+        self,
+        workers=4,
+        *,
+        execute=True,
+        runtime=0.0,
+        exit_code=0,
+        submit_latency=0.0,
+        query_latency=0.0,
+        start_latency=0.0,
+        owner=ME,
+        memory=1 << 20,
+    ):
+        """Initialize Local Condor."""
+        self.workers = workers
+        self.execute = execute
+        self.runtime = runtime
+        self.exit_code = exit_code
+        self.submit_latency = submit_latency
+        self.query_latency = query_latency
+        self.start_latency = start_latency
+        self.owner = owner
+        self.memory = memory
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._log_locks = dict()
+        self._jobs = dict()
+        self._history = []
+        self._next_cluster = 1
+        self._running = 0
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="local-condor")
+        self._stopping = threading.Event()
+        self._saved = None
+
+    # -------------- Activation -------------- #
+
+    @property
+    def is_active(self):
+        """Check if this Stand-In Answers Condor Commands."""
+        return core.CondorCommand.local is self
+
+    def activate(self):
+        """Answer Condor Commands with this Stand-In."""
+        if self.is_active:
+            return self
+        self._saved = (core.CondorCommand.local, core._DEFAULT_SUBMIT_BACKEND)
+        core.CondorCommand.local = self
+        core._DEFAULT_SUBMIT_BACKEND = core.SubprocessSubmitBackend()
+        core.QUEUE_CACHE.invalidate()
+        core.POOL_CACHE.invalidate()
+        return self
+
+    def deactivate(self):
+        """Restore Real Condor Commands."""
+        if self._saved is not None:
+            core.CondorCommand.local, core._DEFAULT_SUBMIT_BACKEND = self._saved
+            self._saved = None
+        core.QUEUE_CACHE.invalidate()
+        core.POOL_CACHE.invalidate()
+
+    def shutdown(self, *, remove=True):
+        """Remove Remaining Jobs, Stop Workers and Deactivate."""
+        self._stopping.set()
+        if remove:
+            with self._lock:
+                jobs = [job for job in self._jobs.values()]
+            for job in jobs:
+                self._remove(job, "condor_rm")
+        self._executor.shutdown(wait=True)
+        self.deactivate()
+
+    def __enter__(self):
+        """Activate Stand-In."""
+        return self.activate()
+
+    def __exit__(self, *exc_info):
+        """Shut Down Stand-In."""
+        self.shutdown()
+
+    # -------------- Command Dispatch -------------- #
+
+    def run(self, name, args):
+        """Run Condor Command by Name and Return a Completed Process."""
+        handler = getattr(self, f"_command_{name.replace('-', '_')}", None)
+        args = [str(arg) for arg in args]
+        if handler is None:
+            return self._result(name, args, 1, "", f"{name}: not simulated\n")
+        try:
+            returncode, output = handler(args)
+            return self._result(name, args, returncode, output)
+        except Exception as error:
+            return self._result(name, args, 1, "", f"ERROR: {error}\n")
+
+    @staticmethod
+    def _result(name, args, returncode, stdout, stderr=""):
+        """Build Completed Process."""
+        return subprocess.CompletedProcess(
+            [f"condor_{name}", *args], returncode, stdout.encode(), stderr.encode()
+        )
+
+    @staticmethod
+    def open(result, **kwargs):
+        """Wrap Completed Process as a Streaming Process."""
+        return LocalProcess(result, **kwargs)
+
+    # -------------- Events -------------- #
+
+    def _write_event(self, job, event_type, message, *details):
+        """Append User Log Event of Job."""
+        logfile = job.logfile
+        if not logfile:
+            return
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        text = (
+            f"{int(event_type):03d} ({job.cluster:03d}.{job.process:03d}.000) "
+            f"{stamp} {message}\n"
+            + "".join(f"\t{detail}\n" for detail in details)
+            + "...\n"
+        )
+        with self._lock:
+            lock = self._log_locks.setdefault(logfile, threading.Lock())
+        with lock:
+            with open(logfile, "a") as file:
+                file.write(text)
+
+    def _set_status(self, job, status):
+        """Set Status of Job and Wake Waiters."""
+        job.status = status
+        job.entered = time()
+        if status.is_finished:
+            job.completed = job.entered
+            self._jobs.pop(job.job_id, None)
+            self._history.append(job)
+        self._changed.notify_all()
+
+    # -------------- Execution -------------- #
+
+    def _start(self, job):
+        """Queue Job on the Worker Pool."""
+        generation = job.generation
+        self._executor.submit(self._execute, job, generation)
+
+    def _execute(self, job, generation):
+        """Run Job on a Worker."""
+        if self.start_latency:
+            self._stopping.wait(self.start_latency)
+        with self._lock:
+            if job.status != JobStatus.Idle or job.generation != generation:
+                return
+            job.interrupt = threading.Event()
+            self._set_status(job, JobStatus.Running)
+            job.started = job.entered
+            job.starts += 1
+            self._running += 1
+        self._write_event(
+            job, JobEventType.Execute, "Job executing on host: <127.0.0.1>"
+        )
+        try:
+            exit_code = self._run_job(job)
+        except Exception:
+            exit_code = 1
+        with self._lock:
+            self._running -= 1
+            if job.status != JobStatus.Running or job.generation != generation:
+                return
+            job.exit_code = exit_code
+            self._set_status(job, JobStatus.Completed)
+        self._write_event(
+            job,
+            JobEventType.JobTerminated,
+            "Job terminated.",
+            f"(1) Normal termination (return value {exit_code})",
+        )
+
+    def _run_job(self, job):
+        """Execute the Job or Simulate its Runtime and Return its Exit Code."""
+        if not self.execute:
+            runtime = self.runtime(job) if callable(self.runtime) else self.runtime
+            if runtime:
+                job.interrupt.wait(runtime)
+            return self.exit_code(job) if callable(self.exit_code) else self.exit_code
+        settings = job.settings
+        directory = Path(settings.get("initialdir", "."))
+        command = [settings["executable"], *shlex.split(settings.get("arguments", ""))]
+        outputs = []
+        for key in ("output", "error"):
+            path = settings.get(key)
+            outputs.append(open(directory / path, "w") if path else subprocess.DEVNULL)
+        try:
+            handle = subprocess.Popen(
+                command, cwd=directory, stdout=outputs[0], stderr=outputs[1]
+            )
+            job.process_handle = handle
+            return handle.wait()
+        finally:
+            job.process_handle = None
+            for output in outputs:
+                if output is not subprocess.DEVNULL:
+                    output.close()
+
+    def _stop(self, job):
+        """Kill Running Executable of Job or Interrupt its Simulated Runtime."""
+        job.interrupt.set()
+        handle = job.process_handle
+        if handle is not None:
+            handle.kill()
+
+    # -------------- Job Selection -------------- #
+
+    def _select(self, args, jobs):
+        """Select Jobs by JobIDs, Clusters, Owners, -constraint or -all."""
+        constraint, targets, select_all = None, [], False
+        args = iter(args)
+        for arg in args:
+            if arg == "-constraint":
+                constraint = _compile_constraint(next(args))
+            elif arg == "-all":
+                select_all = True
+            elif not arg.startswith("-"):
+                targets.append(arg)
+        selected = []
+        for job in jobs:
+            if targets and not any(
+                target in (job.job_id, str(job.cluster), job.owner)
+                for target in targets
+            ):
+                continue
+            if not (targets or constraint or select_all):
+                continue
+            if constraint is not None and not evaluate_constraint(constraint, job.ad()):
+                continue
+            selected.append(job)
+        return selected
+
+    def _job_action(self, args, action, verb):
+        """Apply Action to Selected Jobs."""
+        with self._lock:
+            jobs = self._select(args, list(self._jobs.values()))
+        for job in jobs:
+            action(job)
+        if not jobs:
+            return 1, f"Couldn't find/{verb} all jobs matching constraint\n"
+        return 0, "".join(f"Job {job.job_id} marked for {verb}\n" for job in jobs)
+
+    def _remove(self, job, tool):
+        """Remove Job."""
+        with self._lock:
+            if job.status.is_finished:
+                return
+            job.generation += 1
+            self._stop(job)
+            self._set_status(job, JobStatus.Removed)
+        self._write_event(
+            job, JobEventType.JobAborted, "Job was aborted.", f"via {tool}"
+        )
+
+    def _hold(self, job):
+        """Hold Job."""
+        with self._lock:
+            if job.status in (JobStatus.Held,) or job.status.is_finished:
+                return
+            job.generation += 1
+            self._stop(job)
+            self._set_status(job, JobStatus.Held)
+        self._write_event(job, JobEventType.JobHeld, "Job was held.", "via condor_hold")
+
+    def _release(self, job):
+        """Release Held Job."""
+        with self._lock:
+            if job.status != JobStatus.Held:
+                return
+            job.generation += 1
+            self._set_status(job, JobStatus.Idle)
+            self._start(job)
+        self._write_event(job, JobEventType.JobReleased, "Job was released.")
+
+    # -------------- Output Formatting -------------- #
+
+    @staticmethod
+    def _format_ads(ads, args):
+        """Format Ads for -af, -af:t or -json Output."""
+        args = list(args)
+        if "-json" in args:
+            attributes = None
+            if "-attributes" in args:
+                attributes = args[args.index("-attributes") + 1].split(",")
+            if attributes:
+                ads = [
+                    {a: ad.get(a) for a in attributes if ad.get(a) is not None}
+                    for ad in ads
+                ]
+            return json.dumps(ads, indent=0) + "\n"
+        for flag in ("-af:t", "-af", "-autoformat"):
+            if flag in args:
+                start = args.index(flag) + 1
+                attributes = []
+                for arg in args[start:]:
+                    if arg.startswith("-"):
+                        break
+                    attributes.append(arg)
+                separator = "\t" if flag == "-af:t" else " "
+                return "".join(
+                    separator.join(_format_value(ad.get(a)) for a in attributes) + "\n"
+                    for ad in ads
+                )
+        return "".join(
+            f"{ad['ClusterId']}.{ad['ProcId']} {ad['Owner']}\n" for ad in ads
+        )
+
+    @staticmethod
+    def _option(args, name, default=None):
+        """Get Value of Command Line Option."""
+        if name in args:
+            return args[args.index(name) + 1]
+        return default
+
+    # -------------- Commands -------------- #
+
+    def _command_submit(self, args):
+        """Simulate condor_submit."""
+        if self.submit_latency:
+            sleep(self.submit_latency)
+        path = Path(next(arg for arg in args if not arg.startswith("-"))).abspath()
+        description = parse_submit_file(path)
+        with self._lock:
+            first_cluster = self._next_cluster
+            self._next_cluster += description.cluster_count
+        clusters = dict()
+        cwd = Path.getcwd()
+        for cluster, process, settings in description.iter_procs(first_cluster):
+            directory = (cwd / settings.get("initialdir", ".")).abspath()
+            settings["initialdir"] = str(directory)
+            if settings.get("executable"):
+                executable = (cwd / settings["executable"]).abspath()
+                settings["executable"] = str(executable)
+            if settings.get("log"):
+                settings["log"] = str((directory / settings["log"]).abspath())
+            job = LocalJob(cluster, process, self.owner, settings)
+            clusters.setdefault(cluster, []).append(job)
+        lines = ["Submitting job(s)."]
+        for cluster, jobs in clusters.items():
+            with self._lock:
+                for job in jobs:
+                    self._jobs[job.job_id] = job
+            for job in jobs:
+                self._write_event(
+                    job,
+                    JobEventType.Submit,
+                    "Job submitted from host: <127.0.0.1:9618>",
+                )
+            with self._lock:
+                for job in jobs:
+                    self._start(job)
+            lines.append(f"{len(jobs)} job(s) submitted to cluster {cluster}.")
+        return 0, "\n".join(lines) + "\n"
+
+    def _query_latency(self):
+        """Sleep for Query Latency."""
+        if self.query_latency:
+            sleep(self.query_latency)
+
+    def _command_q(self, args):
+        """Simulate condor_q."""
+        self._query_latency()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        select_args = self._query_selection(args)
+        jobs = self._select(select_args, jobs) if select_args else jobs
+        return 0, self._format_ads([job.ad() for job in jobs], args)
+
+    @staticmethod
+    def _query_selection(args):
+        """Get Selection Arguments of a Query before any Formatting Option."""
+        out, args = [], iter(args)
+        for arg in args:
+            if arg == "-constraint":
+                out.extend((arg, next(args)))
+            elif arg in ("-af:t", "-af", "-autoformat", "-json"):
+                break
+            elif arg in ("-attributes", "-limit", "-completedsince"):
+                next(args)
+            elif not arg.startswith("-"):
+                out.append(arg)
+        return out
+
+    def _command_history(self, args):
+        """Simulate condor_history."""
+        self._query_latency()
+        since = float(self._option(args, "-completedsince", 0))
+        limit = self._option(args, "-limit")
+        with self._lock:
+            jobs = [job for job in reversed(self._history) if job.completed > since]
+        select_args = self._query_selection(args)
+        jobs = self._select(select_args, jobs) if select_args else jobs
+        if limit is not None:
+            jobs = jobs[: int(limit)]
+        return 0, self._format_ads([job.ad() for job in jobs], args)
+
+    def _command_status(self, args):
+        """Simulate condor_status with one Partitionable Slot for the Workers."""
+        self._query_latency()
+        with self._lock:
+            free = self.workers - self._running
+        slot = {
+            "Name": "slot1@localhost",
+            "SlotType": "Partitionable",
+            "State": "Unclaimed",
+            "Activity": "Idle",
+            "Cpus": free,
+            "Memory": self.memory * free // self.workers,
+            "Disk": 1 << 30,
+            "GPUs": None,
+        }
+        return 0, self._format_ads([slot], args)
+
+    def _command_rm(self, args):
+        """Simulate condor_rm."""
+        return self._job_action(
+            args, lambda job: self._remove(job, "condor_rm"), "removal"
+        )
+
+    def _command_hold(self, args):
+        """Simulate condor_hold."""
+        return self._job_action(args, self._hold, "hold")
+
+    def _command_release(self, args):
+        """Simulate condor_release."""
+        return self._job_action(args, self._release, "release")
+
+    def _command_wait(self, args):
+        """Simulate condor_wait on the Jobs Written to a User Log."""
+        timeout = self._option(args, "-wait")
+        positional = [
+            arg
+            for index, arg in enumerate(args)
+            if not arg.startswith("-") and (index == 0 or args[index - 1] != "-wait")
+        ]
+        logfile = str(Path(positional[0]).abspath())
+        job_id = positional[1] if len(positional) > 1 else None
+        deadline = None if timeout is None else monotonic() + float(timeout)
+
+        def _pending():
+            return [
+                job
+                for job in self._jobs.values()
+                if job.logfile
+                and str(Path(job.logfile).abspath()) == logfile
+                and (job_id is None or job_id in (job.job_id, str(job.cluster)))
+            ]
+
+        with self._lock:
+            while _pending():
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    return 1, "Time expired.\n"
+                self._changed.wait(remaining)
+        return 0, "All jobs done.\n"
+
+    # -------------- Introspection -------------- #
+
+    @property
+    def jobs(self):
+        """Get Jobs in the Queue."""
+        with self._lock:
+            return dict(self._jobs)
+
+    @property
+    def history(self):
+        """Get Finished Jobs in Completion Order."""
+        with self._lock:
+            return list(self._history)
+
+    def wait_idle(self, timeout=None):
+        """Wait until the Queue is Empty and Return True if it Emptied."""
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._lock:
+            while self._jobs:
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def __repr__(self):
+        """Representation of Local Condor."""
+        return (
+            f"{type(self).__name__}(workers={self.workers}, "
+            f"{len(self._jobs)} queued, {len(self._history)} finished)"
+        )
+
+
+class LocalSubmitBackend(core.SubmitBackend):
+    """
+    Job Submission Backend Running Jobs on this Machine.
+
+    Submissions are handed to a :class:`LocalCondor` which runs the executable of
+    each job with at most one job per worker, one worker per core by default.
+    Submitting does not change which commands answer condor queries. Use the
+    backend as a context manager to activate the stand-in, so the returned jobs
+    can be followed by Job, JobMap and queue queries exactly like scheduled ones,
+    and to restore the previous commands afterwards.
+
+    """
+
+    def __init__(self, workers=None, directory=None, *, condor=None):
+        """Initialize Local Backend."""
+        if condor is None:
+            condor = LocalCondor(value_or(workers, os.cpu_count()))
+        self.condor = condor
+        self._files = core.SubprocessSubmitBackend(directory)
+
+    @property
+    def directory(self):
+        """Get Directory of Content-Addressed Submit Files."""
+        return self._files.directory
+
+    def submit(self, config, path=None, *args, **kwargs):
+        """Run Configuration Locally and Return Job Id Triples."""
+        with self._files.submit_file(config, path) as submit_path:
+            result = self.condor.run("submit", [submit_path, *args])
+        if result.returncode:
+            raise subprocess.CalledProcessError(
+                result.returncode, result.args, result.stdout, result.stderr
+            )
+        return tuple(core.extract_job_ranges(result.stdout.decode()))
+
+    def shutdown(self, *, remove=True):
+        """Shut Down the Local Stand-In."""
+        self.condor.shutdown(remove=remove)
+
+    def __enter__(self):
+        """Activate Stand-In."""
+        self.condor.activate()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Shut Down Stand-In and Restore the Previous Commands."""
+        self.shutdown()
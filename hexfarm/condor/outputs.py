@@ -0,0 +1,484 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/outputs.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Job Output Collection and Merging for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import logging
+import re
+import shutil
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import count
+
+# -------------- External Library -------------- #
+
+import h5py
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..util import try_import, value_or
+from .callbacks import default_completion_watcher
+from .core import ClusterJobRange, split_job_id
+from .userlog import JobStatus
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+pyarrow_parquet, PYARROW_SUPPORT = try_import("pyarrow.parquet", log_error=LOGGER.info)
+
+uproot, UPROOT_SUPPORT = try_import("uproot", log_error=LOGGER.info)
+
+
+__all__ = (
+    "PYARROW_SUPPORT",
+    "UPROOT_SUPPORT",
+    "OUTPUT_KEYS",
+    "ROOT_HISTOGRAM_CLASSES",
+    "merge_hdf5",
+    "merge_parquet",
+    "merge_root_histograms",
+    "OUTPUT_MERGERS",
+    "job_output_paths",
+    "merged_name",
+    "OutputCollector",
+)
+
+
+OUTPUT_KEYS = ("output", "transfer_output_files")
+
+
+ROOT_HISTOGRAM_CLASSES = ("TH1", "TH2", "TH3")
+
+
+def _append_dataset(target, name, item):
+    """Append HDF5 Dataset along its First Axis, Creating it if Missing."""
+    if not isinstance(item, h5py.Dataset):
+        return
+    if name not in target:
+        maxshape = (None, *item.shape[1:]) if item.shape else None
+        dataset = target.create_dataset(
+            name, data=item[()], maxshape=maxshape, chunks=True if maxshape else None
+        )
+        dataset.attrs.update(item.attrs)
+    elif item.shape:
+        dataset = target[name]
+        size = dataset.shape[0]
+        dataset.resize(size + item.shape[0], axis=0)
+        dataset[size:] = item[()]
+
+
+def merge_hdf5(inputs, output):
+    """Concatenate Datasets of HDF5 Files along their First Axis."""
+    with h5py.File(output, "w") as target:
+        for path in inputs:
+            with h5py.File(path, "r") as source:
+                source.visititems(partial(_append_dataset, target))
+    return output
+
+
+def merge_parquet(inputs, output):
+    """Concatenate Parquet Tables."""
+    if not PYARROW_SUPPORT:
+        raise ImportError("Merging Parquet outputs requires pyarrow.")
+    writer = None
+    try:
+        for path in inputs:
+            table = pyarrow_parquet.read_table(path)
+            if writer is None:
+                writer = pyarrow_parquet.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output
+
+
+def merge_root_histograms(inputs, output):
+    """
+    Sum Histograms of ROOT Files, Skipping Other Objects.
+
+    Histograms are read and written with uproot 4 or later through
+    boost-histogram. Histogram classes without a boost-histogram form, such as
+    TH2Poly, are left out of the merge with a warning.
+
+    """
+    if not UPROOT_SUPPORT:
+        raise ImportError("Merging ROOT outputs requires uproot.")
+    totals = dict()
+    skipped = set()
+    for path in inputs:
+        with uproot.open(path) as source:
+            for name, classname in source.classnames(cycle=False).items():
+                if name in skipped or not classname.startswith(ROOT_HISTOGRAM_CLASSES):
+                    continue
+                try:
+                    histogram = source[name].to_boost()
+                except (AttributeError, NotImplementedError, TypeError, ValueError):
+                    LOGGER.warning(
+                        "Skipping %s %s, it cannot be merged.", classname, name
+                    )
+                    skipped.add(name)
+                    totals.pop(name, None)
+                    continue
+                totals[name] = totals[name] + histogram if name in totals else histogram
+    with uproot.recreate(output) as target:
+        for name, histogram in totals.items():
+            target[name] = histogram
+    return output
+
+
+OUTPUT_MERGERS = {
+    ".h5": merge_hdf5,
+    ".hdf5": merge_hdf5,
+    ".parquet": merge_parquet,
+    ".root": merge_root_histograms,
+}
+
+
+def _output_remaps(value):
+    """Parse Transfer Output Remaps into a Mapping."""
+    remaps = dict()
+    for pair in value_or(value, "").strip().strip('"').split(";"):
+        name, _, remap = pair.partition("=")
+        if name.strip() and remap.strip():
+            remaps[name.strip()] = remap.strip()
+    return remaps
+
+
+def job_output_paths(settings, directory=".", keys=OUTPUT_KEYS):
+    """
+    Get Output Paths of a Process from its Expanded Settings.
+
+    Paths are resolved the way they come back from the execute node: relative to
+    the initial directory, with transferred files under their base name unless
+    they are remapped. Returns a tuple of (key, index, path).
+
+    """
+    initialdir = Path(directory) / value_or(settings.get("initialdir"), ".")
+    remaps = _output_remaps(settings.get("transfer_output_remaps"))
+    paths = []
+    for key in keys:
+        value = settings.get(key)
+        if not value:
+            continue
+        if key == "transfer_output_files":
+            for index, name in enumerate(
+                filter(None, map(str.strip, value.split(",")))
+            ):
+                target = remaps.get(Path(name).name, Path(name).name)
+                paths.append((key, index, initialdir / target))
+        else:
+            paths.append((key, 0, initialdir / value))
+    return tuple(paths)
+
+
+def merged_name(template):
+    """Name of the Merged Output for a Submit Path Template."""
+    name = re.sub(r"[-_.]?\$\([^)]*\)", "", Path(template).name)
+    return f"merged{name}" if not name or name.startswith(".") else name
+
+
+class _MergeGroup:
+    """
+    Tree Reduction of the Outputs with a Common Template.
+
+    Files are merged as soon as ``fan_in`` of them are waiting at the same level,
+    and the result is queued one level up, so every byte is rewritten once per
+    level and at most ``fan_in - 1`` files per level are left for the final merge.
+
+    """
+
+    def __init__(self, collector, template, merge):
+        """Initialize Merge Group."""
+        self.collector = collector
+        self.template = template
+        self.merge = merge
+        self.name = merged_name(template)
+        self.inputs = []
+        self.levels = defaultdict(list)
+        self.running = set()
+        self.errors = []
+        self._counter = count()
+        self._lock = threading.RLock()
+
+    def add(self, path):
+        """Add Output of a Finished Job."""
+        with self._lock:
+            self.inputs.append(path)
+            if self.merge is not None:
+                self._queue(0, path)
+
+    def _queue(self, level, path):
+        """Queue File at Level and Start a Merge if Enough are Waiting."""
+        waiting = self.levels[level]
+        waiting.append(path)
+        if len(waiting) >= self.collector.fan_in:
+            batch = tuple(waiting)
+            waiting.clear()
+            self._start(level + 1, batch)
+
+    def _start(self, level, batch):
+        """Merge Batch on the Pool into an Intermediate File."""
+        name = Path(self.name)
+        output = self.collector.workdir / (
+            f"{name.stem}.{level}.{next(self._counter)}{name.ext}"
+        )
+        future = self.collector.executor.submit(self.merge, batch, output)
+        self.running.add(future)
+        future.add_done_callback(partial(self._merged, level, batch))
+
+    def _merged(self, level, batch, future):
+        """Queue Result of an Intermediate Merge."""
+        with self._lock:
+            self.running.discard(future)
+            error = future.exception()
+            if error is not None:
+                LOGGER.error("Merging %s failed: %r", self.name, error)
+                self.errors.append(error)
+                return
+            self._remove_intermediates(batch)
+            self._queue(level, future.result())
+
+    def _remove_intermediates(self, paths):
+        """Delete Intermediate Files, Leaving Job Outputs in Place."""
+        for path in paths:
+            if Path(path).parent == self.collector.workdir:
+                Path(path).remove_p()
+
+    def finish(self, destination):
+        """Wait for Running Merges and Merge what is Left into the Destination."""
+        while True:
+            with self._lock:
+                running = tuple(self.running)
+            if not running:
+                break
+            wait(running)
+        if self.errors:
+            raise self.errors[0]
+        remaining = [
+            path for level in sorted(self.levels) for path in self.levels[level]
+        ]
+        self.levels.clear()
+        if not remaining:
+            return None
+        output = Path(destination) / self.name
+        if len(remaining) == 1 and Path(remaining[0]).parent == self.collector.workdir:
+            shutil.move(remaining[0], output)
+        elif len(remaining) == 1:
+            shutil.copyfile(remaining[0], output)
+        else:
+            self.merge(remaining, output)
+            self._remove_intermediates(remaining)
+        return output
+
+    def __repr__(self):
+        """Representation of Merge Group."""
+        return f"{type(self).__name__}({self.template!r}, {len(self.inputs)} inputs)"
+
+
+class OutputCollector:
+    """
+    Incremental Collection and Merging of Job Outputs.
+
+    Each finished job's ``output`` and ``transfer_output_files`` are found from
+    its submit description, and the files of each output template are merged
+    in the background as jobs finish: HDF5 datasets and Parquet tables are
+    concatenated and ROOT histograms are summed. Merges run on a bounded pool
+    as a tree of ``fan_in`` files, so once the last job finishes only a small
+    final merge is left for ``finish``. Files without a merger are gathered but
+    left in place.
+
+    Jobs are handed over by a completion watcher, either from ``add`` or from a
+    ConfigRunner given the collector as its ``outputs``. With ``only_successful``
+    the outputs of jobs which were removed or exited with a nonzero return value
+    are left out, as are those of jobs without a user log, whose outcome is not
+    known.
+
+    """
+
+    def __init__(
+        self,
+        destination,
+        *,
+        mergers=None,
+        keys=OUTPUT_KEYS,
+        fan_in=16,
+        watcher=None,
+        executor=None,
+        max_workers=4,
+        use_processes=False,
+        workdir=None,
+        only_successful=True,
+    ):
+        """Initialize Output Collector."""
+        self.destination = Path(destination).abspath()
+        self.only_successful = only_successful
+        self.mergers = value_or(mergers, OUTPUT_MERGERS)
+        self.keys = keys
+        self.fan_in = max(int(fan_in), 2)
+        self.watcher = value_or(watcher, default_completion_watcher())
+        if executor is None:
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            executor = pool(max_workers)
+        self.executor = executor
+        self.workdir = Path(value_or(workdir, self.destination / ".partial")).abspath()
+        self.destination.makedirs_p()
+        self.workdir.makedirs_p()
+        self.groups = dict()
+        self.futures = []
+        self._first_clusters = dict()
+        self._outputs = dict()
+        self._lock = threading.Lock()
+
+    def add(self, *jobs):
+        """Collect Outputs of Jobs or Cluster Job Ranges when they Finish."""
+        first_clusters = dict()
+        for job in jobs:
+            if isinstance(job, ClusterJobRange):
+                first = first_clusters.setdefault(id(job.config), job.cluster)
+                self._first_clusters[job.cluster] = first
+        self.futures.extend(self.watcher.register(job, self.collect) for job in jobs)
+        return self
+
+    def add_map(self, jobmap):
+        """Collect Outputs of every Job of a Job Map when they Finish."""
+        self.futures.extend(jobmap.when_complete(self.collect, watcher=self.watcher))
+        return self
+
+    def _cluster_outputs(self, config, cluster):
+        """Resolve Output Paths of every Process of a Cluster."""
+        description = config.description
+        first = self._first_clusters.get(cluster, cluster)
+        outputs = dict()
+        for proc_cluster, process, settings in description.iter_procs(first):
+            if proc_cluster > cluster:
+                break
+            if proc_cluster == cluster:
+                outputs[process] = job_output_paths(
+                    settings, description.directory, self.keys
+                )
+        templates = {
+            key: description.get(key) for key in self.keys if description.get(key)
+        }
+        return outputs, templates
+
+    def outputs(self, job):
+        """Get (Template, Path) of each Output of a Job."""
+        cluster, process = split_job_id(job.job_id)
+        with self._lock:
+            if cluster not in self._outputs:
+                self._outputs[cluster] = self._cluster_outputs(job.config, cluster)
+            outputs, templates = self._outputs[cluster]
+            paths = outputs.pop(process, ())
+            if not outputs:
+                del self._outputs[cluster]
+        result = []
+        for key, index, path in paths:
+            items = templates.get(key, "").split(",")
+            template = items[index].strip() if index < len(items) else path.name
+            result.append((template, path))
+        return tuple(result)
+
+    def _group(self, template, path):
+        """Get Merge Group of a Template, Creating it on First Use."""
+        with self._lock:
+            if template not in self.groups:
+                merge = self.mergers.get(Path(path).ext.lower())
+                self.groups[template] = _MergeGroup(self, template, merge)
+            return self.groups[template]
+
+    def succeeded(self, job):
+        """Check if Job Completed with Return Value Zero."""
+        status, return_value = self.watcher.outcome(job.job_id)
+        return status == JobStatus.Completed and return_value == 0
+
+    def collect(self, job):
+        """Gather the Outputs of a Finished Job and Queue them for Merging."""
+        outputs = self.outputs(job)
+        if self.only_successful and not self.succeeded(job):
+            LOGGER.info("Skipping outputs of unsuccessful %s.", job)
+            return ()
+        collected = []
+        for template, path in outputs:
+            if not path.exists():
+                LOGGER.warning("Output %s of %s is missing.", path, job)
+                continue
+            self._group(template, path).add(path)
+            collected.append(path)
+        return tuple(collected)
+
+    def finish(self, timeout=None):
+        """
+        Wait for Registered Jobs and Merges, then Write the Merged Outputs.
+
+        Returns the merged path of each template with a merger. Jobs which have
+        not finished within the timeout are left out of the merge.
+
+        """
+        _, not_done = wait(self.futures, timeout=timeout)
+        if not_done:
+            LOGGER.warning(
+                "Merging without %d unfinished registrations.", len(not_done)
+            )
+        with self._lock:
+            groups = tuple(self.groups.values())
+        merged = dict()
+        for group in groups:
+            if group.merge is not None:
+                merged[group.template] = group.finish(self.destination)
+        return merged
+
+    def gathered(self):
+        """Get Collected Paths of each Output Template."""
+        with self._lock:
+            return {template: tuple(g.inputs) for template, g in self.groups.items()}
+
+    def shutdown(self, *, wait=True):
+        """Shut Down the Merge Pool."""
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        """Enter Output Collector Context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Shut Down Output Collector."""
+        self.shutdown()
+
+    def __repr__(self):
+        """Representation of Output Collector."""
+        return f"{type(self).__name__}({self.destination}, {len(self.groups)} outputs)"
@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/query.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Queue Query Utilities for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import json
+import subprocess
+import threading
+from array import array
+from concurrent.futures import Future
+from time import monotonic
+
+# -------------- External Library -------------- #
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = (
+    "JOB_ID_ATTRIBUTES",
+    "parse_classad_value",
+    "iter_autoformat",
+    "iter_json_ads",
+    "iter_ad_records",
+    "check_stream",
+    "JobColumns",
+    "QueueSnapshot",
+    "CachedQuery",
+    "QueueCache",
+    "SLOT_ATTRIBUTES",
+    "PoolSnapshot",
+    "PoolCache",
+)
+
+
+JOB_ID_ATTRIBUTES = ("ClusterId", "ProcId")
+
+
+def parse_classad_value(text):
+    """Parse Autoformatted ClassAd Value."""
+    if text == "undefined":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if text in ("true", "false"):
+        return text == "true"
+    return text
+
+
+def iter_autoformat(lines, attribute_count, separator="\t"):
+    """Iterate over Records of Tab-Separated Autoformat (-af:t) Output."""
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line:
+            continue
+        fields = line.split(separator, attribute_count - 1)
+        if len(fields) != attribute_count:
+            continue
+        yield tuple(map(parse_classad_value, fields))
+
+
+def iter_json_ads(chunks, decoder=json.JSONDecoder()):
+    """Iterate over ClassAds of a Streamed JSON (-json) Array."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in "[],\n\r\t ":
+                position += 1
+            if position == len(buffer):
+                break
+            try:
+                ad, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                break
+            yield ad
+        buffer = buffer[position:]
+
+
+def iter_ad_records(ads, attributes):
+    """Project ClassAds onto Tuples of Attributes."""
+    for ad in ads:
+        yield tuple(ad.get(attribute) for attribute in attributes)
+
+
+def check_stream(process, returncode):
+    """Raise if a Fully Streamed Query Command Exited with a Nonzero Status."""
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, process.args)
+
+
+class _Column:
+    """
+    Compact Column Builder.
+
+    Integer columns are stored in typed arrays, and become floating point on the
+    first non-integer number or missing value. Any string makes the column
+    categorical.
+
+    """
+
+    __slots__ = ("kind", "values", "codes", "categories", "missing")
+
+    def __init__(self):
+        """Initialize Column."""
+        self.kind = "q"
+        self.values = array("q")
+        self.codes = None
+        self.categories = None
+        self.missing = 0
+
+    def _to_float(self):
+        """Promote Integer Column to Floating Point."""
+        self.kind = "d"
+        self.values = array("d", self.values)
+
+    def _to_category(self):
+        """Promote Numeric Column to Categorical."""
+        self.categories = dict()
+        self.codes = array("i")
+        for value in self.values:
+            self._append_category(
+                None if self.kind == "d" and value != value else value
+            )
+        self.kind = "c"
+        self.values = None
+
+    def _append_category(self, value):
+        """Append Categorical Value."""
+        if value is None:
+            self.codes.append(-1)
+        else:
+            self.codes.append(self.categories.setdefault(value, len(self.categories)))
+
+    def append(self, value):
+        """Append Value to Column."""
+        if self.kind == "c":
+            return self._append_category(value)
+        if value is None:
+            if self.kind == "q":
+                self._to_float()
+            self.values.append(float("nan"))
+        elif isinstance(value, (bool, str)) or not isinstance(value, (int, float)):
+            self._to_category()
+            self._append_category(value)
+        elif isinstance(value, float) and self.kind == "q":
+            self._to_float()
+            self.values.append(value)
+        else:
+            self.values.append(value)
+
+    def to_numpy(self):
+        """Convert Column to NumPy Array."""
+        if self.kind == "c":
+            categories = np.array(list(self.categories), dtype=object)
+            codes = np.array(self.codes, dtype=np.int32)
+            out = np.empty(len(codes), dtype=object)
+            out[codes >= 0] = categories[codes[codes >= 0]]
+            return out
+        return np.array(self.values, dtype=np.int64 if self.kind == "q" else float)
+
+    def to_pandas(self):
+        """Convert Column to Pandas Compatible Array."""
+        if self.kind == "c":
+            return pd.Categorical.from_codes(
+                np.array(self.codes, dtype=np.int32), list(self.categories)
+            )
+        return self.to_numpy()
+
+
+class JobColumns:
+    """
+    Columnar Store of Queried Job Attributes Keyed by (Cluster, Process).
+
+    """
+
+    def __init__(self, attributes):
+        """Initialize Job Columns."""
+        self.attributes = tuple(attributes)
+        self._cluster = array("q")
+        self._process = array("q")
+        self._columns = tuple(_Column() for _ in self.attributes)
+
+    @classmethod
+    def from_records(cls, records, attributes):
+        """Build Columns from Records Starting with ClusterId and ProcId."""
+        columns = cls(attributes)
+        columns.extend(records)
+        return columns
+
+    def append(self, record):
+        """Append Record Starting with ClusterId and ProcId."""
+        cluster, process, *values = record
+        self._cluster.append(cluster)
+        self._process.append(process)
+        for column, value in zip(self._columns, values):
+            column.append(value)
+
+    def extend(self, records):
+        """Extend Columns by Records."""
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        """Number of Jobs."""
+        return len(self._cluster)
+
+    @property
+    def cluster(self):
+        """Get Cluster Ids."""
+        return np.array(self._cluster, dtype=np.int64)
+
+    @property
+    def process(self):
+        """Get Process Ids."""
+        return np.array(self._process, dtype=np.int64)
+
+    def column(self, attribute):
+        """Get Column of Attribute."""
+        return self._columns[self.attributes.index(attribute)].to_numpy()
+
+    def to_numpy(self):
+        """Convert to NumPy Structured Array."""
+        columns = [column.to_numpy() for column in self._columns]
+        dtype = [("cluster", np.int64), ("process", np.int64)] + [
+            (name, column.dtype) for name, column in zip(self.attributes, columns)
+        ]
+        out = np.empty(len(self), dtype=dtype)
+        out["cluster"] = self.cluster
+        out["process"] = self.process
+        for name, column in zip(self.attributes, columns):
+            out[name] = column
+        return out
+
+    def to_pandas(self):
+        """Convert to Pandas DataFrame with a (Cluster, Process) Index."""
+        index = pd.MultiIndex.from_arrays(
+            (self.cluster, self.process), names=("cluster", "process")
+        )
+        return pd.DataFrame(
+            {
+                name: column.to_pandas()
+                for name, column in zip(self.attributes, self._columns)
+            },
+            index=index,
+        )
+
+    def __repr__(self):
+        """Representation of Job Columns."""
+        return f"{type(self).__name__}({len(self)} jobs, {list(self.attributes)})"
+
+
+class QueueSnapshot:
+    """
+    Snapshot of the Jobs in a Condor Queue.
+
+    """
+
+    def __init__(self, user_jobs=None, timestamp=None):
+        """Initialize Queue Snapshot from a Mapping of Users to Job Ids."""
+        self._user_jobs = {
+            user: frozenset(job_ids) for user, job_ids in (user_jobs or {}).items()
+        }
+        self._owners = {
+            job_id: user
+            for user, job_ids in self._user_jobs.items()
+            for job_id in job_ids
+        }
+        self.timestamp = monotonic() if timestamp is None else timestamp
+
+    @property
+    def users(self):
+        """Get Users with Jobs in the Queue."""
+        return frozenset(self._user_jobs)
+
+    @property
+    def job_ids(self):
+        """Get All Job Ids in the Queue."""
+        return self._owners.keys()
+
+    def jobs_of(self, user):
+        """Get Job Ids of User."""
+        return self._user_jobs.get(user, frozenset())
+
+    def owner_of(self, job_id):
+        """Get Owner of Job."""
+        return self._owners[job_id]
+
+    def as_dict(self):
+        """Get Mapping of Users to Lists of Job Ids."""
+        return {user: list(job_ids) for user, job_ids in self._user_jobs.items()}
+
+    def __contains__(self, job_id):
+        """Check if Job is in the Queue."""
+        return job_id in self._owners
+
+    def __len__(self):
+        """Number of Jobs in the Queue."""
+        return len(self._owners)
+
+    def __iter__(self):
+        """Iterate over Job Ids."""
+        return iter(self._owners)
+
+    def __repr__(self):
+        """Representation of Queue Snapshot."""
+        return f"{type(self).__name__}({len(self)} jobs, users={sorted(self.users)})"
+
+
+class CachedQuery:
+    """
+    Time-to-Live Cached Query.
+
+    Concurrent callers that find the cache stale share a single in-flight call to
+    the underlying query instead of issuing their own.
+
+    """
+
+    def __init__(self, query, ttl, *, clock=monotonic):
+        """Initialize Cached Query."""
+        self.query = query
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending = None
+        self._value = None
+        self._timestamp = None
+        self._generation = 0
+
+    @property
+    def age(self):
+        """Get Age of Cached Value."""
+        if self._timestamp is None:
+            return None
+        return self.clock() - self._timestamp
+
+    def is_fresh(self, max_age=None):
+        """Check if Cached Value is Younger than Maximum Age."""
+        age = self.age
+        return age is not None and age <= (self.ttl if max_age is None else max_age)
+
+    def invalidate(self):
+        """Invalidate Cached Value."""
+        with self._lock:
+            self._timestamp = None
+            self._generation += 1
+
+    def get(self, max_age=None):
+        """Get Cached Value or Run the Query."""
+        with self._lock:
+            if self.is_fresh(max_age):
+                return self._value
+            pending, owner = self._pending, self._pending is None
+            if owner:
+                pending = self._pending = Future()
+            generation = self._generation
+        if not owner:
+            return pending.result()
+        try:
+            value = self.query()
+        except BaseException as error:
+            with self._lock:
+                self._pending = None
+            pending.set_exception(error)
+            raise
+        with self._lock:
+            if generation == self._generation:
+                self._value, self._timestamp = value, self.clock()
+            self._pending = None
+        pending.set_result(value)
+        return value
+
+
+class QueueCache:
+    """
+    Shared Cache of Queue Snapshots Keyed by User Names.
+
+    """
+
+    def __init__(self, query, ttl):
+        """Initialize Queue Cache."""
+        self.query = query
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._queries = dict()
+
+    @property
+    def ttl(self):
+        """Get Time-to-Live of Cached Snapshots."""
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value):
+        """Set Time-to-Live of Cached Snapshots."""
+        self._ttl = value
+        with self._lock:
+            for query in self._queries.values():
+                query.ttl = value
+
+    def _cached_query(self, usernames):
+        """Get Cached Query for User Names."""
+        key = tuple(sorted(set(usernames)))
+        with self._lock:
+            if key not in self._queries:
+                self._queries[key] = CachedQuery(
+                    lambda: QueueSnapshot(self.query(*key)), self._ttl
+                )
+            return self._queries[key]
+
+    def snapshot(self, *usernames, max_age=None):
+        """Get Queue Snapshot for User Names."""
+        return self._cached_query(usernames).get(max_age=max_age)
+
+    def invalidate(self):
+        """Invalidate All Cached Snapshots."""
+        with self._lock:
+            queries = tuple(self._queries.values())
+        for query in queries:
+            query.invalidate()
+
+
+SLOT_ATTRIBUTES = ("SlotType", "State", "Cpus", "Memory", "Disk", "GPUs")
+
+
+class PoolSnapshot:
+    """
+    Snapshot of the Slots of a Condor Pool.
+
+    Slot resources are kept as arrays, with memory in megabytes and disk in
+    kilobytes as in the machine ClassAds. Only unclaimed slots are free, and
+    static slots start at most one job while partitionable slots are carved up.
+
+    """
+
+    def __init__(self, records=(), timestamp=None):
+        """Initialize Pool Snapshot from (SlotType, State, Cpus, Memory, Disk, GPUs)."""
+        records = list(records)
+        slot_types = np.array([record[0] for record in records], dtype=object)
+        states = np.array([record[1] for record in records], dtype=object)
+        self.partitionable = slot_types == "Partitionable"
+        self.free = states == "Unclaimed"
+        self.cpus, self.memory, self.disk, self.gpus = (
+            np.array([record[index] or 0 for record in records], dtype=np.int64)
+            for index in range(2, 6)
+        )
+        self.timestamp = monotonic() if timestamp is None else timestamp
+
+    def _resources(self, cpus, memory, disk, gpus):
+        """Pair Slot Resources with Requested Amounts."""
+        return (
+            (self.cpus, cpus),
+            (self.memory, memory),
+            (self.disk, disk),
+            (self.gpus, gpus),
+        )
+
+    def slot_capacity(self, cpus=1, memory=0, disk=0, gpus=0):
+        """Get Number of Jobs with the Requested Resources each Slot can Start."""
+        fits = np.where(self.free, np.iinfo(np.int64).max, 0)
+        for available, needed in self._resources(cpus, memory, disk, gpus):
+            if needed:
+                fits = np.minimum(fits, available // needed)
+        return np.where(self.partitionable, fits, np.minimum(fits, 1))
+
+    def capacity(self, cpus=1, memory=0, disk=0, gpus=0):
+        """Get Number of Jobs with the Requested Resources the Pool can Start."""
+        return int(self.slot_capacity(cpus, memory, disk, gpus).sum())
+
+    def reserve(self, count, cpus=1, memory=0, disk=0, gpus=0):
+        """Get Snapshot with Resources for Count Jobs Taken Greedily from Slots."""
+        fits = self.slot_capacity(cpus, memory, disk, gpus)
+        taken = np.clip(count - (np.cumsum(fits) - fits), 0, fits)
+        out = object.__new__(type(self))
+        out.__dict__.update(self.__dict__)
+        out.free = self.free & ~(~self.partitionable & (taken > 0))
+        out.cpus, out.memory, out.disk, out.gpus = (
+            available - taken * needed
+            for available, needed in self._resources(cpus, memory, disk, gpus)
+        )
+        return out
+
+    def __len__(self):
+        """Number of Slots in the Pool."""
+        return len(self.free)
+
+    def __repr__(self):
+        """Representation of Pool Snapshot."""
+        return (
+            f"{type(self).__name__}({len(self)} slots, {int(self.free.sum())} free, "
+            f"{int(self.cpus[self.free].sum())} free cpus)"
+        )
+
+
+class PoolCache:
+    """
+    Shared Cache of Pool Snapshots Keyed by Slot Constraint.
+
+    """
+
+    def __init__(self, query, ttl):
+        """Initialize Pool Cache."""
+        self.query = query
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._queries = dict()
+
+    def snapshot(self, constraint=None, *, max_age=None):
+        """Get Pool Snapshot of Slots Matching Constraint."""
+        with self._lock:
+            if constraint not in self._queries:
+                self._queries[constraint] = CachedQuery(
+                    lambda: PoolSnapshot(self.query(constraint)), self.ttl
+                )
+            query = self._queries[constraint]
+        return query.get(max_age=max_age)
+
+    def invalidate(self):
+        """Invalidate All Cached Snapshots."""
+        with self._lock:
+            queries = tuple(self._queries.values())
+        for query in queries:
+            query.invalidate()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/scheduler.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Back-Pressure Submission Scheduling for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import logging
+import os
+from time import monotonic, sleep
+
+# -------------- External Library -------------- #
+
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..util import value_or
+from .userlog import JobStatus
+
+
+__all__ = (
+    "TokenBucket",
+    "LogWatcher",
+    "BackpressureScheduler",
+)
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token Bucket Rate Limiter.
+
+    Tokens refill continuously at the given rate up to the capacity, so short
+    bursts are allowed while the long-run rate is bounded.
+
+    """
+
+    def __init__(self, rate, capacity=None, *, clock=monotonic):
+        """Initialize Token Bucket."""
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        self.rate = rate
+        self.capacity = value_or(capacity, max(1, rate))
+        self.clock = clock
+        self._tokens = self.capacity
+        self._last = clock()
+
+    def _refill(self):
+        """Add Tokens Accrued since the Last Refill."""
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    @property
+    def tokens(self):
+        """Get Currently Available Tokens."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, count=1):
+        """Take Tokens if Available and Return True on Success."""
+        self._refill()
+        if self._tokens < count:
+            return False
+        self._tokens -= count
+        return True
+
+    def wait_time(self, count=1):
+        """Get Seconds until Tokens are Available."""
+        self._refill()
+        return max(0.0, (count - self._tokens) / self.rate)
+
+    def __repr__(self):
+        """Representation of Token Bucket."""
+        return f"{type(self).__name__}(rate={self.rate}, capacity={self.capacity})"
+
+
+class LogWatcher:
+    """
+    Wait for User Logs to Change.
+
+    Log sizes are checked with a single stat per file, starting at the minimum
+    interval and backing off to the maximum interval while nothing changes.
+
+    """
+
+    def __init__(self, *logfiles, min_interval=0.05, max_interval=2.0):
+        """Initialize Log Watcher."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._sizes = dict()
+        self.add(*logfiles)
+
+    def add(self, *logfiles):
+        """Watch Log Files."""
+        for logfile in logfiles:
+            path = Path(logfile).abspath()
+            if path not in self._sizes:
+                self._sizes[path] = self._size(path)
+
+    def remove(self, *logfiles):
+        """Stop Watching Log Files."""
+        for logfile in logfiles:
+            self._sizes.pop(Path(logfile).abspath(), None)
+
+    @staticmethod
+    def _size(path):
+        """Get Size of File or -1 if Missing."""
+        try:
+            return os.stat(path).st_size
+        except FileNotFoundError:
+            return -1
+
+    def changed(self):
+        """Check if any Log has Changed since the Last Check."""
+        changed = False
+        for path, size in self._sizes.items():
+            new_size = self._size(path)
+            if new_size != size:
+                self._sizes[path] = new_size
+                changed = True
+        return changed
+
+    def wait(self, timeout):
+        """Wait up to Timeout Seconds for a Log to Change and Return if it Did."""
+        deadline = monotonic() + timeout
+        interval = self.min_interval
+        while True:
+            if self.changed():
+                return True
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            sleep(min(interval, remaining))
+            interval = min(2 * interval, self.max_interval)
+
+
+class BackpressureScheduler:
+    """
+    Submission Scheduler Driven by Queue Pressure.
+
+    A ConfigRunner is submitted again whenever its jobs leave fewer than
+    ``target_idle`` jobs waiting and fewer than ``max_active`` jobs in flight,
+    with submissions rate limited by a token bucket. Between submissions the
+    scheduler waits on changes to the user logs of its jobs rather than for a
+    fixed period, so completions are acted on as soon as they are written.
+
+    With ``fit_to_pool`` each submission is sized to the free capacity of the
+    pool for the requested resources, up to the room left under the targets.
+
+    """
+
+    def __init__(
+        self,
+        runner,
+        *,
+        target_idle=1,
+        max_active=None,
+        rate=1.0,
+        burst=None,
+        max_wait=60.0,
+        watcher=None,
+        fit_to_pool=False,
+    ):
+        """Initialize Back-Pressure Scheduler."""
+        self.runner = runner
+        self.target_idle = target_idle
+        self.max_active = max_active
+        self.bucket = TokenBucket(rate, burst)
+        self.max_wait = max_wait
+        self.fit_to_pool = fit_to_pool
+        self.watcher = value_or(watcher, LogWatcher())
+        if runner.logfile:
+            self.watcher.add(runner.logfile)
+        self.submissions = 0
+
+    @property
+    def jobmap(self):
+        """Get Job Map of Runner."""
+        return self.runner.jobmap
+
+    def counts(self):
+        """Get (Active, Running, Idle) Job Counts after Polling the Job Map."""
+        self.jobmap.poll()
+        active = self.jobmap.active_job_count
+        counts = self.jobmap.status_counts()
+        running = counts[JobStatus.Running] + counts[JobStatus.TransferringOutput]
+        started = running + counts[JobStatus.Held] + counts[JobStatus.Suspended]
+        return active, running, max(0, active - started)
+
+    def wants_jobs(self, active, idle):
+        """Check if the Queue has Room for Another Submission."""
+        if self.max_active is not None and active >= self.max_active:
+            return False
+        return idle < self.target_idle
+
+    def step(self):
+        """Submit if there is Room and a Token and Return Seconds to Wait."""
+        active, running, idle = self.counts()
+        if not self.wants_jobs(active, idle):
+            return self.max_wait
+        if not self.bucket.try_acquire():
+            return self.bucket.wait_time()
+        LOGGER.debug(
+            "submitting: %d active, %d running, %d idle", active, running, idle
+        )
+        if self.fit_to_pool:
+            room = self.target_idle - idle
+            if self.max_active is not None:
+                room = min(room, self.max_active - active)
+            jobs = self.runner.submit_fitting(limit=room)
+            if not jobs:
+                return self.max_wait
+        else:
+            jobs = self.runner.submit()
+        for job in jobs:
+            if job.logfile:
+                self.watcher.add(job.logfile)
+        self.submissions += 1
+        return 0.0
+
+    def run(self, *, max_submissions=None, stop=None):
+        """Keep Submitting until the Submission Limit or the Stop Predicate."""
+        while max_submissions is None or self.submissions < max_submissions:
+            if stop is not None and stop(self):
+                break
+            wait = self.step()
+            if wait > 0:
+                self.watcher.wait(wait)
+        return self.submissions
+
+    def __repr__(self):
+        """Representation of Back-Pressure Scheduler."""
+        return (
+            f"{type(self).__name__}(target_idle={self.target_idle}, "
+            f"max_active={self.max_active}, {self.bucket})"
+        )
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/table.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Columnar Job Bookkeeping for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+from time import time
+
+# -------------- External Library -------------- #
+
+import numpy as np
+import pandas as pd
+from path import Path
+
+# -------------- Hexfarm  Library -------------- #
+
+from ..util import value_or
+from .core import ClusterJobRange, split_job_id
+from .userlog import JobEventType, JobStatus, UserLogReader
+
+
+__all__ = (
+    "JOB_TABLE_DTYPE",
+    "MISSING_EXIT_CODE",
+    "JobRecord",
+    "JobTable",
+)
+
+
+JOB_TABLE_DTYPE = np.dtype(
+    [
+        ("cluster", np.int64),
+        ("process", np.int32),
+        ("status", np.int8),
+        ("exit_code", np.int32),
+        ("log_index", np.int32),
+        ("submit_time", np.float64),
+        ("update_time", np.float64),
+    ]
+)
+
+MISSING_EXIT_CODE = np.iinfo(np.int32).min
+
+
+class JobRecord:
+    """
+    View of a Single Row of a JobTable.
+
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        """Initialize Job Record."""
+        self._table = table
+        self._row = row
+
+    def _get(self, name):
+        """Get Field of Record."""
+        return self._table.data[name][self._row]
+
+    @property
+    def cluster(self):
+        """Get Cluster Id."""
+        return int(self._get("cluster"))
+
+    @property
+    def process(self):
+        """Get Process Id."""
+        return int(self._get("process"))
+
+    @property
+    def job_id(self):
+        """Get JobID."""
+        return f"{self.cluster}.{self.process}"
+
+    @property
+    def status(self):
+        """Get Job Status."""
+        return JobStatus(int(self._get("status")))
+
+    @property
+    def exit_code(self):
+        """Get Exit Code of Terminated Job."""
+        exit_code = int(self._get("exit_code"))
+        return None if exit_code == MISSING_EXIT_CODE else exit_code
+
+    @property
+    def logfile(self):
+        """Get Log File of Job."""
+        return self._table.logfile(int(self._get("log_index")))
+
+    @property
+    def submit_time(self):
+        """Get Submission Time of Job."""
+        return float(self._get("submit_time"))
+
+    @property
+    def update_time(self):
+        """Get Time of Last Status Change."""
+        return float(self._get("update_time"))
+
+    def __repr__(self):
+        """Representation of Job Record."""
+        return f"{type(self).__name__}({self.job_id}, {self.status.name})"
+
+
+class JobTable:
+    """
+    Array-Backed Store of Job Bookkeeping.
+
+    Every job is a row of a NumPy structured array. Rows of a cluster submitted
+    together are contiguous, so lookups only keep one index entry per segment.
+    A table either follows the user log tracker of a JobMap, and is updated
+    whenever the map polls, or reads its own logs with ``poll``.
+
+    """
+
+    def __init__(self, capacity=1024):
+        """Initialize Job Table."""
+        self._data = np.zeros(capacity, dtype=JOB_TABLE_DTYPE)
+        self._size = 0
+        self._segments = dict()
+        self._logfiles = []
+        self._log_indices = dict()
+        self._readers = []
+
+    @property
+    def data(self):
+        """Get Filled Rows of the Table."""
+        return self._data[: self._size]
+
+    def __len__(self):
+        """Number of Jobs in the Table."""
+        return self._size
+
+    def _reserve(self, count):
+        """Grow Storage to Hold Count More Rows."""
+        needed = self._size + count
+        if needed > len(self._data):
+            capacity = max(needed, 2 * len(self._data))
+            data = np.zeros(capacity, dtype=JOB_TABLE_DTYPE)
+            data[: self._size] = self.data
+            self._data = data
+
+    def log_index(self, logfile):
+        """Get Index of Log File, Registering it if Needed."""
+        if logfile is None:
+            return -1
+        path = Path(logfile).abspath()
+        if path not in self._log_indices:
+            self._log_indices[path] = len(self._logfiles)
+            self._logfiles.append(path)
+            self._readers.append(UserLogReader(path))
+        return self._log_indices[path]
+
+    def logfile(self, index):
+        """Get Log File at Index."""
+        return None if index < 0 else self._logfiles[index]
+
+    def add_range(
+        self,
+        cluster,
+        count,
+        first_process=0,
+        *,
+        logfile=None,
+        status=JobStatus.Idle,
+        submit_time=None,
+    ):
+        """Add a Contiguous Range of Processes of a Cluster."""
+        self._reserve(count)
+        start, stop = self._size, self._size + count
+        rows = self._data[start:stop]
+        rows["cluster"] = cluster
+        rows["process"] = np.arange(first_process, first_process + count)
+        rows["status"] = status
+        rows["exit_code"] = MISSING_EXIT_CODE
+        rows["log_index"] = self.log_index(logfile)
+        rows["submit_time"] = rows["update_time"] = value_or(submit_time, time())
+        self._segments.setdefault(int(cluster), []).append(
+            (int(first_process), int(count), start)
+        )
+        self._size = stop
+        return slice(start, stop)
+
+    def add(self, *jobs, submit_time=None):
+        """Add Jobs or Cluster Job Ranges."""
+        for job in jobs:
+            if isinstance(job, ClusterJobRange):
+                self.add_range(
+                    job.cluster,
+                    job.count,
+                    job.first_process,
+                    logfile=job.logfile,
+                    submit_time=submit_time,
+                )
+            else:
+                cluster, process = split_job_id(job.job_id)
+                self.add_range(
+                    cluster, 1, process, logfile=job.logfile, submit_time=submit_time
+                )
+
+    def row(self, job_id):
+        """Get Row of Job."""
+        cluster, process = split_job_id(job_id)
+        for first, count, start in reversed(self._segments.get(cluster, ())):
+            if first <= process < first + count:
+                return start + process - first
+        raise KeyError(job_id)
+
+    def __contains__(self, job_id):
+        """Check if Job is in the Table."""
+        try:
+            self.row(job_id)
+            return True
+        except (KeyError, ValueError):
+            return False
+
+    def __getitem__(self, job_id):
+        """Get Record View of Job."""
+        return JobRecord(self, self.row(job_id))
+
+    def records(self, rows):
+        """Get Record Views of Rows."""
+        return tuple(JobRecord(self, int(row)) for row in rows)
+
+    def job_ids(self, rows=None):
+        """Get JobIDs of Rows."""
+        data = self.data if rows is None else self.data[rows]
+        return [f"{c}.{p}" for c, p in zip(data["cluster"], data["process"])]
+
+    def apply(self, event):
+        """Apply User Log Event to the Table and Return True if Job Finished."""
+        status = event.status
+        if status is None:
+            return False
+        try:
+            row = self.row(event.job_id)
+        except KeyError:
+            return False
+        record = self._data[row]
+        if JobStatus(int(record["status"])).is_finished:
+            return False
+        record["status"] = status
+        record["update_time"] = value_or(event.timestamp, time())
+        if event.event_type == JobEventType.JobTerminated:
+            return_value = event.return_value
+            if return_value is not None:
+                record["exit_code"] = return_value
+        return status.is_finished
+
+    def follow(self, tracker):
+        """Apply every Event Read by a User Log Tracker."""
+        tracker.add_listener(self.apply)
+
+    def unfollow(self, tracker):
+        """Stop Following a User Log Tracker."""
+        tracker.remove_listener(self.apply)
+
+    def poll(self):
+        """Read New Events from All Logs and Return Rows of Newly Finished Jobs."""
+        finished = []
+        for reader in self._readers:
+            for event in reader.read_events():
+                if self.apply(event):
+                    finished.append(self.row(event.job_id))
+        return np.array(finished, dtype=np.int64)
+
+    def query(
+        self,
+        status=None,
+        cluster=None,
+        *,
+        min_age=None,
+        max_age=None,
+        age_of="submit",
+        now=None,
+    ):
+        """Get Rows Matching Status, Cluster and Age (Seconds since Submit/Update)."""
+        data = self.data
+        mask = np.ones(len(data), dtype=bool)
+        if status is not None:
+            mask &= np.isin(data["status"], np.atleast_1d(status).astype(np.int8))
+        if cluster is not None:
+            mask &= np.isin(data["cluster"], np.atleast_1d(cluster))
+        if min_age is not None or max_age is not None:
+            age = value_or(now, time()) - data[f"{age_of}_time"]
+            if min_age is not None:
+                mask &= age >= min_age
+            if max_age is not None:
+                mask &= age <= max_age
+        return np.flatnonzero(mask)
+
+    def status_counts(self, cluster=None):
+        """Count Jobs in each Status."""
+        data = self.data
+        if cluster is not None:
+            data = data[np.isin(data["cluster"], np.atleast_1d(cluster))]
+        counts = np.bincount(data["status"], minlength=len(JobStatus))
+        return {status: int(counts[status]) for status in JobStatus}
+
+    def to_frame(self, rows=None):
+        """Convert Rows to a Pandas DataFrame Indexed by (Cluster, Process)."""
+        data = self.data if rows is None else self.data[rows]
+        frame = pd.DataFrame(data)
+        frame["status"] = pd.Categorical.from_codes(
+            data["status"], [status.name for status in JobStatus]
+        )
+        return frame.set_index(["cluster", "process"])
+
+    def __repr__(self):
+        """Representation of Job Table."""
+        return f"{type(self).__name__}({len(self)} jobs, {len(self._logfiles)} logs)"
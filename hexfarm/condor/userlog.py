@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/condor/userlog.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+User Log Utilities for the HTCondor Parallel Computing Framework.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import os
+import re
+from collections import Counter, namedtuple
+from datetime import datetime
+
+# -------------- External Library -------------- #
+
+from aenum import IntEnum
+from path import Path
+
+
+__all__ = (
+    "JobEventType",
+    "JobStatus",
+    "JobEvent",
+    "parse_event_time",
+    "parse_job_events",
+    "UserLogReader",
+    "UserLogTracker",
+)
+
+
+class JobEventType(IntEnum):
+    """User Log Event Codes."""
+
+    Submit = 0
+    Execute = 1
+    ExecutableError = 2
+    Checkpointed = 3
+    JobEvicted = 4
+    JobTerminated = 5
+    ImageSize = 6
+    ShadowException = 7
+    Generic = 8
+    JobAborted = 9
+    JobSuspended = 10
+    JobUnsuspended = 11
+    JobHeld = 12
+    JobReleased = 13
+    NodeExecute = 14
+    NodeTerminated = 15
+    PostScriptTerminated = 16
+    GlobusSubmit = 17
+    GlobusSubmitFailed = 18
+    GlobusResourceUp = 19
+    GlobusResourceDown = 20
+    RemoteError = 21
+    JobDisconnected = 22
+    JobReconnected = 23
+    JobReconnectFailed = 24
+    GridResourceUp = 25
+    GridResourceDown = 26
+    GridSubmit = 27
+    JobAdInformation = 28
+    JobStatusUnknown = 29
+    JobStatusKnown = 30
+    JobStageIn = 31
+    JobStageOut = 32
+    AttributeUpdate = 33
+    PreSkip = 34
+    ClusterSubmit = 35
+    ClusterRemove = 36
+    FactoryPaused = 37
+    FactoryResumed = 38
+    FileTransfer = 40
+
+
+class JobStatus(IntEnum):
+    """Job Status Codes as in the JobStatus ClassAd Attribute."""
+
+    Unknown = 0
+    Idle = 1
+    Running = 2
+    Removed = 3
+    Completed = 4
+    Held = 5
+    TransferringOutput = 6
+    Suspended = 7
+
+    @property
+    def is_finished(self):
+        """Check if Status is Terminal."""
+        return self in (JobStatus.Removed, JobStatus.Completed)
+
+
+EVENT_STATUS_MAP = {
+    JobEventType.Submit: JobStatus.Idle,
+    JobEventType.Execute: JobStatus.Running,
+    JobEventType.JobEvicted: JobStatus.Idle,
+    JobEventType.JobTerminated: JobStatus.Completed,
+    JobEventType.JobAborted: JobStatus.Removed,
+    JobEventType.JobSuspended: JobStatus.Suspended,
+    JobEventType.JobUnsuspended: JobStatus.Running,
+    JobEventType.JobHeld: JobStatus.Held,
+    JobEventType.JobReleased: JobStatus.Idle,
+}
+
+
+EVENT_HEADER_PATTERN = re.compile(r"^(\d{3}) \((\d+)\.(\d+)\.\d+\) (\S+ \S+) ?(.*)$")
+
+RETURN_VALUE_PATTERN = re.compile(r"\(return value (-?\d+)\)")
+
+EVENT_SEPARATOR = b"...\n"
+
+
+def parse_event_time(text, now=None):
+    """Parse User Log Event Time into a POSIX Timestamp."""
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        pass
+    now = datetime.now() if now is None else now
+    try:
+        time = datetime.strptime(text, "%m/%d %H:%M:%S").replace(year=now.year)
+    except ValueError:
+        return None
+    if time > now:
+        time = time.replace(year=now.year - 1)
+    return time.timestamp()
+
+
+class JobEvent(
+    namedtuple("JobEvent", ("event_type", "cluster", "process", "time", "lines"))
+):
+    """User Log Event."""
+
+    __slots__ = ()
+
+    @property
+    def job_id(self):
+        """Get JobID of Event."""
+        return f"{self.cluster}.{self.process}"
+
+    @property
+    def timestamp(self):
+        """Get POSIX Timestamp of Event."""
+        return parse_event_time(self.time)
+
+    @property
+    def status(self):
+        """Get Job Status after Event if Event Changes Status."""
+        return EVENT_STATUS_MAP.get(self.event_type)
+
+    @property
+    def return_value(self):
+        """Get Return Value of a Terminated Job."""
+        if self.event_type != JobEventType.JobTerminated:
+            return None
+        for line in self.lines:
+            match = RETURN_VALUE_PATTERN.search(line)
+            if match:
+                return int(match.group(1))
+        return None
+
+
+def parse_job_events(text):
+    """Parse User Log Events from Text."""
+    for block in text.split("...\n"):
+        lines = block.strip("\n").split("\n")
+        match = EVENT_HEADER_PATTERN.match(lines[0])
+        if match is None:
+            continue
+        code, cluster, process, time, message = match.groups()
+        try:
+            event_type = JobEventType(int(code))
+        except ValueError:
+            continue
+        yield JobEvent(
+            event_type,
+            int(cluster),
+            int(process),
+            time,
+            (message, *map(str.strip, lines[1:])),
+        )
+
+
+def _cluster_of(job_id):
+    """Get Cluster of a JobID, or the JobID itself if it has no Cluster."""
+    cluster, _, _ = str(job_id).partition(".")
+    return int(cluster) if cluster.isdigit() else job_id
+
+
+class UserLogReader:
+    """
+    Incremental User Log Reader.
+
+    Only complete events are consumed. A partially written event is left in the
+    file and read again in full on the next call.
+
+    """
+
+    def __init__(self, path, offset=0):
+        """Initialize User Log Reader."""
+        self.path = Path(path).abspath()
+        self.offset = offset
+
+    def read_events(self):
+        """Read Events Written Since Last Read."""
+        try:
+            size = os.stat(self.path).st_size
+        except FileNotFoundError:
+            return ()
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return ()
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+        end = data.rfind(EVENT_SEPARATOR)
+        if end == -1:
+            return ()
+        end += len(EVENT_SEPARATOR)
+        self.offset += end
+        return tuple(parse_job_events(data[:end].decode("utf-8", "replace")))
+
+    def __repr__(self):
+        """Representation of User Log Reader."""
+        return f"{type(self).__name__}({self.path}, offset={self.offset})"
+
+
+class UserLogTracker:
+    """
+    Job Status Tracker over a Collection of User Logs.
+
+    Every poll reads each log once from its last offset and updates every job
+    written to that log. Forgotten jobs keep their last status aside, still
+    updated by later events, and tracking their cluster again restores it, so a
+    log is never read twice. Removing a log drops the jobs read from it.
+    Listeners receive every event read, so other bookkeeping can follow the same
+    logs without reading them again.
+
+    """
+
+    def __init__(self):
+        """Initialize User Log Tracker."""
+        self._readers = dict()
+        self._status = dict()
+        self._return_values = dict()
+        self._job_logfiles = dict()
+        self._counts = Counter()
+        self._forgotten = dict()
+        self._listeners = []
+
+    @property
+    def logfiles(self):
+        """Get Tracked Log Files."""
+        return tuple(self._readers)
+
+    def add_logfile(self, logfile, offset=0):
+        """Add Log File to Tracker."""
+        path = Path(logfile).abspath()
+        if path not in self._readers:
+            self._readers[path] = UserLogReader(path, offset=offset)
+        return self._readers[path]
+
+    def remove_logfile(self, logfile):
+        """Stop Reading Log File and Drop the Jobs Read from it."""
+        path = Path(logfile).abspath()
+        if self._readers.pop(path, None) is None:
+            return
+        for job_id, job_logfile in tuple(self._job_logfiles.items()):
+            if job_logfile == path:
+                self._drop(job_id)
+        for cluster, records in tuple(self._forgotten.items()):
+            for job_id, (_, _, job_logfile) in tuple(records.items()):
+                if job_logfile == path:
+                    del records[job_id]
+            if not records:
+                del self._forgotten[cluster]
+
+    def offsets(self):
+        """Get Read Offset of each Tracked Log File."""
+        return {path: reader.offset for path, reader in self._readers.items()}
+
+    def add_listener(self, listener):
+        """Call Listener with every Event Read from the Logs."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop Calling Listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def track_cluster(self, cluster, logfile):
+        """Track Cluster in Log File, Restoring the Status of its Forgotten Jobs."""
+        reader = self.add_logfile(logfile)
+        for job_id, (status, return_value, job_logfile) in self._forgotten.pop(
+            cluster, dict()
+        ).items():
+            self._set(job_id, status)
+            if return_value is not None:
+                self._return_values[job_id] = return_value
+            if job_logfile is not None:
+                self._job_logfiles[job_id] = job_logfile
+        return reader
+
+    def track(self, job_id, logfile):
+        """Track Job in Log File."""
+        reader = self.track_cluster(_cluster_of(job_id), logfile)
+        self._job_logfiles[job_id] = reader.path
+        if job_id not in self._status:
+            self._status[job_id] = JobStatus.Unknown
+            self._counts[JobStatus.Unknown] += 1
+
+    def _set(self, job_id, status):
+        """Set Status of Job and Update the Counts."""
+        previous = self._status.get(job_id)
+        if previous is not None:
+            self._counts[previous] -= 1
+        self._status[job_id] = status
+        self._counts[status] += 1
+
+    def _drop(self, job_id):
+        """Drop Job and Return its (Status, Return Value, Log File)."""
+        status = self._status.pop(job_id, None)
+        if status is not None:
+            self._counts[status] -= 1
+        return (
+            status,
+            self._return_values.pop(job_id, None),
+            self._job_logfiles.pop(job_id, None),
+        )
+
+    def forget(self, *job_ids):
+        """Forget Job Status, Keeping it Aside until the Job is Tracked Again."""
+        for job_id in job_ids:
+            record = self._drop(job_id)
+            if record[0] is not None:
+                cluster = self._forgotten.setdefault(_cluster_of(job_id), dict())
+                cluster[job_id] = record
+
+    def apply(self, event):
+        """Apply Event to Tracked Status and Return True if Job Finished."""
+        status = event.status
+        if status is None:
+            return False
+        job_id = event.job_id
+        forgotten = self._forgotten.get(_cluster_of(job_id), dict()).get(job_id)
+        if forgotten is not None:
+            if not forgotten[0].is_finished:
+                self._forgotten[_cluster_of(job_id)][job_id] = (
+                    status,
+                    event.return_value,
+                    forgotten[2],
+                )
+            return False
+        previous = self._status.get(job_id)
+        if previous is not None and previous.is_finished:
+            return False
+        self._set(job_id, status)
+        if event.event_type == JobEventType.JobTerminated:
+            self._return_values[job_id] = event.return_value
+        return status.is_finished
+
+    def poll(self):
+        """Read New Events from All Logs and Return Newly Finished Job Ids."""
+        finished = set()
+        for path, reader in self._readers.items():
+            for event in reader.read_events():
+                for listener in self._listeners:
+                    listener(event)
+                if event.status is not None:
+                    self._job_logfiles[event.job_id] = path
+                if self.apply(event):
+                    finished.add(event.job_id)
+        return finished
+
+    def status(self, job_id):
+        """Get Last Known Status of Job."""
+        return self._status.get(job_id, JobStatus.Unknown)
+
+    def status_count(self, *statuses):
+        """Count Jobs whose Last Known Status is any of the Statuses."""
+        return sum(self._counts[status] for status in statuses)
+
+    def return_value(self, job_id):
+        """Get Return Value of Terminated Job."""
+        return self._return_values.get(job_id)
+
+    def is_finished(self, job_id):
+        """Check if Job has Completed or was Removed."""
+        return self.status(job_id).is_finished
+
+    def __len__(self):
+        """Number of Jobs with Known Status."""
+        return len(self._status)
+
+    def __repr__(self):
+        """Representation of User Log Tracker."""
+        return f"{type(self).__name__}({list(self._readers.values())})"
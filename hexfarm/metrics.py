@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*- #
+#
+# hexfarm/metrics.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Command Metrics Utilities.
+
+"""
+
+# -------------- Standard Library -------------- #
+
+import json
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+# -------------- External Library -------------- #
+
+from path import Path
+
+
+__all__ = (
+    "LATENCY_BUCKETS",
+    "LatencyHistogram",
+    "CommandStats",
+    "CommandMetrics",
+)
+
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    float("inf"),
+)
+
+
+def _format_number(value):
+    """Format Number for the Prometheus Text Format."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape_label(value):
+    """Escape Prometheus Label Value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LatencyHistogram:
+    """
+    Cumulative Latency Histogram with Fixed Bucket Bounds.
+
+    """
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """Initialize Latency Histogram."""
+        self.bounds = tuple(bounds)
+        self.counts = [0] * len(self.bounds)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        """Record Latency."""
+        self.counts[min(bisect_left(self.bounds, seconds), len(self.counts) - 1)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative_counts(self):
+        """Get Counts of Observations below each Bucket Bound."""
+        out, running = [], 0
+        for count in self.counts:
+            running += count
+            out.append(running)
+        return out
+
+    def as_dict(self):
+        """Convert Histogram to a Dictionary."""
+        return {
+            "buckets": dict(
+                zip(map(_format_number, self.bounds), self.cumulative_counts())
+            ),
+            "sum": self.total,
+            "count": self.count,
+        }
+
+
+class CommandStats:
+    """
+    Statistics of the Invocations of a Single Command.
+
+    """
+
+    __slots__ = ("latency", "return_codes", "output_bytes")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """Initialize Command Statistics."""
+        self.latency = LatencyHistogram(bounds)
+        self.return_codes = Counter()
+        self.output_bytes = 0
+
+    @property
+    def calls(self):
+        """Get Number of Calls."""
+        return self.latency.count
+
+    def as_dict(self):
+        """Convert Statistics to a Dictionary."""
+        return {
+            "calls": self.calls,
+            "latency": self.latency.as_dict(),
+            "return_codes": {str(k): v for k, v in self.return_codes.items()},
+            "output_bytes": self.output_bytes,
+        }
+
+
+class CommandMetrics:
+    """
+    Thread-Safe Registry of Command Latencies, Return Codes and Output Sizes.
+
+    """
+
+    def __init__(self, bounds=LATENCY_BUCKETS, *, prefix="hexfarm_command"):
+        """Initialize Command Metrics."""
+        self.bounds = tuple(bounds)
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stats = dict()
+
+    def record(self, command, seconds, returncode=None, output_bytes=0):
+        """Record a Command Invocation."""
+        with self._lock:
+            stats = self._stats.get(command)
+            if stats is None:
+                stats = self._stats[command] = CommandStats(self.bounds)
+            stats.latency.observe(seconds)
+            stats.return_codes[returncode] += 1
+            stats.output_bytes += output_bytes
+
+    def __getitem__(self, command):
+        """Get Statistics of Command."""
+        return self._stats[command]
+
+    def __iter__(self):
+        """Iterate over Recorded Command Names."""
+        return iter(tuple(self._stats))
+
+    def reset(self):
+        """Forget All Recorded Statistics."""
+        with self._lock:
+            self._stats.clear()
+
+    def as_dict(self):
+        """Convert Metrics to a Dictionary Keyed by Command."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def to_json(self, **kwargs):
+        """Export Metrics as JSON."""
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_prometheus(self):
+        """Export Metrics in the Prometheus Text Exposition Format."""
+        duration = f"{self.prefix}_duration_seconds"
+        codes = f"{self.prefix}_return_codes_total"
+        output = f"{self.prefix}_output_bytes_total"
+        lines = [
+            f"# HELP {duration} Latency of command invocations.",
+            f"# TYPE {duration} histogram",
+        ]
+        with self._lock:
+            stats = sorted(self._stats.items())
+            for name, command in stats:
+                label = f'command="{_escape_label(name)}"'
+                for bound, count in zip(
+                    command.latency.bounds, command.latency.cumulative_counts()
+                ):
+                    lines.append(
+                        f'{duration}_bucket{{{label},le="{_format_number(bound)}"}} '
+                        f"{count}"
+                    )
+                lines.append(f"{duration}_sum{{{label}}} {command.latency.total!r}")
+                lines.append(f"{duration}_count{{{label}}} {command.latency.count}")
+            lines.append(f"# HELP {codes} Command invocations by return code.")
+            lines.append(f"# TYPE {codes} counter")
+            for name, command in stats:
+                label = f'command="{_escape_label(name)}"'
+                for code, count in sorted(
+                    command.return_codes.items(), key=lambda item: str(item[0])
+                ):
+                    lines.append(f'{codes}{{{label},code="{code}"}} {count}')
+            lines.append(f"# HELP {output} Bytes of output of command invocations.")
+            lines.append(f"# TYPE {output} counter")
+            for name, command in stats:
+                label = f'command="{_escape_label(name)}"'
+                lines.append(f"{output}{{{label}}} {command.output_bytes}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path, *, format="prometheus"):
+        """Atomically Write Metrics to a File in Prometheus or JSON Format."""
+        text = self.to_prometheus() if format == "prometheus" else self.to_json()
+        path = Path(path).abspath()
+        path.parent.makedirs_p()
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, suffix=".tmp", delete=False
+        ) as file:
+            file.write(text)
+        os.replace(file.name, path)
+        return path
+
+    def __repr__(self):
+        """Representation of Command Metrics."""
+        return f"{type(self).__name__}({sorted(self._stats)})"
@@ -40,7 +40,6 @@ import logging
 from path import Path
 
 import uproot
-import uproot_methods
 import histbook
 import formulate
 
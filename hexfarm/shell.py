@@ -33,10 +33,13 @@ Utilities for Shell Processes.
 
 # -------------- Standard Library -------------- #
 
+import asyncio
+import io
 import logging
 import shutil
 import subprocess
 from subprocess import PIPE
+from time import perf_counter
 from collections.abc import MutableSet
 from collections import deque
 
@@ -47,7 +50,8 @@ import plumbum
 
 # -------------- Hexfarm  Library -------------- #
 
-from .util import identity, classproperty
+from .metrics import CommandMetrics
+from .util import identity, classproperty, value_or
 
 
 LOGGER = logging.getLogger(__name__)
@@ -72,6 +76,140 @@ def decoded(output, mode="stdout", encoding="utf-8"):
     return getattr(output, mode).decode(encoding)
 
 
+def _output_size(*outputs):
+    """Get Total Size of Captured Outputs."""
+    return sum(len(output) for output in outputs if output is not None)
+
+
+class _CountingReader(io.RawIOBase):
+    """Raw Reader Counting the Bytes Read through it."""
+
+    def __init__(self, raw):
+        """Initialize Counting Reader."""
+        super().__init__()
+        self._raw = raw
+        self.count = 0
+
+    def readable(self):
+        """Counting Readers are Readable."""
+        return True
+
+    def readinto(self, buffer):
+        """Read into Buffer and Count the Bytes Read."""
+        size = self._raw.readinto(buffer)
+        if size:
+            self.count += size
+        return size
+
+    def fileno(self):
+        """Get File Descriptor of the Underlying Stream."""
+        return self._raw.fileno()
+
+    def close(self):
+        """Close Underlying Stream."""
+        self._raw.close()
+        super().close()
+
+
+class TimedPopen(subprocess.Popen):
+    """
+    Process which Records its Lifetime in Command Metrics when Waited On.
+
+    Piped output is counted as the caller reads it, so streamed commands report
+    their output size as well as those read with communicate. Process details not
+    kept by subprocess, such as CPU and memory usage, are read through psutil.
+
+    """
+
+    def __init__(self, metrics, name, *args, **kwargs):
+        """Initialize Timed Process."""
+        self._metrics = metrics
+        self._metrics_name = name
+        self._start = perf_counter()
+        self._recorded = False
+        self._communicating = False
+        self._counters = []
+        self._communicated = 0
+        self._process = None
+        super().__init__(*args, **kwargs)
+        for name in ("stdout", "stderr"):
+            stream = getattr(self, name)
+            if stream is not None:
+                setattr(self, name, self._counted(stream))
+
+    def _counted(self, stream):
+        """Take Over Output Stream to Count the Bytes Read from it."""
+        text = isinstance(stream, io.TextIOWrapper)
+        encoding, errors = (stream.encoding, stream.errors) if text else (None, None)
+        raw = stream.detach() if text else stream
+        if isinstance(raw, io.BufferedIOBase):
+            raw = raw.detach()
+        counter = _CountingReader(raw)
+        self._counters.append(counter)
+        counted = io.BufferedReader(counter)
+        if text:
+            return io.TextIOWrapper(counted, encoding=encoding, errors=errors)
+        return counted
+
+    @property
+    def process(self):
+        """Get psutil Process, Created on First Use."""
+        if self._process is None:
+            self._process = psutil.Process(self.pid)
+        return self._process
+
+    def __getattr__(self, name):
+        """Get Process Details from psutil."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.process, name)
+
+    @property
+    def output_bytes(self):
+        """Get Number of Bytes Read from the Output Streams."""
+        return self._communicated + self._counted_bytes()
+
+    def _counted_bytes(self):
+        """Get Number of Bytes Read through the Stream Counters."""
+        return sum(counter.count for counter in self._counters)
+
+    def _record(self):
+        """Record Latency, Return Code and Output Size Once."""
+        if not self._recorded:
+            self._recorded = True
+            self._metrics.record(
+                self._metrics_name,
+                perf_counter() - self._start,
+                self.returncode,
+                self.output_bytes,
+            )
+
+    def communicate(self, *args, **kwargs):
+        """Communicate with Process, Count its Output and Record it once Done."""
+        counted = self._counted_bytes()
+        self._communicating = True
+        try:
+            output, error = super().communicate(*args, **kwargs)
+        finally:
+            self._communicating = False
+        size = sum(
+            len(data.encode() if isinstance(data, str) else data)
+            for data in (output, error)
+            if data is not None
+        )
+        self._communicated += max(0, size - (self._counted_bytes() - counted))
+        if self.returncode is not None:
+            self._record()
+        return output, error
+
+    def wait(self, timeout=None):
+        """Wait for Process and Record its Latency, Return Code and Output Size."""
+        returncode = super().wait(timeout)
+        if not self._communicating:
+            self._record()
+        return returncode
+
+
 class Command:
     """
     Basic Command Object.
@@ -82,11 +220,24 @@ class Command:
         """Initialize Command Subclasses."""
         cls.prefix = classproperty(fget=lambda c: prefix)
 
+    metrics = None
+
     @classproperty
     def prefix(cls):
         """Default Command Prefix."""
         return ""
 
+    @classmethod
+    def enable_metrics(cls, metrics=None):
+        """Record Latency, Return Codes and Output Size of Commands of this Class."""
+        cls.metrics = value_or(metrics, CommandMetrics())
+        return cls.metrics
+
+    @classmethod
+    def disable_metrics(cls):
+        """Stop Recording Command Metrics."""
+        cls.metrics = None
+
     def __init__(
         self, name, *args, default_decoded=False, clean_output=identity, **kwargs
     ):
@@ -113,7 +264,20 @@ class Command:
 
     def open(self, *args, **kwargs):
         """Open Process for Given Command."""
-        return psutil.Popen(self._running_args(*args), **kwargs)
+        metrics = self.metrics
+        if metrics is None:
+            return psutil.Popen(self._running_args(*args), **kwargs)
+        return TimedPopen(metrics, self.full_name, self._running_args(*args), **kwargs)
+
+    def _finish(self, result, result_decoded=None, clean_output=None):
+        """Decode and Clean Command Result."""
+        if result_decoded is None:
+            result = result if not self._default_decoded else decoded(result)
+        else:
+            result = result if not result_decoded else decoded(result)
+        return (
+            self._clean_output(result) if clean_output is None else clean_output(result)
+        )
 
     def run(
         self,
@@ -125,6 +289,9 @@ class Command:
         **kwargs,
     ):
         """Run Command."""
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
         result = subprocess.run(
             self._running_args(*args),
             stdout=stdout,
@@ -132,13 +299,44 @@ class Command:
             **self.__kwargs,
             **kwargs,
         )
-        if result_decoded is None:
-            result = result if not self._default_decoded else decoded(result)
-        else:
-            result = result if not result_decoded else decoded(result)
-        return (
-            self._clean_output(result) if clean_output is None else clean_output(result)
+        if metrics is not None:
+            metrics.record(
+                self.full_name,
+                perf_counter() - start,
+                result.returncode,
+                _output_size(result.stdout, result.stderr),
+            )
+        return self._finish(result, result_decoded, clean_output)
+
+    async def run_async(
+        self,
+        *args,
+        stdout=PIPE,
+        stderr=PIPE,
+        result_decoded=None,
+        clean_output=None,
+        **kwargs,
+    ):
+        """Run Command as an Asyncio Subprocess."""
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        running_args = self._running_args(*args)
+        process = await asyncio.create_subprocess_exec(
+            *running_args, stdout=stdout, stderr=stderr, **self.__kwargs, **kwargs
+        )
+        output, error = await process.communicate()
+        if metrics is not None:
+            metrics.record(
+                self.full_name,
+                perf_counter() - start,
+                process.returncode,
+                _output_size(output, error),
+            )
+        result = subprocess.CompletedProcess(
+            running_args, process.returncode, output, error
         )
+        return self._finish(result, result_decoded, clean_output)
 
     def __call__(self, *args, **kwargs):
         """Run Command."""
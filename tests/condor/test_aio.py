@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_aio.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Asyncio Tests.
+
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from hexfarm.condor.aio import AsyncConfigRunner, AsyncJobManager, CommandLimiter
+from hexfarm.condor.core import SUBMIT_WHILE_INTERVAL, JobConfig, JobManager
+from hexfarm.condor.local import LocalCondor
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class CountingLimiter(CommandLimiter):
+    """Command Limiter Recording the Functions Sent to the Executor."""
+
+    def __init__(self, max_in_flight=8):
+        super().__init__(max_in_flight)
+        self.functions = []
+
+    async def run_in_executor(self, f, *args):
+        self.functions.append(getattr(f, "__name__", f))
+        return await super().run_in_executor(f, *args)
+
+
+@pytest.fixture
+def local():
+    with LocalCondor(workers=4, execute=False, runtime=0.01) as local:
+        yield local
+
+
+@pytest.fixture
+def config(tmp_path):
+    return JobConfig(
+        [
+            "executable = /bin/true",
+            f"initialdir = {tmp_path}",
+            "log = jobs.log",
+            "queue 3",
+        ]
+    )
+
+
+def test_command_limiter_bounds_concurrency():
+    limiter = CommandLimiter(max_in_flight=2)
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        threading.Event().wait(0.05)
+        with lock:
+            active[0] -= 1
+
+    async def main():
+        await asyncio.gather(*(limiter.run_in_executor(work) for _ in range(6)))
+
+    run(main())
+    assert peak[0] == 2
+
+
+def test_async_job_manager(local, config, tmp_path):
+    async def main():
+        manager = AsyncJobManager(max_in_flight=2)
+        for name in ("a", "b"):
+            manager.add_config(
+                name,
+                JobConfig(list(config)),
+                tmp_path / f"{name}.sub",
+                tmp_path / "jobs.log",
+            )
+        submitted = await manager.submit_all()
+        waited = await manager.wait_all(timeout=30, interval=0.05)
+        return manager, submitted, waited
+
+    manager, submitted, waited = run(main())
+    assert sorted(manager) == ["a", "b"] and len(manager) == 2
+    assert all(len(jobs[0]) == 3 for jobs in submitted.values())
+    assert all(len(job_ids) == 3 for job_ids in waited.values())
+    assert manager["a"].running_job_count == 0
+    assert submitted["a"][0].cluster != submitted["b"][0].cluster
+
+
+def test_async_remove(local, tmp_path):
+    local.runtime = 0.5
+    config = JobConfig(
+        [
+            "executable = /bin/true",
+            f"initialdir = {tmp_path}",
+            "log = jobs.log",
+            "queue 4",
+        ]
+    )
+    manager = JobManager()
+    runner = AsyncConfigRunner(
+        manager.add_config("a", config, tmp_path / "a.sub", tmp_path / "jobs.log")
+    )
+
+    async def main():
+        await runner.submit()
+        return await runner.remove()
+
+    results = run(main())
+    assert results and all(result.returncode == 0 for result in results)
+    assert len(runner.jobmap) == 0
+    assert not local.jobs
+
+
+def test_poll_and_predicate_run_through_limiter(local, config, tmp_path):
+    limiter = CountingLimiter()
+    runner = AsyncConfigRunner(
+        JobManager().add_config("a", config, tmp_path / "a.sub", tmp_path / "jobs.log"),
+        limiter=limiter,
+    )
+    threads = []
+
+    def predicate(config_runner):
+        threads.append(threading.current_thread())
+        return len(config_runner.jobmap) < 6
+
+    async def main():
+        await runner.submit_while(predicate, wait=0)
+        await runner.poll()
+
+    run(main())
+    assert len(runner.jobmap) == 6
+    assert threading.main_thread() not in threads and len(threads) == 3
+    assert limiter.functions.count("predicate") == 3
+    assert limiter.functions.count("poll") == 1
+
+
+def test_submit_while_waits_between_submissions(local, config, tmp_path, monkeypatch):
+    runner = AsyncConfigRunner(
+        JobManager().add_config("a", config, tmp_path / "a.sub", tmp_path / "jobs.log")
+    )
+    waits, asyncio_sleep = [], asyncio.sleep
+
+    async def sleep(delay):
+        waits.append(delay)
+        await asyncio_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    run(runner.submit_while(lambda config_runner: len(config_runner.jobmap) < 6))
+    assert waits == [SUBMIT_WHILE_INTERVAL] * 2 and SUBMIT_WHILE_INTERVAL > 0
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_backends.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Submit Backend Tests.
+
+"""
+
+import pytest
+
+from hexfarm.condor.core import (
+    JobConfig,
+    ScheddSubmitBackend,
+    SubmitBackend,
+    split_queue_statement,
+    submit_config,
+    submit_configs,
+)
+
+
+class FakeTransaction:
+    """Stand-In for an HTCondor Schedd Transaction."""
+
+    def __init__(self, schedd):
+        self.schedd = schedd
+        self.queued = []
+
+    def __enter__(self):
+        self.schedd.transactions.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.schedd.committed.extend(self.queued)
+
+
+class FakeSchedd:
+    """Stand-In for an HTCondor Schedd Handing Out Increasing Cluster Ids."""
+
+    def __init__(self, first_cluster=100):
+        self.next_cluster = first_cluster
+        self.transactions = []
+        self.committed = []
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+
+class FakeSubmit:
+    """Stand-In for htcondor.Submit."""
+
+    def __init__(self, description):
+        self.description = description
+
+    def queue(self, transaction, count=1):
+        cluster = transaction.schedd.next_cluster
+        transaction.schedd.next_cluster += 1
+        transaction.queued.append((cluster, self.description, count))
+        return cluster
+
+
+class FakeHTCondor:
+    """Stand-In for the htcondor Module."""
+
+    def __init__(self):
+        self.schedd = FakeSchedd()
+        self.Submit = FakeSubmit
+
+    def Schedd(self):
+        return self.schedd
+
+
+class RecordingBackend(SubmitBackend):
+    """Fallback Backend Recording its Submissions."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, config, path=None, *args, **kwargs):
+        self.submitted.append((list(config), path, args, kwargs))
+        return ((1, 0, 1),)
+
+
+@pytest.fixture
+def module():
+    return FakeHTCondor()
+
+
+@pytest.fixture
+def fallback():
+    return RecordingBackend()
+
+
+@pytest.fixture
+def backend(module, fallback):
+    return ScheddSubmitBackend(module=module, fallback=fallback)
+
+
+def test_split_queue_statement():
+    config = JobConfig(["executable = /bin/true", "# comment", "", "queue 5"])
+    assert split_queue_statement(config) == ("executable = /bin/true", 5)
+    assert split_queue_statement(JobConfig(["executable = a", "queue"]))[1] == 1
+    assert split_queue_statement(JobConfig(["executable = a"])) == (None, None)
+    assert split_queue_statement(
+        JobConfig(["executable = a", "queue 2", "arguments = b", "queue"])
+    ) == (None, None)
+    assert split_queue_statement(
+        JobConfig(["executable = a", "queue item in (a, b)"])
+    ) == (None, None)
+
+
+def test_schedd_backend_requires_bindings(monkeypatch):
+    from hexfarm.condor import core
+
+    monkeypatch.setattr(core, "htcondor", None)
+    with pytest.raises(ImportError):
+        ScheddSubmitBackend()
+
+
+def test_schedd_backend_submits_in_transaction(backend, module, fallback):
+    config = JobConfig(["executable = /bin/true", "arguments = $(Process)", "queue 3"])
+    assert backend.submit(config) == ((100, 0, 3),)
+    assert len(module.schedd.transactions) == 1
+    assert module.schedd.committed == [
+        (100, "executable = /bin/true\narguments = $(Process)", 3)
+    ]
+    assert not fallback.submitted
+
+
+def test_schedd_backend_locates_schedd_once(module, fallback):
+    calls = []
+
+    def schedd():
+        calls.append(True)
+        return module.schedd
+
+    module.Schedd = schedd
+    backend = ScheddSubmitBackend(module=module, fallback=fallback)
+    for _ in range(3):
+        backend.submit(JobConfig(["executable = /bin/true", "queue"]))
+    assert len(calls) == 1
+
+
+def test_schedd_backend_submit_many_single_transaction(backend, module, fallback):
+    configs = [
+        JobConfig(["executable = /bin/true", "queue 2"]),
+        JobConfig(["executable = /bin/true", "queue item in (a, b)"]),
+        JobConfig(["executable = /bin/false", "queue"]),
+    ]
+    results = backend.submit_many(configs)
+    assert results == (((100, 0, 2),), ((1, 0, 1),), ((101, 0, 1),))
+    assert len(module.schedd.transactions) == 1
+    assert [entry[0] for entry in module.schedd.committed] == [100, 101]
+    assert [config for config, *_ in fallback.submitted] == [list(configs[1])]
+
+
+def test_schedd_backend_falls_back_on_arguments(backend, module, fallback):
+    config = JobConfig(["executable = /bin/true", "queue"])
+    assert backend.submit(config, "job.sub", "-verbose") == ((1, 0, 1),)
+    assert fallback.submitted == [(list(config), "job.sub", ("-verbose",), {})]
+    assert not module.schedd.transactions
+
+
+def test_schedd_backend_writes_given_path(backend, module, fallback, tmp_path):
+    config = JobConfig(["executable = /bin/true", "queue 2"])
+    path = tmp_path / "jobs" / "job.sub"
+    assert backend.submit(config, path) == ((100, 0, 2),)
+    assert path.read_text() == config.as_text
+    assert not fallback.submitted
+    backend.submit(JobConfig(["executable = /bin/false", "queue"]), path)
+    assert path.read_text() == config.as_text
+    config = JobConfig(["executable = /bin/true", "queue item in (a, b)"])
+    backend.submit(config, path)
+    assert fallback.submitted == [(list(config), path, (), {})]
+
+
+def test_submit_config_with_backend(backend):
+    config = JobConfig(["executable = /bin/true", "queue 4"])
+    (job_range,) = submit_config(config, logfile="jobs.log", backend=backend)
+    assert (job_range.cluster, job_range.first_process, job_range.count) == (100, 0, 4)
+    assert job_range.logfile == "jobs.log"
+    assert [job.job_id for job in job_range] == [f"100.{p}" for p in range(4)]
+
+
+def test_submit_configs_with_backend(backend, module):
+    configs = [JobConfig(["executable = /bin/true", "queue"]) for _ in range(3)]
+    results = submit_configs(configs, backend=backend)
+    assert [job_range.cluster for (job_range,) in results] == [100, 101, 102]
+    assert len(module.schedd.transactions) == 1
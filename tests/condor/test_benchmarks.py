@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_benchmarks.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Benchmark Suite.
+
+"""
+
+import subprocess
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from hexfarm.condor import core
+from hexfarm.condor.core import (
+    ClusterUnit,
+    JobConfig,
+    JobMap,
+    ProcessUnit,
+    current_jobs,
+    extract_job_ids,
+    submit_config,
+)
+from hexfarm.condor.local import LocalCondor, LocalProcess
+
+CONFIG_LINES = 10**5
+
+PROCESS_UNITS = 10**3
+
+SUBMITTED_JOBS = 10**6
+
+QUEUED_JOBS = 10**5
+
+POLLED_JOBS = 10**4
+
+
+@pytest.fixture(scope="module")
+def config_lines():
+    return [f"arguments = --seed {index}" for index in range(CONFIG_LINES)]
+
+
+@pytest.fixture(scope="module")
+def polled_jobs(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("jobmap")
+    config = JobConfig(
+        [
+            "executable = /bin/true",
+            f"initialdir = {directory}",
+            "log = jobs.log",
+            f"queue {POLLED_JOBS}",
+        ]
+    )
+    with LocalCondor(workers=8, execute=False) as local:
+        ranges = submit_config(
+            config, directory / "jobs.sub", logfile=directory / "jobs.log"
+        )
+        assert local.wait_idle(timeout=120)
+    return ranges
+
+
+class SyntheticQueue:
+    """Stand-In Answering condor_q with a Fixed Autoformat Output."""
+
+    def __init__(self, jobs, owners=8):
+        self.output = "".join(
+            f"{job // 1000}\t{job % 1000}\tuser{job % owners}\n" for job in range(jobs)
+        ).encode()
+
+    def run(self, name, args):
+        return subprocess.CompletedProcess([name, *args], 0, self.output, b"")
+
+    @staticmethod
+    def open(result, **kwargs):
+        return LocalProcess(result, **kwargs)
+
+
+def test_config_construction(benchmark, config_lines):
+    config = benchmark(JobConfig, config_lines)
+    assert len(config) == CONFIG_LINES
+
+
+def test_config_append(benchmark, config_lines):
+    def append_all():
+        config = JobConfig()
+        for line in config_lines:
+            config.append(line)
+        return config
+
+    assert len(benchmark(append_all)) == CONFIG_LINES
+
+
+def test_config_to_text(benchmark, config_lines):
+    config = JobConfig(config_lines)
+    text = benchmark(config.to_text)
+    assert text.count("\n") >= CONFIG_LINES - 1
+
+
+def test_cluster_unit_config(benchmark):
+    cluster = ClusterUnit("/bin/true", log="jobs.log")
+    for index in range(PROCESS_UNITS):
+        process = ProcessUnit("/bin/true", output=f"out.{index}")
+        process.queue()
+        cluster.append_process(process)
+    config = benchmark(lambda: cluster.config)
+    assert config.has_key(core.QUEUE_KEY) and len(config) > PROCESS_UNITS
+
+
+def test_extract_job_ids(benchmark):
+    text = f"{SUBMITTED_JOBS} job(s) submitted to cluster 1234.\n"
+    job_ids = benchmark(lambda: sum(1 for _ in extract_job_ids(text)))
+    assert job_ids == SUBMITTED_JOBS
+
+
+def test_current_jobs(benchmark, monkeypatch):
+    monkeypatch.setattr(core.CondorCommand, "local", SyntheticQueue(QUEUED_JOBS))
+    jobs = benchmark(current_jobs)
+    assert sum(map(len, jobs.values())) == QUEUED_JOBS
+
+
+def test_job_map_poll(benchmark, polled_jobs):
+    def poll():
+        job_map = JobMap(*polled_jobs)
+        job_map.poll()
+        return job_map
+
+    job_map = benchmark(poll)
+    assert not any(job_range.active_count for job_range in job_map.ranges)
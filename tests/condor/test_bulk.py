@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_bulk.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Bulk Job Command Tests.
+
+"""
+
+import pytest
+
+from hexfarm.condor.core import (
+    BULK_ARGUMENT_BYTES,
+    ClusterJobRange,
+    JobConfig,
+    JobMap,
+    bulk_job_arguments,
+    bulk_job_command,
+    group_job_ids,
+    job_constraint,
+    process_ranges,
+    submit_config,
+)
+from hexfarm.condor.local import LocalCondor, evaluate_constraint
+from hexfarm.condor.userlog import JobStatus
+
+MAX_ARG_STRLEN = 128 << 10
+
+
+def test_group_job_ids():
+    assert group_job_ids(["1.0", "1.2", "2", "2.5", "3.1"]) == {
+        1: {0, 2},
+        2: None,
+        3: {1},
+    }
+
+
+def test_process_ranges():
+    assert list(process_ranges([5, 1, 2, 3, 7, 8])) == [(1, 3), (5, 5), (7, 8)]
+    assert list(process_ranges([])) == []
+
+
+def test_job_constraint():
+    assert job_constraint(["4", "5.0", "5.1", "5.3"]) == (
+        "ClusterId == 4"
+        " || (ClusterId == 5 && ProcId >= 0 && ProcId <= 1)"
+        " || (ClusterId == 5 && ProcId == 3)"
+    )
+
+
+def test_constraint_chunks_fit_limit():
+    job_ids = [f"{cluster}.{p}" for cluster in (10, 11) for p in range(0, 20000, 2)]
+    chunks = list(bulk_job_arguments(job_ids, use_constraint=True, limit=4096))
+    assert len(chunks) > 1
+    assert all(flag == "-constraint" for flag, _ in chunks)
+    assert all(len(constraint) <= 4096 for _, constraint in chunks)
+    assert sum(constraint.count("ClusterId") for _, constraint in chunks) == len(
+        job_ids
+    )
+
+
+def test_constraint_matches_job_ids():
+    job_ids = {"3.0", "3.1", "3.2", "3.7", "4.1"}
+    ((_, constraint),) = bulk_job_arguments(job_ids, use_constraint=True)
+    matched = {
+        f"{cluster}.{process}"
+        for cluster in (3, 4)
+        for process in range(10)
+        if evaluate_constraint(constraint, {"ClusterId": cluster, "ProcId": process})
+    }
+    assert matched == job_ids
+
+
+def test_default_constraint_chunks_below_argument_limit():
+    job_ids = [f"{cluster}.0" for cluster in range(100000)]
+    chunks = list(bulk_job_arguments(job_ids, use_constraint=True))
+    assert len(chunks) > 1
+    assert all(len(constraint) < MAX_ARG_STRLEN for _, constraint in chunks)
+    assert all(len(constraint) <= BULK_ARGUMENT_BYTES for _, constraint in chunks)
+    assert sum(constraint.count("ClusterId") for _, constraint in chunks) == 100000
+
+
+def test_positional_chunks_fit_limit():
+    job_ids = [f"7.{p}" for p in range(5000)] + ["8"]
+    chunks = list(bulk_job_arguments(job_ids, limit=1000))
+    assert all(sum(len(arg) + 1 for arg in chunk) <= 1000 for chunk in chunks)
+    assert [arg for chunk in chunks for arg in chunk] == sorted(
+        job_ids, key=lambda job_id: tuple(map(int, job_id.split(".")))
+    )
+
+
+def test_bulk_job_command():
+    calls = []
+
+    def command(*args, **kwargs):
+        calls.append((args, kwargs))
+        return len(calls)
+
+    results = bulk_job_command(
+        command, ["1.0", "1.1", "2"], "-name", "schedd", use_constraint=True, flag=1
+    )
+    assert results == (1,)
+    assert calls == [
+        (
+            (
+                "-constraint",
+                "(ClusterId == 1 && ProcId >= 0 && ProcId <= 1) || ClusterId == 2",
+                "-name",
+                "schedd",
+            ),
+            {"flag": 1},
+        )
+    ]
+
+
+@pytest.fixture
+def queued(tmp_path):
+    config = JobConfig(
+        [
+            "executable = /bin/true",
+            f"initialdir = {tmp_path}",
+            "log = jobs.log",
+            "queue 6",
+        ]
+    )
+    with LocalCondor(workers=1, execute=False, start_latency=0.2) as local:
+        ranges = submit_config(config, logfile=tmp_path / "jobs.log")
+        yield local, JobMap(*ranges, remove_when_clearing=False)
+
+
+def test_job_map_hold_release_remove(queued):
+    local, job_map = queued
+    (job_range,) = job_map.ranges
+    held = [job_range.job_id(p) for p in (1, 2, 4)]
+    results = job_map.hold_jobs(*held)
+    assert len(results) == 1 and results[0].returncode == 0
+    assert {
+        job_id for job_id, job in local.jobs.items() if job.status == JobStatus.Held
+    } == set(held)
+    job_map.release_jobs(*held)
+    assert not any(job.status == JobStatus.Held for job in local.jobs.values())
+    jobs, results = job_map.remove_jobs(*held, use_constraint=False)
+    assert [job.job_id for job in jobs] == held and len(results) == 1
+    assert set(local.jobs).isdisjoint(held)
+    assert sorted(job_map) == [job_range.job_id(p) for p in (0, 3, 5)]
+    assert isinstance(next(iter(job_map.ranges)), ClusterJobRange)
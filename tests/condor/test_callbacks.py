@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_callbacks.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+"""
+HexFarm Condor Completion Callback Tests.
+
+"""
+
+import time
+
+import pytest
+from path import Path
+
+from hexfarm.condor.callbacks import CompletionWatcher
+from hexfarm.condor.core import ClusterJobRange, Job
+from hexfarm.condor.userlog import JobStatus
+
+
+def event_text(code, cluster, process, *details, message="Event."):
+    lines = [
+        f"{code:03d} ({cluster:03d}.{process:03d}.000) 2019-01-02 03:04:05 {message}"
+    ]
+    lines.extend(f"\t{detail}" for detail in details)
+    return "\n".join(lines) + "\n...\n"
+
+
+def submitted(cluster, process):
+    return event_text(0, cluster, process, message="Job submitted from host.")
+
+
+def terminated(cluster, process, code=0):
+    return event_text(
+        5,
+        cluster,
+        process,
+        f"(1) Normal termination (return value {code})",
+        message="Job terminated.",
+    )
+
+
+def append(logfile, text):
+    with open(logfile, "a") as file:
+        file.write(text)
+
+
+@pytest.fixture
+def watcher():
+    with CompletionWatcher(min_interval=0.01, max_interval=0.05) as watcher:
+        yield watcher
+
+
+def is_idle(watcher):
+    return not (
+        len(watcher.tracker)
+        or watcher.tracker.logfiles
+        or watcher.tracker._forgotten
+        or watcher._registrations
+        or watcher._running
+        or watcher._logs._sizes
+    )
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def test_job_finished_before_registration(tmp_path, watcher):
+    logfile = Path(tmp_path) / "jobs.log"
+    logfile.write_text(submitted(4, 0) + terminated(4, 0))
+    future = watcher.register(Job(None, "4.0", logfile=logfile), lambda job: job.job_id)
+    assert future.result(timeout=10) == "4.0"
+    assert is_idle(watcher) and not len(watcher)
+
+
+def test_range_callback(tmp_path, watcher):
+    logfile = Path(tmp_path) / "jobs.log"
+    logfile.write_text(submitted(6, 0) + submitted(6, 1))
+    job_range = ClusterJobRange(6, 2, logfile=logfile)
+    future = watcher.register(job_range, lambda job, n: job.job_id * n, 2)
+    append(logfile, terminated(6, 1))
+    with pytest.raises(TimeoutError):
+        future.result(timeout=0.2)
+    assert watcher.tracker.logfiles == (logfile.abspath(),)
+    append(logfile, terminated(6, 0))
+    assert future.result(timeout=10) == ("6.06.0", "6.16.1")
+    wait_for(lambda: is_idle(watcher))
+
+
+def test_log_followed_while_registrations_wait(tmp_path, watcher):
+    logfile = Path(tmp_path) / "jobs.log"
+    logfile.write_text(submitted(7, 0) + submitted(7, 1))
+    first = watcher.register(Job(None, "7.0", logfile=logfile), lambda job: 1)
+    second = watcher.register(Job(None, "7.1", logfile=logfile), lambda job: 2)
+    append(logfile, terminated(7, 0))
+    assert first.result(timeout=10) == 1
+    assert watcher.tracker.logfiles == (logfile.abspath(),)
+    assert watcher.tracker.status("7.0") == JobStatus.Unknown
+    append(logfile, terminated(7, 1))
+    assert second.result(timeout=10) == 2
+    assert is_idle(watcher)
+
+
+def test_register_again_after_dispatch(tmp_path, watcher):
+    logfile = Path(tmp_path) / "jobs.log"
+    logfile.write_text(submitted(8, 0) + submitted(8, 1))
+    job = Job(None, "8.0", logfile=logfile)
+    waiting = watcher.register(Job(None, "8.1", logfile=logfile), lambda job: 1)
+    append(logfile, terminated(8, 0))
+    assert watcher.register(job, lambda job: 1).result(timeout=10) == 1
+    assert watcher.register(job, lambda job: 2).result(timeout=10) == 2
+    assert not waiting.done()
+
+
+def test_state_is_empty_after_cycles(tmp_path, watcher):
+    logfile = Path(tmp_path) / "jobs.log"
+    for cluster in range(1, 21):
+        append(logfile, submitted(cluster, 0) + submitted(cluster, 1))
+        job_range = ClusterJobRange(cluster, 2, logfile=logfile)
+        future = watcher.register(job_range, lambda job: job.job_id)
+        single = watcher.register(job_range[0], lambda job: 0)
+        append(logfile, terminated(cluster, 0) + terminated(cluster, 1))
+        assert future.result(timeout=10) == (f"{cluster}.0", f"{cluster}.1")
+        assert single.result(timeout=10) == 0
+        wait_for(lambda: is_idle(watcher))
+    assert not len(watcher)
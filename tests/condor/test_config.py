@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_config.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Job Config Tests.
+
+"""
+
+import pytest
+from path import Path
+
+from hexfarm.condor.core import JobConfig, submit_line_key
+
+
+@pytest.fixture
+def config():
+    return JobConfig(
+        [
+            "executable = run.sh",
+            "Request_Memory = 1GB",
+            "arguments = a",
+            "queue",
+            "arguments = b",
+            "queue 2",
+        ]
+    )
+
+
+def assert_index_consistent(config):
+    expected = JobConfig(list(config))
+    assert config._line_keys == list(map(submit_line_key, config))
+    assert dict(config.key_index) == dict(expected.key_index)
+    assert config.as_text == expected.as_text
+    assert config.content_hash == expected.content_hash
+
+
+def test_get_by_key(config):
+    assert config.get("request_memory") == "1GB"
+    assert config["REQUEST_MEMORY"] == "1GB"
+    assert config["arguments"] == "b"
+    assert config.get("universe") is None
+    assert config.get("universe", "vanilla") == "vanilla"
+    assert config.has_key("Executable") and not config.has_key("universe")
+    with pytest.raises(KeyError):
+        config["universe"]
+    assert config[0] == "executable = run.sh"
+
+
+def test_keys_and_items(config):
+    assert config.keys() == ["executable", "request_memory", "arguments"]
+    assert config.items() == [
+        ("executable", "run.sh"),
+        ("request_memory", "1GB"),
+        ("arguments", "b"),
+    ]
+
+
+def test_set_overwrites_last_line(config):
+    config["arguments"] = "c"
+    assert config[4] == "arguments=c" and config[2] == "arguments = a"
+    config.set("request_memory", "2GB")
+    assert config[1] == "request_memory=2GB"
+    assert len(config) == 6
+    assert_index_consistent(config)
+
+
+def test_set_new_key_before_first_queue(config):
+    config["request_cpus"] = 4
+    assert config[3] == "request_cpus=4"
+    assert config[4] == "queue"
+    assert config["request_cpus"] == "4"
+    assert_index_consistent(config)
+    unqueued = JobConfig(["executable = run.sh"])
+    unqueued.set("universe", "vanilla")
+    assert list(unqueued) == ["executable = run.sh", "universe=vanilla"]
+
+
+def test_delete_every_setting(config):
+    del config["arguments"]
+    assert not config.has_key("arguments")
+    assert list(config) == [
+        "executable = run.sh",
+        "Request_Memory = 1GB",
+        "queue",
+        "queue 2",
+    ]
+    with pytest.raises(KeyError):
+        config.delete("arguments")
+    assert_index_consistent(config)
+
+
+def test_list_mutators_keep_index(config):
+    config.key_index
+    config.append("universe = vanilla\nrequest_disk = 1MB")
+    assert config["request_disk"] == "1MB" and len(config) == 8
+    config.insert(0, "# comment")
+    assert config[0] == "# comment" and config["universe"] == "vanilla"
+    config[1] = "executable = other.sh"
+    assert config["executable"] == "other.sh"
+    config[2] = "getenv = true"
+    assert not config.has_key("request_memory") and config["getenv"] == "true"
+    assert config.pop() == "request_disk = 1MB"
+    config.remove("queue")
+    del config[0]
+    config[0:1] = ["executable = third.sh"]
+    assert_index_consistent(config)
+    config.reverse()
+    assert_index_consistent(config)
+    config.sort()
+    assert_index_consistent(config)
+    config *= 2
+    assert_index_consistent(config)
+    config.clear()
+    assert not config.keys() and not config.key_index
+
+
+def test_text_cache_invalidated_on_mutation(config):
+    text, digest = config.as_text, config.content_hash
+    config["arguments"] = "z"
+    assert config.as_text != text and config.content_hash != digest
+    assert config.as_text.endswith("arguments=z\nqueue 2")
+
+
+def test_multiline_lines_are_split():
+    config = JobConfig(["executable = run.sh\nqueue"])
+    assert list(config) == ["executable = run.sh", "queue"]
+    assert config.key_index["queue"] == [1]
+
+
+def test_lines_setter(config):
+    config.lines = ["universe = vanilla", "queue"]
+    assert config.keys() == ["universe"]
+    assert_index_consistent(config)
+
+
+def test_from_file(tmp_path, config):
+    path = Path(tmp_path) / "job.sub"
+    path.write_text(config.as_text + "\n")
+    loaded = JobConfig.from_file(path)
+    assert list(loaded) == list(config) and loaded.path == path
+    assert loaded["request_memory"] == "1GB"
+    assert JobConfig.from_file(path, keep_path=False)._path is None
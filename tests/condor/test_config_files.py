@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_config_files.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Config File Tests.
+
+"""
+
+import pytest
+from path import Path
+
+from hexfarm.condor import core, description
+from hexfarm.condor.core import JobConfig, SubprocessSubmitBackend, write_config_file
+from hexfarm.condor.description import parse_submit_file
+
+
+@pytest.fixture
+def config():
+    return JobConfig(["executable = /bin/true", "queue"])
+
+
+def test_write_config_file_skips_unchanged(tmp_path, config):
+    path = write_config_file(config, Path(tmp_path) / "a.sub")
+    stamp = path.stat().st_mtime_ns
+    assert write_config_file(config, path) == path
+    assert path.stat().st_mtime_ns == stamp
+    assert path.text() == config.as_text
+
+
+def test_write_config_file_rewrites_deleted_file(tmp_path, config):
+    path = write_config_file(config, Path(tmp_path) / "a.sub")
+    path.remove()
+    write_config_file(config, path)
+    assert path.text() == config.as_text
+
+
+def test_write_config_file_rewrites_edited_file(tmp_path, config):
+    path = write_config_file(config, Path(tmp_path) / "a.sub")
+    path.write_text("queue 10\n")
+    write_config_file(config, path)
+    assert path.text() == config.as_text
+
+
+def test_write_config_lines_counts_as_written(tmp_path, config):
+    path = core.write_config_lines(config, Path(tmp_path) / "a.sub")
+    assert core._is_written(path, core.config_digest(config))
+
+
+def test_written_config_cache_is_bounded(tmp_path, config, monkeypatch):
+    monkeypatch.setattr(core, "WRITTEN_CONFIG_CACHE_SIZE", 3)
+    monkeypatch.setattr(core, "_WRITTEN_CONFIG_FILES", dict())
+    paths = [write_config_file(config, Path(tmp_path) / f"{i}.sub") for i in range(5)]
+    assert list(core._WRITTEN_CONFIG_FILES) == paths[2:]
+
+
+def test_subprocess_backend_prunes_anonymous_files(tmp_path):
+    backend = SubprocessSubmitBackend(Path(tmp_path), max_files=2)
+    configs = [JobConfig([f"arguments = {i}", "queue"]) for i in range(4)]
+    paths = []
+    for config in configs:
+        with backend.submit_file(config) as path:
+            assert path.exists()
+            paths.append(path)
+    assert [path.exists() for path in paths] == [False, False, True, True]
+    with backend.submit_file(configs[2]) as path:
+        assert path == paths[2]
+    with backend.submit_file(configs[0]) as path:
+        assert path.text() == configs[0].as_text
+    assert [path.exists() for path in paths] == [True, False, True, False]
+
+
+def test_subprocess_backend_keeps_named_files(tmp_path, config):
+    backend = SubprocessSubmitBackend(Path(tmp_path) / "anonymous", max_files=0)
+    with backend.submit_file(config, Path(tmp_path) / "named.sub") as path:
+        pass
+    assert path.exists()
+
+
+def test_parse_submit_file_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(description, "PARSED_SUBMIT_CACHE_SIZE", 2)
+    monkeypatch.setattr(description, "_PARSED_SUBMIT_FILES", dict())
+    paths = []
+    for i in range(3):
+        path = Path(tmp_path) / f"{i}.sub"
+        path.write_text(f"arguments = {i}\nqueue\n")
+        paths.append(path)
+    first = parse_submit_file(paths[0])
+    assert parse_submit_file(paths[0]) is first
+    parse_submit_file(paths[1])
+    parse_submit_file(paths[2])
+    assert list(description._PARSED_SUBMIT_FILES) == [paths[1], paths[2]]
+    assert parse_submit_file(paths[0]) is not first
+
+
+def test_parse_submit_file_rereads_changed_include(tmp_path):
+    include = Path(tmp_path) / "common.sub"
+    include.write_text("arguments = 1\n")
+    path = Path(tmp_path) / "main.sub"
+    path.write_text(f"include : {include}\nqueue\n")
+    first = parse_submit_file(path)
+    include.write_text("arguments = 22\n")
+    assert parse_submit_file(path) is not first
+    second = parse_submit_file(path)
+    include.remove()
+    assert not second.is_current()
+    with pytest.raises(FileNotFoundError):
+        parse_submit_file(path)
+
+
+def test_subprocess_backend_keeps_existing_named_files(tmp_path, config):
+    backend = SubprocessSubmitBackend(Path(tmp_path) / "anonymous")
+    named = Path(tmp_path) / "named.sub"
+    named.write_text("executable = mine.sh\nqueue")
+    with backend.submit_file(config, named) as path:
+        assert path.text() == "executable = mine.sh\nqueue"
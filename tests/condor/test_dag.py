@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_dag.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor DAGMan Tests.
+
+"""
+
+import pytest
+from path import Path
+
+from hexfarm.condor.core import JobConfig
+from hexfarm.condor.dag import Dag, DagNode, DagNodeStatus, DagRun
+
+
+def event_text(code, cluster, *details, message="Event."):
+    lines = [f"{code:03d} ({cluster:03d}.000.000) 2019-01-02 03:04:05 {message}"]
+    lines.extend(f"    {detail}" for detail in details)
+    return "\n".join(lines) + "\n...\n"
+
+
+def submitted(cluster, node):
+    return event_text(0, cluster, f"DAG Node: {node}", message="Job submitted.")
+
+
+def terminated(cluster, code=0):
+    return event_text(
+        5, cluster, f"(1) Normal termination (return value {code})", message="Done."
+    )
+
+
+def config(name):
+    return JobConfig([f"executable = {name}.sh", "queue"])
+
+
+@pytest.fixture
+def dag(tmp_path):
+    dag = Dag("pipe", Path(tmp_path))
+    dag.add_node("fetch", config("fetch"), retry=2)
+    dag.add_node("fit", config("fit"), parents="fetch", variables={"seed": 'a"b'})
+    dag.add_node("plot", config("plot"), parents=["fit"], post="check.sh")
+    return dag
+
+
+@pytest.mark.parametrize(
+    "name", ["PARENT", "child", "Job", "retry", "VARS", "has space", 'q"uote', "a+b"]
+)
+def test_invalid_node_names(name):
+    with pytest.raises(ValueError):
+        DagNode(name, config("x"))
+
+
+def test_valid_node_names():
+    for name in ("parents", "job1", "fit.step-2", "RETRY_"):
+        assert DagNode(name, config("x")).name == name
+
+
+def test_dependencies(dag):
+    assert dag.topological_order() == ["fetch", "fit", "plot"]
+    assert dag["fit"].parents == {"fetch"} and dag["fit"].children == {"plot"}
+    assert "plot" in dag and len(dag) == 3
+    with pytest.raises(KeyError):
+        dag.add_node("fit", config("fit"))
+    with pytest.raises(KeyError):
+        dag.add_dependency("fetch", "missing")
+    dag.add_dependency("plot", "fetch")
+    with pytest.raises(ValueError):
+        dag.topological_order()
+
+
+def test_write(dag, tmp_path):
+    dag_file = dag.write()
+    lines = dag_file.text().splitlines()
+    directory = Path(tmp_path).abspath()
+    assert lines == [
+        f"JOB fetch {directory / 'fetch.sub'}",
+        "RETRY fetch 2",
+        f"JOB fit {directory / 'fit.sub'}",
+        'VARS fit seed="a\\"b"',
+        f"JOB plot {directory / 'plot.sub'}",
+        "SCRIPT POST plot check.sh",
+        "PARENT fetch CHILD fit",
+        "PARENT fit CHILD plot",
+    ]
+    assert (directory / "fit.sub").text() == config("fit").as_text
+
+
+def test_dag_run_tracks_nodes_log(dag):
+    run = DagRun(dag)
+    dag.directory.makedirs_p()
+    with open(dag.nodes_log, "w") as log:
+        log.write(submitted(1, "fetch") + terminated(1, code=1))
+    assert run.poll() == {"fetch": DagNodeStatus.Failed}
+    with open(dag.nodes_log, "a") as log:
+        log.write(submitted(2, "fetch") + event_text(1, 2) + terminated(2))
+        log.write(submitted(3, "fit") + terminated(3))
+        log.write(submitted(4, "plot") + terminated(4))
+    changes = run.poll()
+    assert changes["fetch"] == DagNodeStatus.Done
+    assert run.attempts("fetch") == 2 and run.attempts("fit") == 1
+    assert run.status("plot") == DagNodeStatus.Submitted and not run.is_done
+    with open(dag.nodes_log, "a") as log:
+        log.write(event_text(16, 4, "(1) Normal termination (return value 0)"))
+    assert run.poll() == {"plot": DagNodeStatus.Done}
+    assert run.is_done
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_description.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+"""
+HexFarm Condor Submit Description Tests.
+
+"""
+
+import pytest
+from path import Path
+
+from hexfarm.condor.core import JobConfig
+from hexfarm.condor.description import SubmitQueue, parse_submit_lines
+
+
+def test_continuations_and_comments():
+    description = parse_submit_lines(
+        ["# comment", "arguments = a \\", "  b", "", "Output = out.txt", "queue 2"]
+    )
+    assert description["arguments"] == "a   b"
+    assert description.get("OUTPUT") == "out.txt"
+    (queue,) = description.queues
+    assert queue == SubmitQueue(2, line=6)
+    assert list(description.lines()) == [
+        "arguments = a   b",
+        "Output = out.txt",
+        "queue 2",
+    ]
+
+
+def test_include_is_inlined(tmp_path):
+    directory = Path(tmp_path)
+    (directory / "common.sub").write_text("executable = run.sh\n")
+    description = parse_submit_lines(["include : common.sub", "queue"], directory)
+    assert description["executable"] == "run.sh"
+    assert description.dependencies[0][0] == directory / "common.sub"
+
+
+def test_expand_macros(monkeypatch):
+    monkeypatch.setenv("HEXFARM_TEST_HOME", "/home/alice")
+    description = parse_submit_lines(
+        [
+            "base = $ENV(HEXFARM_TEST_HOME)/data",
+            "input = $(Base)/$(name:default).root",
+            "attribute = $$(Memory)",
+        ]
+    )
+    assert description.expand("input") == "/home/alice/data/default.root"
+    assert description.expand("input", name="x") == "/home/alice/data/x.root"
+    assert description.expand("attribute") == "$$(Memory)"
+    assert description.expand("missing", "none") == "none"
+
+
+def test_self_referencing_macro():
+    description = parse_submit_lines(["a = $(b)", "b = $(a)"])
+    with pytest.raises(ValueError):
+        description.expand("a")
+
+
+def test_iter_procs():
+    description = parse_submit_lines(
+        [
+            "executable = first.sh",
+            "arguments = $(Cluster).$(Process) $(item)",
+            "queue 1 in (x, y)",
+            "executable = second.sh",
+            "queue 2",
+        ]
+    )
+    assert description.cluster_count == 2
+    procs = [
+        (cluster, process, settings["arguments"])
+        for cluster, process, settings in description.iter_procs(first_cluster=5)
+    ]
+    assert procs == [(5, 0, "5.0 x"), (5, 1, "5.1 y"), (6, 0, "6.0 "), (6, 1, "6.1 ")]
+
+
+def test_queue_from_file_and_inline_table(tmp_path):
+    directory = Path(tmp_path)
+    (directory / "items.txt").write_text("a 1\nb 2\n")
+    description = parse_submit_lines(
+        [
+            "arguments = $(name)-$(value)",
+            "queue name, value from items.txt",
+            "queue name, value from (",
+            "c 3",
+            ")",
+        ],
+        directory,
+    )
+    arguments = [settings["arguments"] for _, _, settings in description.iter_procs()]
+    assert arguments == ["a-1", "b-2", "c-3"]
+
+
+def test_queue_matching(tmp_path):
+    directory = Path(tmp_path)
+    for name in ("a.root", "b.root", "c.txt"):
+        (directory / name).write_text("")
+    (directory / "d.root").mkdir()
+    description = parse_submit_lines(["queue input matching files *.root"], directory)
+    inputs = [settings for _, _, settings in description.iter_procs()]
+    assert len(inputs) == 2
+    (queue,) = description.queues
+    assert queue.rows(directory) == [{"input": "a.root"}, {"input": "b.root"}]
+
+
+def test_diff():
+    first = parse_submit_lines(["a = 1", "b = 2"])
+    second = parse_submit_lines(["a = 1", "b = 3", "c = 4"])
+    assert first.diff(second) == {"b": ("2", "3"), "c": (None, "4")}
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("arguments = $Fn(input)", "function macro $Fn()"),
+        ("seed = $INT(value)", "function macro $INT()"),
+        ("choice = $RANDOM_CHOICE(a, b)", "function macro $RANDOM_CHOICE()"),
+        ("queue input from ls *.root |", "queue from command"),
+        ("include command : make_config.sh", "include command"),
+        ("if defined name", "conditionals"),
+        ("nonsense", "invalid submit line"),
+    ],
+)
+def test_unsupported_syntax(line, message):
+    with pytest.raises(ValueError) as error:
+        parse_submit_lines(["executable = run.sh", line], "/missing")
+    assert str(error.value).startswith("None:2: " + message)
+
+
+def test_job_config_from_submit_file(tmp_path):
+    directory = Path(tmp_path)
+    (directory / "common.sub").write_text("executable = run.sh\n")
+    path = directory / "job.sub"
+    path.write_text("include : common.sub\narguments = a \\\n b\nqueue\n")
+    config = JobConfig.from_submit_file(path)
+    assert list(config) == ["executable = run.sh", "arguments = a  b", "queue"]
+    assert config.description.expand("executable") == "run.sh"
+    assert len(JobConfig.from_file(path)) == 4
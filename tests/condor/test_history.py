@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_history.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Job History Tests.
+
+"""
+
+import subprocess
+
+import numpy as np
+import pytest
+
+from hexfarm.condor import core, history
+from hexfarm.condor.history import (
+    HDF5HistoryStore,
+    PYARROW_SUPPORT,
+    ParquetHistoryStore,
+    ingest_history,
+    iter_history,
+    iter_history_chunks,
+    job_keys,
+    summarize_history,
+)
+from hexfarm.condor.local import LocalProcess
+
+ATTRIBUTES = ("Owner", "CompletionDate")
+
+
+class FixedCommands:
+    """Stand-In Answering every Condor Command with a Fixed Output."""
+
+    def __init__(self, output="", returncode=0):
+        self.output = output.encode()
+        self.returncode = returncode
+        self.calls = []
+
+    def run(self, name, args):
+        self.calls.append((name, list(args)))
+        return subprocess.CompletedProcess(
+            [name, *args], self.returncode, self.output, b""
+        )
+
+    @staticmethod
+    def open(result, **kwargs):
+        return LocalProcess(result, **kwargs)
+
+
+class FakeHistory:
+    """Stand-In for iter_history Listing the Newest Jobs First."""
+
+    def __init__(self, records, fail_after=None):
+        self.records = sorted(records, key=lambda record: -record[3])
+        self.fail_after = fail_after
+        self.calls = []
+
+    def __call__(self, *attributes, completed_since=None, **kwargs):
+        self.calls.append(completed_since)
+        for index, record in enumerate(self.records):
+            if index == self.fail_after:
+                raise subprocess.CalledProcessError(1, "condor_history")
+            if completed_since is None or record[3] >= completed_since:
+                yield record
+
+
+def records(*dates):
+    return [(index + 1, 0, "alice", float(date)) for index, date in enumerate(dates)]
+
+
+def stores(tmp_path):
+    yield HDF5HistoryStore(tmp_path / "history.h5", ATTRIBUTES)
+    if PYARROW_SUPPORT:
+        yield ParquetHistoryStore(tmp_path / "parquet", ATTRIBUTES)
+
+
+def test_iter_history_arguments(monkeypatch):
+    commands = FixedCommands("1\t0\talice\t100\n2\t3\tbob\t200\n")
+    monkeypatch.setattr(core.CondorCommand, "local", commands)
+    rows = list(iter_history(*ATTRIBUTES, constraint="Owner == 1", limit=5))
+    assert rows == [(1, 0, "alice", 100), (2, 3, "bob", 200)]
+    ((name, args),) = commands.calls
+    assert name == "history"
+    assert args[:4] == ["-constraint", "Owner == 1", "-limit", "5"]
+    assert args[4:] == ["-af:t", "ClusterId", "ProcId", *ATTRIBUTES]
+
+
+def test_iter_history_raises_on_failure(monkeypatch):
+    monkeypatch.setattr(core.CondorCommand, "local", FixedCommands("", 1))
+    with pytest.raises(subprocess.CalledProcessError):
+        list(iter_history(*ATTRIBUTES))
+
+
+def test_history_chunks():
+    chunks = list(iter_history_chunks(records(1, 2, 3), ATTRIBUTES, chunk_size=2))
+    assert [len(chunk["ClusterId"]) for chunk in chunks] == [2, 1]
+    assert chunks[0]["ClusterId"].dtype == np.int64
+    assert chunks[0]["Owner"].dtype == object
+    assert list(chunks[1]["CompletionDate"]) == [3.0]
+
+
+def test_job_keys():
+    keys = job_keys([1, 1, 2], [0, 1, 0])
+    assert len(set(keys)) == 3 and keys[1] == (1 << 32) + 1
+
+
+def test_ingest_history_is_incremental(tmp_path, monkeypatch):
+    for store in stores(tmp_path):
+        fake = FakeHistory(records(10, 20, 30))
+        monkeypatch.setattr(history, "iter_history", fake)
+        assert ingest_history(store, chunk_size=2) == 3
+        assert store.last_completion_date == 30.0
+        fake.records = sorted(records(10, 20, 30, 40), key=lambda r: -r[3])
+        assert ingest_history(store, chunk_size=2) == 1
+        assert fake.calls == [None, 30.0]
+        frame = store.to_frame()
+        assert sorted(frame["CompletionDate"]) == [10.0, 20.0, 30.0, 40.0]
+
+
+def test_ingest_history_resumes_without_duplicates(tmp_path, monkeypatch):
+    for store in stores(tmp_path):
+        monkeypatch.setattr(
+            history, "iter_history", FakeHistory(records(*range(1, 8)), fail_after=4)
+        )
+        with pytest.raises(subprocess.CalledProcessError):
+            ingest_history(store, chunk_size=2)
+        assert store.last_completion_date is None
+        assert len(store.to_frame()) == 4
+        monkeypatch.setattr(history, "iter_history", FakeHistory(records(*range(1, 8))))
+        assert ingest_history(store, chunk_size=2) == 3
+        frame = store.to_frame()
+        assert len(frame) == 7 and not frame.duplicated(["ClusterId", "ProcId"]).any()
+        assert store.last_completion_date == 7.0
+        assert not len(store.uncommitted_keys())
+
+
+def test_ingest_history_keeps_jobs_completed_in_boundary_second(tmp_path, monkeypatch):
+    for store in stores(tmp_path):
+        first = records(10, 30, 30)
+        monkeypatch.setattr(history, "iter_history", FakeHistory(first))
+        assert ingest_history(store) == 3
+        assert sorted(store.boundary_keys()) == sorted(job_keys([2, 3], [0, 0]))
+        late = [(4, 0, "alice", 30.0), (5, 0, "alice", 40.0)]
+        monkeypatch.setattr(history, "iter_history", FakeHistory(first + late))
+        assert ingest_history(store) == 2
+        frame = store.to_frame()
+        assert len(frame) == 5 and not frame.duplicated(["ClusterId", "ProcId"]).any()
+        assert store.last_completion_date == 40.0
+        assert list(store.boundary_keys()) == list(job_keys([5], [0]))
+        assert ingest_history(store) == 0
+
+
+def test_summarize_history():
+    frame = history.pd.DataFrame(
+        {
+            "Owner": ["a", "a", "b"],
+            "ProcId": [0, 1, 0],
+            "QDate": [0, 0, 0],
+            "JobStartDate": [10, 20, 5],
+            "RemoteWallClockTime": [100, 300, 50],
+            "CommittedTime": [100, 100, 50],
+        }
+    )
+    summary = summarize_history(frame)
+    assert summary.loc["a", "Jobs"] == 2
+    assert summary.loc["a", "MeanQueueWait"] == 15
+    assert summary.loc["a", "GoodputFraction"] == pytest.approx(0.5)
+    assert summary.loc["b", "GoodputFraction"] == 1.0
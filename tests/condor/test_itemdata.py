@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_itemdata.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Itemdata Tests.
+
+"""
+
+import stat
+
+import numpy as np
+import pandas as pd
+import pytest
+from path import Path
+
+from hexfarm.condor import itemdata
+from hexfarm.condor.core import JobConfig
+from hexfarm.condor.itemdata import (
+    format_itemdata_row,
+    itemdata_columns,
+    iter_itemdata_lines,
+    write_itemdata,
+)
+from hexfarm.shell import ME
+
+
+@pytest.fixture
+def records():
+    return np.array([(1, 0.5), (2, 1.5)], dtype=[("seed", int), ("scale", float)])
+
+
+def test_itemdata_columns(records):
+    assert itemdata_columns(records) == ("seed", "scale")
+    assert itemdata_columns(pd.DataFrame(records)) == ("seed", "scale")
+    assert itemdata_columns([(1, 2)]) is None
+    assert itemdata_columns(np.arange(3)) is None
+
+
+def test_itemdata_lines(records):
+    expected = ["1,0.5\n", "2,1.5\n"]
+    assert list(iter_itemdata_lines(records)) == expected
+    assert list(iter_itemdata_lines(pd.DataFrame(records))) == expected
+    assert list(iter_itemdata_lines(iter([(1, 0.5), (2, 1.5)]))) == expected
+    assert list(iter_itemdata_lines(["a", "b"], separator=" ")) == ["a\n", "b\n"]
+    assert format_itemdata_row(["x", 1], " ") == "x 1\n"
+    with pytest.raises(ValueError):
+        format_itemdata_row("two\nlines")
+
+
+def test_write_itemdata_to_path(tmp_path):
+    path = write_itemdata(range(3), Path(tmp_path) / "sub" / "items.txt")
+    assert path.text() == "0\n1\n2\n"
+
+
+def test_write_itemdata_is_content_addressed(tmp_path):
+    first = write_itemdata(range(5), directory=tmp_path)
+    second = write_itemdata(iter(range(5)), directory=tmp_path)
+    other = write_itemdata(range(6), directory=tmp_path)
+    assert first == second != other
+    assert first.ext == ".items" and first.text() == "0\n1\n2\n3\n4\n"
+    assert not list(Path(tmp_path).files("*.tmp"))
+
+
+def test_default_directory_is_per_user(tmp_path, monkeypatch):
+    assert ME in itemdata.ITEMDATA_DIRECTORY.name
+    directory = Path(tmp_path) / f"hexfarm-itemdata-{ME}"
+    monkeypatch.setattr(itemdata, "ITEMDATA_DIRECTORY", directory)
+    path = write_itemdata(["a"])
+    assert path.parent == directory
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+
+def test_queue_from_streams_items(tmp_path, records):
+    config = JobConfig(["executable = run.sh"])
+    path = config.queue_from(records, directory=tmp_path)
+    assert config[-1] == f"queue seed, scale from {path}"
+    assert path.text() == "1,0.5\n2,1.5\n"
+    existing = Path(tmp_path) / "given.txt"
+    assert config.queue_from(existing, "x") == existing.abspath()
+    with pytest.raises(TypeError):
+        config.queue_from([1, 2])
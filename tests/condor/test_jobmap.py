@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_jobmap.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Job Collection Tests.
+
+"""
+
+from itertools import chain
+
+import pytest
+from path import Path
+
+from hexfarm.condor.core import (
+    ClusterJobRange,
+    Job,
+    JobCompletedException,
+    JobConfig,
+    JobMap,
+    submit_config,
+)
+from hexfarm.condor.local import LocalCondor
+
+
+def test_cluster_job_range_views():
+    job_range = ClusterJobRange(12, 4, 2, logfile="jobs.log", submitter="alice")
+    assert len(job_range) == 4
+    assert list(job_range.job_ids()) == ["12.2", "12.3", "12.4", "12.5"]
+    job = job_range[1]
+    assert isinstance(job, Job) and job.job_id == "12.3"
+    assert job.logfile == "jobs.log" and job.submitter == "alice"
+    assert [job.job_id for job in job_range[-2:]] == ["12.4", "12.5"]
+    assert [job.job_id for job in job_range] == list(job_range.job_ids())
+    assert "12.2" in job_range and job in job_range
+    assert "12.1" not in job_range and "13.2" not in job_range
+    assert "garbage" not in job_range
+    assert repr(job_range) == "ClusterJobRange(12.2-5)"
+
+
+def test_cluster_job_range_bookkeeping():
+    job_range = ClusterJobRange(1, 5)
+    assert job_range.mark_completed(0, 1, 9) == {0, 1}
+    assert job_range.mark_completed(1) == set()
+    job_range.mark_removed(1, 2)
+    assert job_range.completed == {0}
+    assert job_range.mark_completed(2) == set()
+    assert list(job_range.members()) == [0, 3, 4]
+    assert list(job_range.active()) == [3, 4]
+    assert job_range.member_count == 3 and job_range.active_count == 2
+
+
+def test_job_map_with_ranges_and_jobs():
+    job_map = JobMap(
+        ClusterJobRange(1, 3), Job(None, "2.0"), remove_when_clearing=False
+    )
+    assert len(job_map) == 4
+    assert list(job_map) == ["2.0", "1.0", "1.1", "1.2"]
+    assert job_map["1.2"].job_id == "1.2"
+    assert "1.1" in job_map and "1.3" not in job_map
+    with pytest.raises(KeyError):
+        job_map["1.3"]
+    job_map.discard("1.1")
+    assert "1.1" not in job_map and len(job_map) == 3
+    assert job_map.pop("2.0").job_id == "2.0"
+    assert job_map.pop("2.0", None) is None
+    with pytest.raises(KeyError):
+        job_map.pop("2.0")
+    job_map.clear()
+    assert len(job_map) == 0 and not job_map.ranges
+
+
+def test_job_map_drops_emptied_range():
+    job_map = JobMap(ClusterJobRange(3, 2), remove_when_clearing=False)
+    job_map.discard("3.0", "3.1")
+    assert not job_map.ranges
+
+
+def test_job_map_remove_completed_jobs(tmp_path):
+    logfile = Path(tmp_path) / "jobs.log"
+    logfile.write_text(
+        "000 (005.001.000) 2019-01-02 03:04:05 Job submitted from host.\n...\n"
+        "005 (005.001.000) 2019-01-02 03:04:06 Job terminated.\n"
+        "\t(1) Normal termination (return value 0)\n...\n"
+    )
+    job_map = JobMap(ClusterJobRange(5, 3, logfile=logfile), remove_completed_jobs=True)
+    with pytest.raises(JobCompletedException) as error:
+        job_map["5.1"]
+    assert error.value.job.job_id == "5.1"
+    assert list(job_map) == ["5.0", "5.2"]
+
+
+def test_submit_config_returns_cluster_ranges(tmp_path):
+    config = JobConfig(
+        [
+            "executable = /bin/true",
+            f"initialdir = {tmp_path}",
+            "queue 2",
+            "executable = /bin/false",
+            "queue 3",
+        ]
+    )
+    with LocalCondor(workers=2, execute=False):
+        ranges = submit_config(config, logfile=tmp_path / "jobs.log")
+    assert all(isinstance(job_range, ClusterJobRange) for job_range in ranges)
+    assert [len(job_range) for job_range in ranges] == [2, 3]
+    jobs = tuple(chain.from_iterable(ranges))
+    assert all(isinstance(job, Job) for job in jobs) and len(jobs) == 5
+    assert all(job.config is config for job in jobs)
+    assert len({job.job_id for job in jobs}) == 5
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_journal.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+"""
+HexFarm Condor Job Journal Tests.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from path import Path
+
+from hexfarm.condor.core import ClusterJobRange, Job, JobConfig, JobManager, JobMap
+from hexfarm.condor.journal import JobJournal
+
+
+def test_job_map_restores_from_journal(tmp_path):
+    path = Path(tmp_path) / "jobs.db"
+    with JobJournal(path, flush_interval=60) as journal:
+        job_map = JobMap(journal=journal.bind("map"), remove_when_clearing=False)
+        job_map.add_range(ClusterJobRange(7, 3, submitter="alice"))
+        job_map.update({"9.0": Job(None, "9.0", submitter="bob")})
+        job_map.discard("7.1")
+        journal.bind("map").mark_completed("7.2", "9.0")
+        journal.bind("map").save_offsets({Path(tmp_path) / "jobs.log": 120})
+    with JobJournal(path) as journal:
+        restored = JobMap(remove_when_clearing=False).restore(journal.bind("map"))
+        assert sorted(restored) == ["7.0", "7.2", "9.0"]
+        (job_range,) = restored.ranges
+        assert job_range.submitter == "alice"
+        assert job_range.completed == {2} and job_range.removed == {1}
+        assert restored._is_completed("9.0") and not restored._is_completed("7.0")
+        assert journal.bind("map").offsets() == {Path(tmp_path) / "jobs.log": 120}
+        assert not list(journal.bind("other").ranges())
+
+
+def test_job_manager_restores_runners(tmp_path):
+    path = Path(tmp_path) / "jobs.db"
+    config = JobConfig(["executable = /bin/true", "queue"])
+    with JobJournal(path) as journal:
+        manager = JobManager(journal=journal)
+        runner = manager.add_config("first", config, logfile="jobs.log")
+        runner.jobmap.add_range(ClusterJobRange(4, 2))
+    with JobJournal(path) as journal:
+        restored = JobManager.restore(journal, remove_when_clearing=False)
+        runner = restored["first"]
+        assert list(runner.config) == list(config)
+        assert runner.logfile == "jobs.log"
+        assert sorted(runner.jobmap) == ["4.0", "4.1"]
+
+
+def test_journal_writes_from_threads(tmp_path):
+    path = Path(tmp_path) / "jobs.db"
+
+    def record(cluster):
+        journal.bind("map").add_range(ClusterJobRange(cluster, 2))
+        journal.bind("map").mark_completed(f"{cluster}.0")
+
+    with JobJournal(path, batch_size=3) as journal:
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(record, range(100)))
+    with JobJournal(path) as journal:
+        ranges = list(journal.bind("map").ranges())
+        assert sorted(r.cluster for r in ranges) == list(range(100))
+        assert all(r.completed == {0} for r in ranges)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_local.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Local Stand-In Tests.
+
+"""
+
+import subprocess
+import time
+
+import pytest
+from path import Path
+
+from hexfarm.condor import core
+from hexfarm.condor.core import JobConfig, submit_config
+from hexfarm.condor.local import (
+    LocalCondor,
+    LocalProcess,
+    LocalSubmitBackend,
+    evaluate_constraint,
+)
+from hexfarm.condor.userlog import JobEventType, JobStatus, parse_job_events
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def config(directory, *lines, queue="queue 2"):
+    return JobConfig(
+        [
+            "executable = /bin/true",
+            f"initialdir = {directory}",
+            "log = jobs.log",
+            *lines,
+            queue,
+        ]
+    )
+
+
+def events(logfile):
+    return [event.event_type for event in parse_job_events(Path(logfile).text())]
+
+
+def test_evaluate_constraint():
+    ad = {"ClusterId": 3, "ProcId": 1, "Owner": "alice", "JobStatus": 2}
+    assert evaluate_constraint(None, ad)
+    assert evaluate_constraint("ClusterId == 3 && ProcId == 1", ad)
+    assert evaluate_constraint('owner == "alice" || ClusterId == 4', ad)
+    assert evaluate_constraint("MY.JobStatus =?= 2", ad)
+    assert not evaluate_constraint("TARGET.Missing > 1", ad)
+    assert not evaluate_constraint("ClusterId == 3 && ProcId != 1", ad)
+
+
+def test_local_process():
+    result = subprocess.CompletedProcess(["x"], 2, b"a\nb\n", b"oops")
+    process = LocalProcess(result, universal_newlines=True)
+    assert list(process.stdout) == ["a\n", "b\n"]
+    assert process.wait() == process.poll() == 2
+    assert LocalProcess(result).communicate() == (b"a\nb\n", b"oops")
+
+
+def test_activation_restores_commands():
+    saved = core.CondorCommand.local, core._DEFAULT_SUBMIT_BACKEND
+    local = LocalCondor(workers=1, execute=False)
+    with local:
+        assert local.is_active and core.CondorCommand.local is local
+        assert local.activate() is local
+    assert not local.is_active
+    assert (core.CondorCommand.local, core._DEFAULT_SUBMIT_BACKEND) == saved
+
+
+def test_simulated_jobs_write_user_log(tmp_path):
+    logfile = Path(tmp_path) / "jobs.log"
+    exit_codes = lambda job: job.process + 3
+    with LocalCondor(workers=2, execute=False, exit_code=exit_codes) as local:
+        (job_range,) = submit_config(config(tmp_path), logfile=logfile)
+        assert local.wait_idle(timeout=10)
+    assert sorted(job.exit_code for job in local.history) == [3, 4]
+    assert events(logfile).count(JobEventType.Submit) == 2
+    assert events(logfile).count(JobEventType.JobTerminated) == 2
+    assert not local.jobs
+
+
+def test_executed_jobs_write_output(tmp_path):
+    script = Path(tmp_path) / "run.sh"
+    script.write_text('#!/bin/sh\necho "$1"\nexit 2\n')
+    script.chmod(0o755)
+    job = JobConfig(
+        [
+            f"executable = {script}",
+            f"initialdir = {tmp_path}",
+            "arguments = $(Process)",
+            "output = out.$(Process)",
+            "queue 2",
+        ]
+    )
+    with LocalCondor(workers=2) as local:
+        submit_config(job)
+        assert local.wait_idle(timeout=10)
+    assert (Path(tmp_path) / "out.1").text() == "1\n"
+    assert {job.exit_code for job in local.history} == {2}
+
+
+def test_queries(tmp_path):
+    with LocalCondor(workers=1, execute=False, runtime=30, owner="alice") as local:
+        (job_range,) = submit_config(config(tmp_path))
+        first = job_range.job_id(0)
+        wait_for(lambda: local.jobs[first].status == JobStatus.Running)
+        result = local.run("q", ["-constraint", "JobStatus == 2", "-af:t", "ProcId"])
+        assert result.stdout == b"0\n"
+        result = local.run("q", ["alice", "-af", "ClusterId", "Owner"])
+        assert result.stdout.decode().split("\n")[1] == f"{job_range.cluster} alice"
+        result = local.run("status", ["-af:t", "Cpus", "State"])
+        assert result.stdout == b"0\tUnclaimed\n"
+        assert local.run("missing", []).returncode == 1
+        local.run("rm", [first])
+        history = local.run("history", ["-af:t", "ClusterId", "ProcId", "JobStatus"])
+        assert history.stdout.decode() == f"{job_range.cluster}\t0\t3\n"
+
+
+def test_hold_and_remove_interrupt_simulated_runtime(tmp_path):
+    logfile = Path(tmp_path) / "jobs.log"
+    with LocalCondor(workers=1, execute=False, runtime=60) as local:
+        (job_range,) = submit_config(config(tmp_path, queue="queue"), logfile=logfile)
+        job_id = job_range.job_id(0)
+        wait_for(lambda: local.jobs[job_id].status == JobStatus.Running)
+        start = time.monotonic()
+        local.run("hold", [job_id])
+        local.run("release", [job_id])
+        wait_for(lambda: local.jobs[job_id].status == JobStatus.Running)
+        assert local.jobs[job_id].starts == 2
+        local.run("rm", [job_id])
+        assert local.wait_idle(timeout=10)
+    assert time.monotonic() - start < 10
+    assert events(logfile)[-1] == JobEventType.JobAborted
+    assert local.history[0].status == JobStatus.Removed
+
+
+def test_shutdown_interrupts_running_jobs(tmp_path):
+    start = time.monotonic()
+    with LocalCondor(workers=2, execute=False, runtime=60, start_latency=0.05):
+        submit_config(config(tmp_path, queue="queue 4"))
+    assert time.monotonic() - start < 10
+
+
+def test_condor_wait(tmp_path):
+    logfile = Path(tmp_path) / "jobs.log"
+    with LocalCondor(workers=2, execute=False, runtime=0.05) as local:
+        submit_config(config(tmp_path), logfile=logfile)
+        assert local.run("wait", ["-wait", "0", str(logfile)]).returncode == 1
+        assert local.run("wait", [str(logfile)]).returncode == 0
+        assert not local.jobs
+
+
+def test_local_backend_submits_without_activation(tmp_path):
+    saved = core.CondorCommand.local, core.default_submit_backend()
+    backend = LocalSubmitBackend(2, Path(tmp_path) / "submit")
+    try:
+        (job_range,) = submit_config(config(tmp_path), backend=backend)
+        assert (core.CondorCommand.local, core._DEFAULT_SUBMIT_BACKEND) == saved
+        assert not backend.condor.is_active
+        assert backend.condor.wait_idle(timeout=10)
+        assert len(job_range) == 2 and len(backend.condor.history) == 2
+    finally:
+        backend.shutdown()
+    assert (core.CondorCommand.local, core._DEFAULT_SUBMIT_BACKEND) == saved
+
+
+def test_local_backend_context_restores_commands(tmp_path):
+    saved = core.CondorCommand.local, core.default_submit_backend()
+    with LocalSubmitBackend(condor=LocalCondor(1, execute=False)) as backend:
+        assert core.CondorCommand.local is backend.condor
+        submit_config(config(tmp_path), backend=backend)
+        assert backend.condor.wait_idle(timeout=10)
+    assert (core.CondorCommand.local, core._DEFAULT_SUBMIT_BACKEND) == saved
+
+
+def test_local_backend_resolves_relative_paths_against_cwd(tmp_path, monkeypatch):
+    directory = Path(tmp_path)
+    monkeypatch.chdir(directory)
+    script = directory / "run.sh"
+    script.write_text("#!/bin/sh\necho ran\n")
+    script.chmod(0o755)
+    job = JobConfig(
+        ["executable = run.sh", "output = out.txt", "log = jobs.log", "queue 1"]
+    )
+    backend = LocalSubmitBackend(2, directory / "submit")
+    try:
+        backend.submit(job)
+        assert backend.condor.wait_idle(timeout=10)
+    finally:
+        backend.shutdown()
+    (finished,) = backend.condor.history
+    assert finished.exit_code == 0
+    assert finished.settings["executable"] == str(script)
+    assert (directory / "out.txt").text() == "ran\n"
+    assert (directory / "jobs.log").exists()
+
+
+def test_local_backend_resolves_initialdir_against_cwd(tmp_path, monkeypatch):
+    directory = Path(tmp_path)
+    monkeypatch.chdir(directory)
+    (directory / "bin").mkdir()
+    script = directory / "bin" / "run.sh"
+    script.write_text("#!/bin/sh\necho ran > ran.txt\n")
+    script.chmod(0o755)
+    (directory / "work").mkdir()
+    job = JobConfig(["executable = bin/run.sh", "initialdir = work", "queue"])
+    backend = LocalSubmitBackend(1, directory / "submit")
+    try:
+        backend.submit(job, directory / "submit" / "named" / "job.sub")
+        assert backend.condor.wait_idle(timeout=10)
+    finally:
+        backend.shutdown()
+    (finished,) = backend.condor.history
+    assert finished.exit_code == 0
+    assert (directory / "work" / "ran.txt").text() == "ran\n"
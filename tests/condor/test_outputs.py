@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_outputs.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+"""
+HexFarm Condor Output Collection Tests.
+
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from path import Path
+
+from hexfarm.condor import outputs
+from hexfarm.condor.aio import AsyncConfigRunner
+from hexfarm.condor.callbacks import CompletionWatcher
+from hexfarm.condor.core import ConfigRunner, JobConfig, JobMap
+from hexfarm.condor.local import LocalCondor
+from hexfarm.condor.outputs import (
+    OutputCollector,
+    job_output_paths,
+    merge_hdf5,
+    merge_root_histograms,
+    merged_name,
+)
+
+
+class RecordingOutputs:
+    """Outputs Recording the Jobs Handed Over by a Runner."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def add(self, *jobs):
+        self.jobs.extend(jobs)
+
+
+@pytest.fixture
+def watcher():
+    with CompletionWatcher(min_interval=0.01, max_interval=0.05) as watcher:
+        yield watcher
+
+
+def exit_config(directory):
+    script = Path(directory) / "run.sh"
+    script.write_text('#!/bin/sh\necho "$1"\nexit "$1"\n')
+    script.chmod(0o755)
+    return JobConfig(
+        [
+            f"executable = {script}",
+            f"initialdir = {directory}",
+            "log = jobs.log",
+            "arguments = $(Process)",
+            "output = out.$(Process).txt",
+            "queue 2",
+        ]
+    )
+
+
+def test_job_output_paths():
+    settings = {
+        "initialdir": "work",
+        "output": "out.txt",
+        "transfer_output_files": "a/hist.root, data.h5",
+        "transfer_output_remaps": '"data.h5 = renamed.h5"',
+    }
+    assert job_output_paths(settings, "/base") == (
+        ("output", 0, Path("/base/work/out.txt")),
+        ("transfer_output_files", 0, Path("/base/work/hist.root")),
+        ("transfer_output_files", 1, Path("/base/work/renamed.h5")),
+    )
+
+
+def test_merged_name():
+    assert merged_name("out.$(Process).h5") == "out.h5"
+    assert merged_name("$(Cluster)_$(Process).root") == "merged.root"
+
+
+def test_runners_record_outputs_of_submissions(tmp_path):
+    with LocalCondor(workers=2, execute=False):
+        runner = ConfigRunner(
+            exit_config(tmp_path),
+            Path(tmp_path) / "job.sub",
+            Path(tmp_path) / "jobs.log",
+            JobMap(),
+            outputs=RecordingOutputs(),
+        )
+        synchronous = runner.submit()
+        loop = asyncio.new_event_loop()
+        try:
+            asynchronous = loop.run_until_complete(AsyncConfigRunner(runner).submit())
+        finally:
+            loop.close()
+    assert runner.outputs.jobs == [*synchronous, *asynchronous]
+    assert len(runner.jobmap) == 4
+
+
+@pytest.mark.parametrize("only_successful, collected", [(True, 1), (False, 2)])
+def test_collect_only_successful_jobs(tmp_path, watcher, only_successful, collected):
+    directory = Path(tmp_path)
+    with OutputCollector(
+        directory / "merged", watcher=watcher, only_successful=only_successful
+    ) as collector:
+        with LocalCondor(workers=2):
+            runner = ConfigRunner(
+                exit_config(directory),
+                directory / "job.sub",
+                directory / "jobs.log",
+                JobMap(),
+                outputs=collector,
+            )
+            runner.submit()
+            assert collector.finish(timeout=10) == dict()
+    (paths,) = collector.gathered().values()
+    assert sorted(paths) == [directory / f"out.{i}.txt" for i in range(collected)]
+
+
+def test_merge_hdf5(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    directory = Path(tmp_path)
+    for index in range(2):
+        with h5py.File(directory / f"{index}.h5", "w") as file:
+            file["group/values"] = np.arange(3) + 3 * index
+    merge_hdf5([directory / "0.h5", directory / "1.h5"], directory / "all.h5")
+    with h5py.File(directory / "all.h5", "r") as file:
+        assert list(file["group/values"][()]) == list(range(6))
+
+
+def test_merge_root_histograms_skips_unconvertible(tmp_path, monkeypatch):
+    uproot = pytest.importorskip("uproot", minversion="4")
+    pytest.importorskip("boost_histogram")
+    monkeypatch.setattr(outputs, "ROOT_HISTOGRAM_CLASSES", ("TH1", "TObjString"))
+    directory = Path(tmp_path)
+    edges = np.array([0.0, 1.0, 2.0])
+    for index in range(2):
+        with uproot.recreate(directory / f"{index}.root") as file:
+            file["h"] = (np.array([1.0, 2.0]) * (index + 1), edges)
+            file["note"] = "not a histogram"
+    output = merge_root_histograms(
+        [directory / "0.root", directory / "1.root"], directory / "all.root"
+    )
+    with uproot.open(output) as file:
+        assert file.keys(cycle=False) == ["h"]
+        assert list(file["h"].values()) == [3.0, 6.0]
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_pool.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Pool Capacity Tests.
+
+"""
+
+import pytest
+
+from hexfarm.condor.core import (
+    JobConfig,
+    job_requests,
+    machine_constraint,
+    parse_quantity,
+    pool_batch_size,
+    sized_config,
+)
+from hexfarm.condor.query import PoolSnapshot
+
+
+@pytest.fixture
+def snapshot():
+    return PoolSnapshot(
+        [
+            ("Partitionable", "Unclaimed", 8, 16384, 10 << 20, 0),
+            ("Static", "Unclaimed", 4, 8192, 1 << 20, 1),
+            ("Static", "Claimed", 4, 8192, 1 << 20, 0),
+        ]
+    )
+
+
+def config(*lines):
+    return JobConfig(["executable = run.sh", *lines, "queue"])
+
+
+def test_parse_quantity():
+    assert parse_quantity("2G") == 2048
+    assert parse_quantity("1500") == 1500
+    assert parse_quantity("1.5 KB") == 1
+    assert parse_quantity("3k", unit="K") == 3
+    assert parse_quantity("100", default_unit="K") == 1
+    assert parse_quantity("ifthenelse(x, 1, 2)") is None
+
+
+def test_job_requests():
+    assert job_requests(config()) == dict(cpus=1, memory=0, disk=0, gpus=0)
+    requests = job_requests(
+        config("request_cpus = 2", "request_memory = 4G", "request_disk = 2M")
+    )
+    assert requests == dict(cpus=2, memory=4096, disk=2048, gpus=0)
+    assert job_requests(config("request_cpus = $(n)"))["cpus"] == 1
+
+
+@pytest.mark.parametrize(
+    "requirements, constraint",
+    [
+        (None, None),
+        ('TARGET.OpSys == "LINUX"', 'OpSys == "LINUX"'),
+        ('(target.Arch == "X86_64") && HasDocker', '(Arch == "X86_64") && HasDocker'),
+        ("TARGET.Memory >= MY.RequestMemory", None),
+        ('my.Owner != "bob"', None),
+        ("Memory >= RequestMemory", None),
+        ("TARGET.Disk > request_disk", None),
+        ("TARGET.RequestsLeft > 0", "RequestsLeft > 0"),
+    ],
+)
+def test_machine_constraint(requirements, constraint):
+    lines = () if requirements is None else (f"requirements = {requirements}",)
+    assert machine_constraint(config(*lines)) == constraint
+
+
+def test_sized_config():
+    sized = sized_config(config("arguments = x"), 7)
+    assert sized[-1] == "queue 7" and sized["arguments"] == "x"
+    assert sized_config(JobConfig(["queue", "queue"]), 3) is None
+    assert sized_config(JobConfig(["queue x in (a b)"]), 3) is None
+
+
+def test_pool_capacity_and_reserve(snapshot):
+    assert len(snapshot) == 3
+    assert snapshot.capacity() == 9
+    assert snapshot.capacity(cpus=2, memory=4096) == 5
+    assert snapshot.capacity(gpus=1) == 1
+    reserved = snapshot.reserve(3, cpus=2, memory=4096)
+    assert reserved.capacity(cpus=2, memory=4096) == 2
+    assert snapshot.capacity(cpus=2, memory=4096) == 5
+
+
+def test_pool_batch_size(snapshot):
+    job = config("request_cpus = 2", "request_memory = 4G")
+    assert pool_batch_size(job, snapshot=snapshot) == 5
+    assert pool_batch_size(job, snapshot=snapshot, limit=3) == 3
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_query.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Queue Query Tests.
+
+"""
+
+import subprocess
+from itertools import islice
+
+import numpy as np
+import pytest
+
+from hexfarm.condor import core
+from hexfarm.condor.core import current_jobs, iter_jobs, iter_slots, query_jobs
+from hexfarm.condor.local import LocalProcess
+from hexfarm.condor.query import (
+    JobColumns,
+    iter_ad_records,
+    iter_autoformat,
+    iter_json_ads,
+    parse_classad_value,
+)
+
+
+class FixedCommands:
+    """Stand-In Answering every Condor Command with a Fixed Output."""
+
+    def __init__(self, output="", returncode=0):
+        self.output = output.encode()
+        self.returncode = returncode
+        self.calls = []
+
+    def run(self, name, args):
+        self.calls.append((name, list(args)))
+        return subprocess.CompletedProcess(
+            [name, *args], self.returncode, self.output, b""
+        )
+
+    @staticmethod
+    def open(result, **kwargs):
+        return LocalProcess(result, **kwargs)
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    def install(output="", returncode=0):
+        commands = FixedCommands(output, returncode)
+        monkeypatch.setattr(core.CondorCommand, "local", commands)
+        return commands
+
+    return install
+
+
+def test_parse_classad_value():
+    assert parse_classad_value("undefined") is None
+    assert parse_classad_value("12") == 12
+    assert parse_classad_value("1.5") == 1.5
+    assert parse_classad_value("true") is True
+    assert parse_classad_value("false") is False
+    assert parse_classad_value("alice") == "alice"
+
+
+def test_iter_autoformat():
+    lines = ["1\t0\talice\n", "\n", "1\t1\tsome\tname\n", "broken\n"]
+    assert list(iter_autoformat(lines, 3)) == [
+        (1, 0, "alice"),
+        (1, 1, "some\tname"),
+    ]
+
+
+def test_iter_json_ads_across_chunks():
+    text = '[\n{"ClusterId": 1, "ProcId": 0},\n{"ClusterId": 1, "ProcId": 1}\n]\n'
+    chunks = [text[index : index + 7] for index in range(0, len(text), 7)]
+    ads = list(iter_json_ads(chunks))
+    assert ads == [{"ClusterId": 1, "ProcId": 0}, {"ClusterId": 1, "ProcId": 1}]
+    assert list(iter_ad_records(ads, ("ProcId", "Missing"))) == [(0, None), (1, None)]
+
+
+def test_job_columns_types():
+    columns = JobColumns.from_records(
+        [(1, 0, 5, 2, "alice"), (1, 1, 6, None, "bob"), (2, 0, 7, 3.5, None)],
+        ("Count", "Value", "Owner"),
+    )
+    assert len(columns) == 3
+    assert columns.column("Count").dtype == np.int64
+    value = columns.column("Value")
+    assert value.dtype == float and np.isnan(value[1]) and value[2] == 3.5
+    assert list(columns.column("Owner")) == ["alice", "bob", None]
+    array = columns.to_numpy()
+    assert list(array["cluster"]) == [1, 1, 2] and list(array["Count"]) == [5, 6, 7]
+    frame = columns.to_pandas()
+    assert frame.loc[(1, 1), "Owner"] == "bob"
+    assert list(frame.index.names) == ["cluster", "process"]
+
+
+def test_job_columns_promote_numbers_to_categories():
+    columns = JobColumns.from_records(
+        [(1, 0, 1), (1, 1, None), (1, 2, "x")], ("Mixed",)
+    )
+    assert list(columns.column("Mixed")) == [1, None, "x"]
+
+
+def test_job_columns_arrays_survive_appends():
+    columns = JobColumns(("Owner", "Count"))
+    columns.append((1, 0, "alice", 1))
+    cluster, process = columns.cluster, columns.process
+    owners, counts = columns.column("Owner"), columns.column("Count")
+    frame = columns.to_pandas()
+    columns.extend((1, index, "bob", index) for index in range(1, 1000))
+    assert len(columns) == 1000
+    assert list(cluster) == [1] and list(process) == [0]
+    assert list(owners) == ["alice"] and list(counts) == [1]
+    assert len(frame) == 1
+
+
+def test_iter_jobs_arguments(commands):
+    stand_in = commands("1\t0\talice\n1\t1\tbob\n")
+    records = list(iter_jobs("Owner", usernames=("alice",), constraint="Cpus > 1"))
+    assert records == [(1, 0, "alice"), (1, 1, "bob")]
+    assert stand_in.calls == [
+        (
+            "q",
+            [
+                "alice",
+                "-constraint",
+                "Cpus > 1",
+                "-af:t",
+                "ClusterId",
+                "ProcId",
+                "Owner",
+            ],
+        )
+    ]
+
+
+def test_iter_jobs_json(commands):
+    commands('[{"ClusterId": 3, "ProcId": 1, "Owner": "alice"}]')
+    assert list(iter_jobs("Owner", use_json=True)) == [(3, 1, "alice")]
+
+
+def test_iter_jobs_raises_on_failure(commands):
+    commands("1\t0\talice\n", returncode=1)
+    with pytest.raises(subprocess.CalledProcessError):
+        list(iter_jobs("Owner"))
+    with pytest.raises(subprocess.CalledProcessError):
+        current_jobs()
+    with pytest.raises(subprocess.CalledProcessError):
+        list(iter_slots("Cpus"))
+
+
+def test_iter_jobs_closed_early_does_not_raise(commands):
+    commands("1\t0\talice\n1\t1\tbob\n", returncode=1)
+    records = iter_jobs("Owner")
+    assert list(islice(records, 1)) == [(1, 0, "alice")]
+    records.close()
+
+
+def test_query_jobs(commands):
+    commands("1\t0\talice\t2\n2\t0\tbob\tundefined\n")
+    array = query_jobs("Owner", "RequestCpus")
+    assert list(array["process"]) == [0, 0] and np.isnan(array["RequestCpus"][1])
+    frame = query_jobs("Owner", "RequestCpus", as_frame=True)
+    assert frame.loc[(2, 0), "Owner"] == "bob"
+
+
+def test_current_jobs(commands):
+    commands("1\t0\talice\n1\t1\talice\n2\t0\tbob\n")
+    assert current_jobs() == {"alice": ["1.0", "1.1"], "bob": ["2.0"]}
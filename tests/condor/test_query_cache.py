@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_query_cache.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Queue Snapshot Cache Tests.
+
+"""
+
+import threading
+import time
+
+import pytest
+
+from hexfarm.condor import core
+from hexfarm.condor.core import JobConfig, queue_snapshot, submit_config, user_jobs
+from hexfarm.condor.local import LocalCondor
+from hexfarm.condor.query import CachedQuery, QueueCache, QueueSnapshot
+
+
+class Clock:
+    """Manually Advanced Clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingQuery:
+    """Query Counting its Calls."""
+
+    def __init__(self, delay=0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self, *args):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.calls
+
+
+def test_cached_query_ttl():
+    clock, query = Clock(), CountingQuery()
+    cached = CachedQuery(query, ttl=10, clock=clock)
+    assert cached.age is None and not cached.is_fresh()
+    assert cached.get() == 1
+    clock.now = 5
+    assert cached.get() == 1 and cached.age == 5
+    assert cached.get(max_age=1) == 2
+    clock.now = 16
+    assert cached.get() == 3
+    cached.invalidate()
+    assert cached.get() == 4
+
+
+def test_cached_query_coalesces_concurrent_callers():
+    query = CountingQuery(delay=0.2)
+    cached = CachedQuery(query, ttl=60)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cached.get())) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert query.calls == 1
+    assert results == [1] * 8
+
+
+def test_cached_query_invalidated_while_running():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def query():
+        calls.append(True)
+        started.set()
+        release.wait()
+        return len(calls)
+
+    cached = CachedQuery(query, ttl=60)
+    thread = threading.Thread(target=cached.get)
+    thread.start()
+    started.wait()
+    cached.invalidate()
+    release.set()
+    thread.join()
+    assert not cached.is_fresh()
+    assert cached.get() == 2
+
+
+def test_cached_query_propagates_errors():
+    def query():
+        raise RuntimeError("condor_q failed")
+
+    cached = CachedQuery(query, ttl=60)
+    with pytest.raises(RuntimeError):
+        cached.get()
+    cached.query = lambda: "ok"
+    assert cached.get() == "ok"
+
+
+def test_queue_snapshot():
+    snapshot = QueueSnapshot({"alice": ["1.0", "1.1"], "bob": ["2.0"]})
+    assert len(snapshot) == 3 and "1.1" in snapshot and "3.0" not in snapshot
+    assert snapshot.users == {"alice", "bob"}
+    assert snapshot.jobs_of("alice") == {"1.0", "1.1"}
+    assert snapshot.jobs_of("carol") == frozenset()
+    assert snapshot.owner_of("2.0") == "bob"
+    assert sorted(snapshot) == ["1.0", "1.1", "2.0"]
+
+
+def test_queue_cache_keys_by_user_set():
+    calls = []
+
+    def query(*usernames):
+        calls.append(usernames)
+        return {user: [f"{len(calls)}.0"] for user in usernames}
+
+    cache = QueueCache(query, ttl=60)
+    first = cache.snapshot("bob", "alice")
+    assert cache.snapshot("alice", "bob", "alice") is first
+    assert calls == [("alice", "bob")]
+    cache.snapshot("alice")
+    assert calls[-1] == ("alice",)
+    cache.invalidate()
+    assert cache.snapshot("alice", "bob") is not first
+    cache.ttl = 0
+    assert all(query.ttl == 0 for query in cache._queries.values())
+
+
+def test_user_jobs_through_local_condor(tmp_path):
+    config = JobConfig(
+        ["executable = /bin/true", f"initialdir = {tmp_path}", "queue 3"]
+    )
+    with LocalCondor(workers=1, execute=False, runtime=60, owner="alice"):
+        core.QUEUE_CACHE.invalidate()
+        assert user_jobs("alice") == frozenset()
+        (job_range,) = submit_config(config)
+        assert user_jobs("alice") == set(job_range.job_ids())
+        assert queue_snapshot("alice").owner_of(job_range.job_id(0)) == "alice"
+    core.QUEUE_CACHE.invalidate()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_scheduler.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Scheduler Tests.
+
+"""
+
+import pytest
+from path import Path
+
+from hexfarm.condor.core import ClusterJobRange, JobMap
+from hexfarm.condor.scheduler import BackpressureScheduler, LogWatcher, TokenBucket
+from hexfarm.condor.userlog import UserLogTracker
+
+
+class Clock:
+    """Manually Advanced Clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRunner:
+    """Config Runner Submitting Ranges of a Fixed Size without Condor."""
+
+    def __init__(self, logfile, first_cluster, count=2, tracker=None):
+        self.logfile = logfile
+        self.jobmap = JobMap(remove_when_clearing=False, tracker=tracker)
+        self.cluster = first_cluster
+        self.count = count
+
+    def submit(self):
+        job_range = ClusterJobRange(self.cluster, self.count, logfile=self.logfile)
+        self.cluster += 1
+        self.jobmap.append(job_range)
+        return (job_range,)
+
+
+def event_text(code, cluster, process, message="Event."):
+    header = f"{code:03d} ({cluster:03d}.{process:03d}.000) 2019-01-02 03:04:05"
+    return f"{header} {message}\n...\n"
+
+
+def append(logfile, *events):
+    with open(logfile, "a") as file:
+        file.write("".join(events))
+
+
+@pytest.fixture
+def logfile(tmp_path):
+    path = Path(tmp_path) / "jobs.log"
+    path.touch()
+    return path
+
+
+def test_token_bucket():
+    clock = Clock()
+    bucket = TokenBucket(2.0, 3, clock=clock)
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(0.5)
+    clock.now = 10.0
+    assert bucket.tokens == 3
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_log_watcher(logfile):
+    watcher = LogWatcher(logfile, min_interval=0.01)
+    assert not watcher.changed()
+    append(logfile, "x")
+    assert watcher.changed() and not watcher.changed()
+    assert not watcher.wait(0.03)
+    missing = logfile.parent / "missing.log"
+    watcher.add(missing)
+    missing.touch()
+    assert watcher.wait(1.0)
+    watcher.remove(logfile, missing)
+    append(logfile, "x")
+    assert not watcher.changed()
+
+
+def test_counts_only_own_jobs_of_a_shared_tracker(logfile):
+    tracker = UserLogTracker()
+    mine = FakeRunner(logfile, 1, tracker=tracker)
+    other = FakeRunner(logfile, 50, count=3, tracker=tracker)
+    mine.submit()
+    other.submit()
+    append(logfile, *(event_text(1, 50, p) for p in range(3)), event_text(12, 1, 0))
+    scheduler = BackpressureScheduler(mine, target_idle=1)
+    assert scheduler.counts() == (2, 0, 1)
+    append(logfile, event_text(13, 1, 0), event_text(1, 1, 0), event_text(1, 1, 1))
+    assert scheduler.counts() == (2, 2, 0)
+    append(logfile, event_text(5, 1, 1))
+    assert scheduler.counts() == (1, 1, 0)
+
+
+def test_step_submits_while_idle_is_low(logfile):
+    runner = FakeRunner(logfile, 1)
+    scheduler = BackpressureScheduler(
+        runner, target_idle=1, max_active=4, rate=100, max_wait=5
+    )
+    assert scheduler.step() == 0.0
+    assert scheduler.counts() == (2, 0, 2)
+    assert scheduler.step() == 5
+    append(logfile, event_text(1, 1, 0), event_text(1, 1, 1))
+    assert scheduler.step() == 0.0
+    assert scheduler.counts() == (4, 2, 2)
+    append(logfile, event_text(1, 2, 0), event_text(1, 2, 1))
+    assert scheduler.step() == 5
+    assert scheduler.submissions == 2
+
+
+def test_run_stops_at_submission_limit(logfile):
+    runner = FakeRunner(logfile, 1)
+    scheduler = BackpressureScheduler(runner, target_idle=100, rate=1000, burst=10)
+    assert scheduler.run(max_submissions=3) == 3
+    assert len(runner.jobmap) == 6
+    assert scheduler.run(stop=lambda s: s.submissions >= 4) == 4
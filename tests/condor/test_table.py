@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_table.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Job Table Tests.
+
+"""
+
+import time
+
+import numpy as np
+import pytest
+from path import Path
+
+from hexfarm.condor.core import ClusterJobRange, Job, JobConfig, JobManager, JobMap
+from hexfarm.condor.local import LocalCondor
+from hexfarm.condor.table import MISSING_EXIT_CODE, JobTable
+from hexfarm.condor.userlog import JobStatus
+
+
+def event_text(code, job_id, *details, message="Event."):
+    cluster, process = map(int, job_id.split("."))
+    lines = [
+        f"{code:03d} ({cluster:03d}.{process:03d}.000) 2019-01-02 03:04:05 {message}"
+    ]
+    lines.extend(f"\t{detail}" for detail in details)
+    return "\n".join(lines) + "\n...\n"
+
+
+def terminated(job_id, code=0):
+    return event_text(
+        5, job_id, f"(1) Normal termination (return value {code})", message="Done."
+    )
+
+
+def append(logfile, *events):
+    with open(logfile, "a") as file:
+        file.write("".join(events))
+
+
+@pytest.fixture
+def logfile(tmp_path):
+    return Path(tmp_path) / "jobs.log"
+
+
+def test_add_and_lookup(logfile):
+    table = JobTable(capacity=2)
+    table.add(ClusterJobRange(4, 3, 1, logfile=logfile), Job(None, "7.0"))
+    assert len(table) == 4
+    assert table.job_ids() == ["4.1", "4.2", "4.3", "7.0"]
+    record = table["4.2"]
+    assert record.job_id == "4.2" and record.status == JobStatus.Idle
+    assert record.exit_code is None and record.logfile == logfile.abspath()
+    assert table["7.0"].logfile is None
+    assert "4.0" not in table and "4.4" not in table and "bad" not in table
+    with pytest.raises(KeyError):
+        table["5.0"]
+
+
+def test_query_counts_and_frame(logfile):
+    table = JobTable()
+    table.add_range(1, 3, submit_time=100.0)
+    table.add_range(2, 2, logfile=logfile, submit_time=200.0)
+    append(logfile, terminated("2.1", code=3))
+    assert list(table.poll()) == [4]
+    assert table["2.1"].exit_code == 3 and table["2.1"].status == JobStatus.Completed
+    assert list(table.query(JobStatus.Idle, cluster=2)) == [3]
+    assert list(table.query(min_age=150, now=300.0)) == [0, 1, 2]
+    assert table.status_counts()[JobStatus.Idle] == 4
+    assert table.status_counts(cluster=2)[JobStatus.Completed] == 1
+    frame = table.to_frame()
+    assert frame.loc[(2, 1), "status"] == "Completed"
+    assert frame.loc[(1, 0), "exit_code"] == MISSING_EXIT_CODE
+
+
+def test_finished_rows_are_final(logfile):
+    table = JobTable()
+    table.add_range(3, 1, logfile=logfile)
+    append(logfile, terminated("3.0"), event_text(1, "3.0", message="Executing."))
+    table.poll()
+    assert table["3.0"].status == JobStatus.Completed
+
+
+def test_table_follows_job_map_polls(logfile):
+    table = JobTable()
+    job_map = JobMap(remove_when_clearing=False)
+    table.follow(job_map.tracker)
+    job_range = ClusterJobRange(8, 2, logfile=logfile)
+    job_map.append(job_range)
+    table.add(job_range)
+    append(logfile, event_text(1, "8.0", message="Executing."), terminated("8.1"))
+    assert job_map.poll() == {"8.1"}
+    assert table["8.0"].status == JobStatus.Running
+    assert table["8.1"].status == JobStatus.Completed
+    table.unfollow(job_map.tracker)
+    append(logfile, terminated("8.0"))
+    job_map.poll()
+    assert table["8.0"].status == JobStatus.Running
+
+
+def test_config_runner_feeds_history(tmp_path):
+    config = JobConfig(
+        [
+            "executable = /bin/true",
+            f"initialdir = {tmp_path}",
+            "log = jobs.log",
+            "queue 3",
+        ]
+    )
+    history = JobTable()
+    manager = JobManager(history=history)
+    runner = manager.add_config(
+        "a", config, Path(tmp_path) / "a.sub", Path(tmp_path) / "jobs.log"
+    )
+    with LocalCondor(workers=3, execute=False, runtime=0.01):
+        (job_range,) = runner.submit()
+        deadline = time.time() + 30
+        while runner.running_job_count and time.time() < deadline:
+            runner.jobmap.poll()
+            time.sleep(0.02)
+    assert len(history) == 3
+    statuses = history.data["status"]
+    assert np.all(statuses == JobStatus.Completed)
+    assert history[job_range.job_id(0)].exit_code == 0
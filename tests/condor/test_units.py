@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_units.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor Configuration Unit Tests.
+
+"""
+
+import pytest
+from path import Path
+
+from hexfarm.condor.core import (
+    ClusterUnit,
+    JobConfig,
+    MultiClusterUnit,
+    ProcessUnit,
+    SubmitBackend,
+    extract_job_ranges,
+    join_configs,
+    write_config_lines,
+)
+from hexfarm.condor.local import LocalCondor
+
+
+class RecordingBackend(SubmitBackend):
+    """Submit Backend Recording Submitted Configurations."""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, config, path=None, *args, **kwargs):
+        self.calls.append((config, path, args))
+        count = sum(1 for line in config if line.startswith("queue"))
+        return tuple((10 + index, 0, 2) for index in range(count))
+
+
+def cluster_unit(name, directory, n=2, executable=None):
+    executable = executable or f"{name}.sh"
+    process = ProcessUnit(executable, initialdir=directory, output=f"{name}.out")
+    if n:
+        process.queue(n)
+    return ClusterUnit(executable, directory / f"{name}.log", process)
+
+
+@pytest.fixture
+def multi(tmp_path):
+    directory = Path(tmp_path)
+    return MultiClusterUnit(
+        JobConfig(["universe = vanilla"]),
+        cluster_unit("a", directory),
+        cluster_unit("b", directory, n=0),
+        cluster_unit("c", directory),
+    )
+
+
+def test_unit_lines_match_config(multi, tmp_path):
+    assert list(multi.iter_lines()) == list(multi.total_config)
+    path = multi.save(Path(tmp_path) / "all.sub")
+    assert path.text() == multi.total_config.as_text
+    cluster = multi.cluster_units[0]
+    assert list(cluster.iter_lines()) == list(cluster.config)
+    assert cluster.config["executable"] == "a.sh"
+
+
+def test_join_configs_matches_extending():
+    parts = [JobConfig(["a = 1", "queue"]), ["b = 2", "queue 3"], JobConfig([])]
+    joined = join_configs(["executable = x.sh"], parts)
+    expected = JobConfig(["executable = x.sh"])
+    for part in parts:
+        expected.extend(part)
+    assert list(joined) == list(expected)
+    assert list(joined.items()) == list(expected.items())
+    assert joined["b"] == "2" and joined["executable"] == "x.sh"
+
+
+def test_write_config_lines_in_chunks(tmp_path):
+    lines = (f"arguments = {index}\nqueue" for index in range(10))
+    path = write_config_lines(lines, Path(tmp_path) / "many.sub", chunk_size=3)
+    text = "\n".join(f"arguments = {index}\nqueue" for index in range(10))
+    assert path.text() == text
+
+
+def test_process_unit_config(tmp_path):
+    process = ProcessUnit("run.sh", initialdir=tmp_path, output="run.out")
+    process.queue(2)
+    assert list(process.iter_lines()) == list(process.config)
+    assert process.config["output"] == "run.out"
+
+
+def test_multi_cluster_submit_with_path(multi, tmp_path):
+    backend = RecordingBackend()
+    path = Path(tmp_path) / "all.sub"
+    ranges = multi.submit("-verbose", path=path, backend=backend)
+    ((config, submitted_path, args),) = backend.calls
+    assert submitted_path == path and args == ("-verbose",)
+    assert list(config) == list(multi.total_config)
+    assert [[r.cluster for r in unit] for unit in ranges] == [[10], [], [11]]
+    assert ranges[0][0].logfile == multi.cluster_units[0].log
+
+
+def test_multi_cluster_submit_with_temporary_file(multi, tmp_path):
+    backend = RecordingBackend()
+    multi.submit(
+        path=Path(tmp_path) / "ignored.sub", use_temporary_file=True, backend=backend
+    )
+    assert backend.calls[0][1] is None
+
+
+def test_multi_cluster_submit_requires_path(multi):
+    with pytest.raises(TypeError):
+        multi.submit(backend=RecordingBackend())
+
+
+def test_multi_cluster_submit_derives_default_path(multi, tmp_path):
+    backend = RecordingBackend()
+    multi.cluster_units[0].path = Path(tmp_path) / "a.sub"
+    multi.submit(backend=backend)
+    path = Path(tmp_path) / "a.multi.sub"
+    assert backend.calls[0][1] == path and multi.path == path
+    assert path.text() == multi.total_config.as_text
+
+
+def test_multi_cluster_submit_counts_clusters_per_unit(multi, tmp_path):
+    backend = RecordingBackend()
+    process = multi.cluster_units[0].process_units[0]
+    process._config.extend(["executable = a2.sh", "queue"])
+    ranges = multi.submit(path=Path(tmp_path) / "all.sub", backend=backend)
+    assert [[r.cluster for r in unit] for unit in ranges] == [[10, 11], [], [12]]
+
+
+def test_cluster_unit_submit_requires_existing_path(tmp_path):
+    unit = cluster_unit("a", Path(tmp_path))
+    unit.path = Path(tmp_path) / "missing.sub"
+    with pytest.raises(FileNotFoundError):
+        unit.submit()
+
+
+def test_multi_cluster_submit_through_local_condor(tmp_path):
+    directory = Path(tmp_path)
+    multi = MultiClusterUnit(
+        JobConfig([]),
+        cluster_unit("x", directory, n=2, executable="/bin/true"),
+        cluster_unit("y", directory, n=3, executable="/bin/true"),
+    )
+    with LocalCondor(workers=2, execute=False):
+        first, second = multi.submit(use_temporary_file=True)
+    assert [len(job_range) for job_range in (*first, *second)] == [2, 3]
+    assert first[0].cluster != second[0].cluster
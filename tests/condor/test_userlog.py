@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/condor/test_userlog.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Condor User Log Tests.
+
+"""
+
+from datetime import datetime
+
+import pytest
+from path import Path
+
+from hexfarm.condor.core import ClusterJobRange, Job, JobMap
+from hexfarm.condor.userlog import (
+    JobEventType,
+    JobStatus,
+    UserLogReader,
+    UserLogTracker,
+    parse_event_time,
+    parse_job_events,
+)
+
+
+def event_text(code, cluster, process, *details, message="Event."):
+    lines = [
+        f"{code:03d} ({cluster:03d}.{process:03d}.000) 2019-01-02 03:04:05 {message}"
+    ]
+    lines.extend(f"\t{detail}" for detail in details)
+    return "\n".join(lines) + "\n...\n"
+
+
+def submitted(cluster, process):
+    return event_text(0, cluster, process, message="Job submitted from host.")
+
+
+def executing(cluster, process):
+    return event_text(1, cluster, process, message="Job executing on host.")
+
+
+def terminated(cluster, process, code=0):
+    return event_text(
+        5,
+        cluster,
+        process,
+        f"(1) Normal termination (return value {code})",
+        message="Job terminated.",
+    )
+
+
+def aborted(cluster, process):
+    return event_text(9, cluster, process, message="Job was aborted.")
+
+
+@pytest.fixture
+def logfile(tmp_path):
+    path = Path(tmp_path) / "jobs.log"
+    path.write_text("")
+    return path
+
+
+def append(path, *events):
+    with open(path, "a") as file:
+        file.write("".join(events))
+
+
+def test_parse_job_events():
+    events = list(parse_job_events(submitted(12, 3) + terminated(12, 3, 7)))
+    assert [event.event_type for event in events] == [
+        JobEventType.Submit,
+        JobEventType.JobTerminated,
+    ]
+    assert events[0].job_id == "12.3"
+    assert events[0].status == JobStatus.Idle
+    assert events[0].return_value is None
+    assert events[1].status == JobStatus.Completed
+    assert events[1].return_value == 7
+
+
+def test_parse_job_events_skips_unknown_blocks():
+    text = "garbage\n...\n" + event_text(999, 1, 0) + executing(1, 0)
+    assert [event.event_type for event in parse_job_events(text)] == [
+        JobEventType.Execute
+    ]
+
+
+def test_parse_event_time():
+    assert (
+        parse_event_time("2019-01-02 03:04:05")
+        == datetime(2019, 1, 2, 3, 4, 5).timestamp()
+    )
+    now = datetime(2019, 1, 10)
+    assert (
+        parse_event_time("01/02 03:04:05", now=now)
+        == datetime(2019, 1, 2, 3, 4, 5).timestamp()
+    )
+    assert (
+        parse_event_time("12/31 00:00:00", now=now)
+        == datetime(2018, 12, 31).timestamp()
+    )
+    assert parse_event_time("not a time") is None
+
+
+def test_reader_leaves_partial_events(logfile):
+    reader = UserLogReader(logfile)
+    full = submitted(1, 0)
+    append(logfile, full, executing(1, 0)[:20])
+    assert [event.job_id for event in reader.read_events()] == ["1.0"]
+    assert reader.offset == len(full)
+    assert reader.read_events() == ()
+    append(logfile, executing(1, 0)[20:])
+    assert [event.event_type for event in reader.read_events()] == [
+        JobEventType.Execute
+    ]
+
+
+def test_reader_restarts_truncated_log(logfile):
+    reader = UserLogReader(logfile)
+    append(logfile, submitted(1, 0), executing(1, 0))
+    assert len(reader.read_events()) == 2
+    logfile.write_text(submitted(2, 0))
+    assert [event.job_id for event in reader.read_events()] == ["2.0"]
+
+
+def test_reader_missing_log(tmp_path):
+    assert UserLogReader(tmp_path / "missing.log").read_events() == ()
+
+
+def test_tracker_poll_and_counts(logfile):
+    tracker = UserLogTracker()
+    tracker.track("1.0", logfile)
+    tracker.track("1.1", logfile)
+    assert tracker.status("1.0") == JobStatus.Unknown
+    append(logfile, submitted(1, 0), submitted(1, 1), executing(1, 0))
+    assert tracker.poll() == set()
+    assert tracker.status("1.0") == JobStatus.Running
+    assert tracker.status_count(JobStatus.Idle, JobStatus.Running) == 2
+    append(logfile, terminated(1, 0, 3), aborted(1, 1))
+    assert tracker.poll() == {"1.0", "1.1"}
+    assert tracker.status("1.1") == JobStatus.Removed
+    assert tracker.return_value("1.0") == 3
+    assert tracker.is_finished("1.0") and tracker.is_finished("1.1")
+    append(logfile, executing(1, 0))
+    assert tracker.poll() == set()
+    assert tracker.status("1.0") == JobStatus.Completed
+    assert tracker.offsets() == {logfile: logfile.stat().st_size}
+
+
+def test_tracker_forget_and_track_again(logfile):
+    tracker = UserLogTracker()
+    tracker.track("4.0", logfile)
+    append(logfile, submitted(4, 0), terminated(4, 0))
+    assert tracker.poll() == {"4.0"}
+    tracker.forget("4.0")
+    assert tracker.status("4.0") == JobStatus.Unknown
+    assert len(tracker) == 0
+    tracker.track("4.0", logfile)
+    tracker.poll()
+    assert tracker.status("4.0") == JobStatus.Completed
+    assert tracker.return_value("4.0") == 0
+
+
+def test_tracker_track_forgotten_cluster_without_rereading(logfile):
+    events = []
+    tracker = UserLogTracker()
+    tracker.add_listener(events.append)
+    tracker.track("1.0", logfile)
+    tracker.track("1.1", logfile)
+    append(logfile, submitted(1, 0), submitted(1, 1), submitted(2, 0))
+    append(logfile, terminated(1, 0, 4), terminated(2, 0))
+    assert tracker.poll() == {"1.0", "2.0"}
+    tracker.forget("1.0", "1.1", "2.0")
+    assert len(tracker) == 0
+    append(logfile, terminated(1, 1))
+    assert tracker.poll() == set()
+    read = len(events)
+    offset = tracker.offsets()[logfile]
+    tracker.track("1.0", logfile)
+    assert tracker.offsets()[logfile] == offset
+    assert tracker.poll() == set() and len(events) == read
+    assert tracker.status("1.0") == JobStatus.Completed
+    assert tracker.return_value("1.0") == 4
+    assert tracker.status("1.1") == JobStatus.Completed
+    assert tracker.status("2.0") == JobStatus.Unknown
+
+
+def test_tracker_track_new_cluster_keeps_offset(logfile):
+    tracker = UserLogTracker()
+    tracker.track("1.0", logfile)
+    append(logfile, submitted(1, 0))
+    tracker.poll()
+    offset = tracker.offsets()[logfile]
+    tracker.track("2.0", logfile)
+    assert tracker.offsets()[logfile] == offset
+
+
+def test_tracker_remove_logfile(logfile):
+    other = logfile.parent / "other.log"
+    append(other, submitted(3, 0))
+    tracker = UserLogTracker()
+    tracker.track("1.0", logfile)
+    tracker.add_logfile(other)
+    append(logfile, submitted(1, 0), submitted(2, 0))
+    tracker.poll()
+    assert len(tracker) == 3
+    tracker.remove_logfile(logfile)
+    assert tracker.logfiles == (other,)
+    assert len(tracker) == 1 and tracker.status("3.0") == JobStatus.Idle
+    tracker.add_logfile(logfile)
+    tracker.poll()
+    assert tracker.status("2.0") == JobStatus.Idle
+
+
+def test_job_map_completion_from_log(logfile):
+    job_map = JobMap(
+        ClusterJobRange(7, 3, logfile=logfile), Job(None, "8.0", logfile=logfile)
+    )
+    append(logfile, *(submitted(7, p) for p in range(3)), submitted(8, 0))
+    assert job_map.poll() == set()
+    assert job_map.status("7.1") == JobStatus.Idle
+    append(logfile, terminated(7, 0), terminated(7, 2), terminated(8, 0))
+    assert job_map.poll() == {"7.0", "7.2", "8.0"}
+    assert job_map.has_completed("7.0") and not job_map.has_completed("7.1")
+    assert job_map.active_job_count == 1
+    popped = job_map.pop_completed()
+    assert sorted(job.job_id for job in popped) == ["7.0", "7.2", "8.0"]
+    assert list(job_map) == ["7.1"]
+    append(logfile, terminated(7, 1))
+    assert job_map.poll() == {"7.1"}
+
+
+def test_job_map_active_count_without_polling(logfile):
+    job_map = JobMap(
+        ClusterJobRange(7, 3, logfile=logfile),
+        Job(None, "8.0", logfile=logfile),
+        remove_when_clearing=False,
+    )
+    assert job_map.active_job_count == 4
+    append(logfile, terminated(7, 0), terminated(8, 0))
+    assert job_map.active_job_count == 4
+    job_map.poll()
+    assert job_map.active_job_count == 2
+    job_map.append(Job(None, "8.1", logfile=logfile), Job(None, "8.0", logfile=logfile))
+    assert job_map.active_job_count == 3
+    job_map.discard("7.1", "7.0", "8.0")
+    assert job_map.active_job_count == 2
+    job_map.append(ClusterJobRange(7, 3, logfile=logfile))
+    assert job_map.active_job_count == 3
+    job_map.pop_completed()
+    assert job_map.active_job_count == 3
+    job_map.clear()
+    assert job_map.active_job_count == 0
+
+
+def test_job_map_readds_discarded_range(logfile):
+    job_map = JobMap(ClusterJobRange(9, 2, logfile=logfile))
+    append(logfile, submitted(9, 0), submitted(9, 1), terminated(9, 0))
+    assert job_map.poll() == {"9.0"}
+    job_map.discard("9.0", "9.1")
+    assert not job_map.ranges
+    job_map.append(ClusterJobRange(9, 2, logfile=logfile))
+    assert job_map.has_completed("9.0") and not job_map.has_completed("9.1")
+    assert job_map.poll() == set()
+    assert job_map.status("9.1") == JobStatus.Idle
+    append(logfile, terminated(9, 1))
+    assert job_map.poll() == {"9.1"}
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*- #
+#
+# tests/test_shell.py
+#
+#
+# MIT License
+#
+# Copyright (c) 2018-2019 Brandon Gomes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+HexFarm Shell Tests.
+
+"""
+
+import asyncio
+import subprocess
+
+import psutil
+import pytest
+
+from hexfarm.metrics import CommandMetrics
+from hexfarm.shell import PIPE, Command, TimedPopen
+
+
+class TimedCommand(Command, prefix=""):
+    """Command Class with its Own Metrics."""
+
+
+@pytest.fixture
+def metrics():
+    metrics = TimedCommand.enable_metrics()
+    yield metrics
+    TimedCommand.disable_metrics()
+
+
+def test_metrics_disabled_by_default():
+    assert TimedCommand.metrics is None
+    process = TimedCommand("true").open()
+    assert not isinstance(process, TimedPopen)
+    assert isinstance(process, psutil.Popen)
+    assert process.wait() == 0
+
+
+def test_enable_metrics_with_given_collector():
+    metrics = CommandMetrics()
+    try:
+        assert TimedCommand.enable_metrics(metrics) is metrics
+        assert Command.metrics is None
+    finally:
+        TimedCommand.disable_metrics()
+
+
+def test_streamed_binary_output(metrics):
+    process = TimedCommand("printf").open("hello", stdout=PIPE)
+    assert isinstance(process, TimedPopen)
+    assert process.stdout.read() == b"hello"
+    process.stdout.close()
+    assert process.wait() == 0
+    stats = metrics["printf"]
+    assert stats.output_bytes == 5 and stats.calls == 1
+    assert stats.return_codes[0] == 1
+
+
+def test_streamed_text_output_counts_bytes(metrics):
+    process = TimedCommand("printf").open(
+        "a\\nbé\\n", stdout=PIPE, universal_newlines=True
+    )
+    assert list(process.stdout) == ["a\n", "bé\n"]
+    process.stdout.close()
+    process.wait()
+    assert metrics["printf"].output_bytes == len("a\nbé\n".encode())
+
+
+def test_partially_read_stream(metrics):
+    process = TimedCommand("printf").open("abcdef", stdout=PIPE)
+    process.stdout.read(2)
+    process.stdout.close()
+    process.wait()
+    assert 2 <= metrics["printf"].output_bytes <= 6
+
+
+def test_communicate_counts_output(metrics):
+    process = TimedCommand("sh").open(
+        "-c", "printf out; printf error >&2", stdout=PIPE, stderr=PIPE
+    )
+    assert process.communicate() == (b"out", b"error")
+    stats = metrics["sh"]
+    assert stats.output_bytes == 8 and stats.calls == 1
+    process.wait()
+    assert stats.calls == 1
+
+
+def test_communicate_single_text_pipe(metrics):
+    process = TimedCommand("printf").open("abc", stdout=PIPE, universal_newlines=True)
+    assert process.communicate() == ("abc", None)
+    stats = metrics["printf"]
+    assert stats.output_bytes == 3 and stats.calls == 1
+    assert stats.return_codes[0] == 1
+
+
+def test_process_details_from_psutil(metrics):
+    process = TimedCommand("sleep").open("1")
+    try:
+        assert process.name() == "sleep"
+        assert process.process.pid == process.pid
+    finally:
+        process.kill()
+        process.wait()
+    with pytest.raises(AttributeError):
+        process._missing
+
+
+def test_failed_command_return_code(metrics):
+    process = TimedCommand("sh").open("-c", "exit 3")
+    assert process.wait() == 3
+    assert metrics["sh"].return_codes[3] == 1
+
+
+def test_run_records_output(metrics):
+    result = TimedCommand("printf").run("abc")
+    assert result.stdout == b"abc"
+    assert metrics["printf"].output_bytes == 3
+
+
+def test_run_async_records_output(metrics):
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(TimedCommand("printf").run_async("abcd"))
+    finally:
+        loop.close()
+    assert isinstance(result, subprocess.CompletedProcess)
+    assert metrics["printf"].output_bytes == 4